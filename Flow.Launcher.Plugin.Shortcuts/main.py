@@ -9,17 +9,1144 @@ sys.path.append(os.path.join(parent_folder_path, 'plugin'))
 
 from flowlauncher import FlowLauncher
 import json
+import re
 import webbrowser
 import subprocess
+import socket
+import tempfile
+import mmap
+import struct
+import zlib
+import time
+import math
+import unicodedata
+import heapq
+from bisect import bisect_right
+from urllib.parse import urlsplit, urlunsplit, urljoin, unquote
 from pathlib import Path
 
 
+class BinaryCatalog:
+    """Memory-mapped view of a binary catalog: shortcuts.bin written by the editor, or one the
+    plugin made for another source
+    
+    Queries scan the mapped keyword text, which is in ranking order, and only
+    the records they return are decoded, so opening and searching don't parse
+    the catalog. Whether a keyword exists (an earlier source overriding it) is
+    a binary search of the sorted keyword index.
+    Only the header is checked here (its checksum, the file size and that it
+    was made from the current source file); verify() checks the whole file.
+    Keywords and categories are stored as search keys, so queries compare
+    them without normalizing anything but the query.
+    The layout is described in BinaryCatalog in the editor; build() must
+    produce the same bytes as the editor's (test.py checks the two agree).
+    """
+    
+    FILE_NAME = 'shortcuts.bin'
+    MAGIC = b'FLSC'
+    VERSION = 5
+    HEADER = struct.Struct('<4sHHIqqQQQQQQQQQQII')
+    RECORD = struct.Struct('<QIi')
+    INDEX_ITEM = struct.Struct('<I')
+    SCAN_CHUNK = 64 * 1024  # bytes of keyword text searched at a time
+    
+    def __init__(self, path, source_file):
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) < self.HEADER.size:
+            raise ValueError("File too short")
+        (magic, version, header_size, self.count, mtime_ns, size, self.records_offset, index_offset,
+         offsets_offset, self.keywords_offset, sorted_offset, ranks_offset, category_offsets_offset,
+         self.categories_offset, self.strings_offset, file_size, self.body_crc,
+         header_crc) = self.HEADER.unpack_from(self.data)
+        if magic != self.MAGIC or version != self.VERSION or header_size != self.HEADER.size:
+            raise ValueError("Unsupported binary catalog")
+        if zlib.crc32(self.data[:self.HEADER.size - 4]) != header_crc or file_size != len(self.data):
+            raise ValueError("Damaged binary catalog")
+        stat = os.stat(source_file)
+        if (stat.st_mtime_ns, stat.st_size) != (mtime_ns, size):
+            raise ValueError("Binary catalog is out of date")
+        if sys.byteorder != 'little':
+            raise ValueError("Binary catalog needs a little-endian machine")
+        
+        view = memoryview(self.data)
+        self.index = view[index_offset:index_offset + 4 * self.count].cast('I')
+        self.offsets = view[offsets_offset:offsets_offset + 4 * (self.count + 1)].cast('I')
+        self.sorted = view[sorted_offset:sorted_offset + 4 * self.count].cast('I')
+        self.ranks = view[ranks_offset:ranks_offset + 4 * self.count].cast('I')
+        self.category_offsets = view[category_offsets_offset:category_offsets_offset + 4 * (self.count + 1)].cast('I')
+    
+    @classmethod
+    def open(cls, path, source_file):
+        """The binary catalog at path, or None if it is missing, damaged or out of date"""
+        try:
+            return cls(path, source_file)
+        except (OSError, ValueError):
+            return None
+    
+    def __len__(self):
+        return self.count
+    
+    @staticmethod
+    def search_key(text):
+        """Form of text that searches compare: compatibility-decomposed (full-width "Ｃａｆé" is
+        "Cafe" + accent), without accents and case-folded ("ß" is "ss")"""
+        decomposed = unicodedata.normalize('NFKD', text)
+        return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+    
+    def keyword(self, entry):
+        """Search key of the entry-th record's keyword, in ranking order"""
+        return self.keyword_bytes(entry).decode('utf-8')
+    
+    def record_keyword(self, record):
+        """Search key of a record's keyword"""
+        return self.keyword(self.ranks[record])
+    
+    def category(self, record):
+        """Search key of a record's category"""
+        start = self.categories_offset + self.category_offsets[record]
+        end = self.categories_offset + self.category_offsets[record + 1]
+        return self.data[start:end].decode('utf-8')
+    
+    def keyword_bytes(self, entry):
+        """Encoded search key of the entry-th record's keyword, in ranking order"""
+        start = self.keywords_offset + self.offsets[entry]
+        end = self.keywords_offset + self.offsets[entry + 1] - 1  # without the newline
+        return self.data[start:end]
+    
+    def priority(self, record):
+        """Priority of a record, without decoding it"""
+        return self.RECORD.unpack_from(self.data, self.records_offset + record * self.RECORD.size)[2]
+    
+    def contains(self, keyword):
+        """Whether a record has a keyword with this search key (binary search of the sorted keyword index)"""
+        target = keyword.replace('\n', ' ').encode('utf-8')
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.keyword_bytes(self.sorted[middle]) < target:
+                low = middle + 1
+            else:
+                high = middle
+        return low < self.count and self.keyword_bytes(self.sorted[low]) == target
+    
+    def scan(self, text, entry=0):
+        """Walk the keywords in ranking order from entry, looking for those that contain text
+        
+        Yields (entry to continue from, record number) for each match, and
+        (entry to continue from, None) after each SCAN_CHUNK without one, so
+        the caller can stop at any point.
+        """
+        needle = text.replace('\n', ' ').encode('utf-8')
+        start = self.keywords_offset + self.offsets[entry]
+        end = self.keywords_offset + self.offsets[self.count]
+        while start < end:
+            stop = min(end, start + self.SCAN_CHUNK)
+            # A match may start before stop and run past it
+            position = self.data.find(needle, start, min(end, stop + len(needle) - 1))
+            if position < 0:
+                start = stop
+                yield bisect_right(self.offsets, stop - self.keywords_offset) - 1, None
+                continue
+            entry = bisect_right(self.offsets, position - self.keywords_offset) - 1
+            yield entry + 1, self.index[entry]
+            start = self.keywords_offset + self.offsets[entry + 1]  # one hit per keyword
+    
+    def shortcut(self, record):
+        """Decode one record"""
+        offset, length, _ = self.RECORD.unpack_from(self.data, self.records_offset + record * self.RECORD.size)
+        start = self.strings_offset + offset
+        return json.loads(self.data[start:start + length].decode('utf-8'))
+    
+    def verify(self):
+        """Whether the body checksum matches (reads the whole file)"""
+        return zlib.crc32(self.data[self.HEADER.size:]) == self.body_crc
+    
+    @staticmethod
+    def aligned(size):
+        """Round size up to a multiple of 8"""
+        return (size + 7) & ~7
+    
+    @classmethod
+    def build(cls, shortcuts, source_signature):
+        """Encode shortcuts as a binary catalog, returning its bytes"""
+        strings = bytearray()
+        records = bytearray()
+        priorities = []
+        for shortcut in shortcuts:
+            encoded = json.dumps(shortcut, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            priority = shortcut.get('priority', 50)
+            priorities.append(priority if isinstance(priority, int) else 50)
+            records += cls.RECORD.pack(len(strings), len(encoded), priorities[-1])
+            strings += encoded
+        
+        # Newlines separate keywords in the keyword text, so they can't be part of one
+        keywords = [cls.search_key(shortcut.get('keyword', '')).replace('\n', ' ').encode('utf-8')
+                    for shortcut in shortcuts]
+        order = sorted(range(len(shortcuts)),
+                       key=lambda record: (-priorities[record], len(shortcuts[record].get('keyword', ''))))
+        keyword_text = bytearray()
+        offsets = bytearray()
+        for record in order:
+            offsets += cls.INDEX_ITEM.pack(len(keyword_text))
+            keyword_text += keywords[record] + b'\n'
+        offsets += cls.INDEX_ITEM.pack(len(keyword_text))
+        if len(keyword_text) > 0xFFFFFFFF:
+            raise ValueError("Keywords too long for a binary catalog")
+        index = b''.join(cls.INDEX_ITEM.pack(record) for record in order)
+        # Entries by keyword, so finding a keyword takes a binary search instead of a scan
+        by_keyword = sorted(range(len(order)), key=lambda entry: keywords[order[entry]])
+        sorted_index = b''.join(cls.INDEX_ITEM.pack(entry) for entry in by_keyword)
+        ranks = [0] * len(order)
+        for entry, record in enumerate(order):
+            ranks[record] = entry
+        rank_index = b''.join(cls.INDEX_ITEM.pack(entry) for entry in ranks)
+        
+        category_text = bytearray()
+        category_offsets = bytearray()
+        for shortcut in shortcuts:
+            category_offsets += cls.INDEX_ITEM.pack(len(category_text))
+            category_text += cls.search_key(shortcut.get('category', 'Uncategorized')).encode('utf-8')
+        category_offsets += cls.INDEX_ITEM.pack(len(category_text))
+        if len(category_text) > 0xFFFFFFFF:
+            raise ValueError("Categories too long for a binary catalog")
+        
+        sections = [records, index, offsets, keyword_text, sorted_index, rank_index,
+                    category_offsets, category_text, strings]
+        section_offsets = []
+        body = bytearray()
+        position = cls.aligned(cls.HEADER.size)
+        for section in sections:
+            section_offsets.append(position)
+            body += section + bytes(cls.aligned(len(section)) - len(section))
+            position += cls.aligned(len(section))
+        body = bytes(cls.aligned(cls.HEADER.size) - cls.HEADER.size) + body
+        
+        mtime_ns, size = source_signature or (0, 0)
+        fields = [cls.MAGIC, cls.VERSION, cls.HEADER.size, len(shortcuts), mtime_ns, size,
+                  *section_offsets, position, zlib.crc32(body)]
+        header = cls.HEADER.pack(*fields, 0)
+        header = cls.HEADER.pack(*fields, zlib.crc32(header[:-4]))
+        return header + body
+
+
+class ListCatalog:
+    """Stand-in for BinaryCatalog over a parsed list of shortcuts, for a source without an
+    up-to-date binary catalog"""
+    
+    def __init__(self, shortcuts):
+        def rank(record):
+            priority = shortcuts[record].get('priority', 50)
+            return -(priority if isinstance(priority, int) else 50), len(shortcuts[record].get('keyword', ''))
+        
+        self.shortcuts = shortcuts
+        self.order = sorted(range(len(shortcuts)), key=rank)
+        self.record_keywords = [BinaryCatalog.search_key(shortcut.get('keyword', '')) for shortcut in shortcuts]
+        self.keywords = [self.record_keywords[record] for record in self.order]
+        self.keyword_set = set(self.keywords)
+        self.categories = {}  # search keys of the categories, made when first asked for
+    
+    def __len__(self):
+        return len(self.shortcuts)
+    
+    def keyword(self, entry):
+        """Search key of the entry-th record's keyword, in ranking order"""
+        return self.keywords[entry]
+    
+    def record_keyword(self, record):
+        """Search key of a record's keyword"""
+        return self.record_keywords[record]
+    
+    def category(self, record):
+        """Search key of a record's category"""
+        category = self.shortcuts[record].get('category', 'Uncategorized')
+        if category not in self.categories:
+            self.categories[category] = BinaryCatalog.search_key(category)
+        return self.categories[category]
+    
+    def priority(self, record):
+        priority = self.shortcuts[record].get('priority', 50)
+        return priority if isinstance(priority, int) else 50
+    
+    def contains(self, keyword):
+        """Whether a record has a keyword with this search key"""
+        return keyword in self.keyword_set
+    
+    def scan(self, text, entry=0):
+        """Walk the keywords in ranking order from entry, like BinaryCatalog.scan() (one step per record)"""
+        for position in range(entry, len(self.order)):
+            keyword = self.keywords[position]
+            if text in keyword or keyword.startswith(text):
+                yield position + 1, self.order[position]
+            else:
+                yield position + 1, None
+    
+    def shortcut(self, record):
+        return self.shortcuts[record]
+
+
+class ResultCache:
+    """Memory-mapped, pre-encoded Flow Launcher result of every shortcut of a source
+    
+    A result (icon lookup, subtitle, the shortcut's JSON in its action) only
+    depends on the shortcut, the path and link check results and where the
+    plugin is installed, so the plugin renders and encodes all of them once
+    per version of those files, and a query just joins the JSON of its
+    matches. Layout: header (magic, format version, record count, key
+    length), the version key, a fixed-width (offset, length, score, title
+    length) entry per shortcut in catalog order, then the JSON fragments.
+    """
+    
+    MAGIC = b'FLRC'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHHII')
+    ENTRY = struct.Struct('<QIiI')
+    
+    def __init__(self, path, key):
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) < self.HEADER.size:
+            raise ValueError("File too short")
+        magic, version, _, self.count, key_length = self.HEADER.unpack_from(self.data)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError("Unsupported result cache")
+        if self.data[self.HEADER.size:self.HEADER.size + key_length] != key:
+            raise ValueError("Result cache is out of date")
+        self.entries_offset = self.HEADER.size + key_length
+        self.fragments_offset = self.entries_offset + self.count * self.ENTRY.size
+    
+    @classmethod
+    def open(cls, path, key):
+        """The result cache at path, or None if it is missing or was made for another key"""
+        try:
+            return cls(path, key)
+        except (OSError, ValueError):
+            return None
+    
+    @staticmethod
+    def version_key(files):
+        """Identify the inputs of the cached results: plugin location and (mtime, size) of files"""
+        signatures = []
+        for path in files:
+            try:
+                stat = os.stat(path)
+                signatures.append([stat.st_mtime_ns, stat.st_size])
+            except OSError:
+                signatures.append(None)
+        return json.dumps([parent_folder_path, signatures]).encode('utf-8')
+    
+    def __len__(self):
+        return self.count
+    
+    def entry(self, record):
+        """(offset, length, score, title length) of a record's result"""
+        return self.ENTRY.unpack_from(self.data, self.entries_offset + record * self.ENTRY.size)
+    
+    def fragment(self, offset, length):
+        """The encoded result at offset"""
+        start = self.fragments_offset + offset
+        return self.data[start:start + length]
+    
+    @classmethod
+    def response(cls, hits, extra=(), last=(), debug_message=''):
+        """JSON-RPC query response (as FlowLauncher prints it) with the results of hits, best first
+        
+        hits are (result cache, record) pairs in catalog order; extra results
+        (dicts) are merged in by score, and the results in last (such as
+        "More results") are added at the end.
+        """
+        items = []
+        for cache, record in hits:
+            offset, length, score, title_length = cache.entry(record)
+            items.append(((-score, title_length), cache, (offset, length)))
+        for result in extra:
+            items.append(((-result.get('Score', 0), len(result.get('Title', ''))), None, result))
+        # Same order as query(): higher score first, then shorter title
+        items.sort(key=lambda item: item[0])
+        fragments = [cache.fragment(*value) if cache is not None else json.dumps(value).encode('ascii')
+                     for _, cache, value in items]
+        fragments.extend(json.dumps(result).encode('ascii') for result in last)
+        return (b'{"result": [' + b', '.join(fragments) + b'], "debugMessage": '
+                + json.dumps(debug_message).encode('ascii') + b'}')
+    
+    @classmethod
+    def build(cls, key, results):
+        """Encode results (one per shortcut, in catalog order) as the cache for key, returning its bytes"""
+        entries = bytearray()
+        fragments = bytearray()
+        for result in results:
+            encoded = json.dumps(result).encode('ascii')
+            score = result.get('Score', 0)
+            entries += cls.ENTRY.pack(len(fragments), len(encoded), score if isinstance(score, int) else 0,
+                                      len(result.get('Title', '')))
+            fragments += encoded
+        return cls.HEADER.pack(cls.MAGIC, cls.VERSION, 0, len(results), len(key)) + key + entries + fragments
+
+
+class TermIndex:
+    """Inverted index from the path segments, file names and URL host labels of a source's shortcuts
+    to their record numbers
+    
+    Finds shortcuts by where they point ("tech-artists.org",
+    "PopcornFX-2.23.2/bin") by looking terms up in sorted order, never by
+    scanning paths. Layout: header (magic, format version, term count, key
+    length), the version key, term offsets, posting list offsets, the posting
+    lists (record numbers) and the sorted UTF-8 terms.
+    """
+    
+    MAGIC = b'FLTI'
+    VERSION = 2
+    HEADER = struct.Struct('<4sHHII')
+    LOOKUP_LIMIT = 5000  # records gathered for one query term before further prefixes are skipped
+    
+    def __init__(self, data, key):
+        self.data = data
+        if len(data) < self.HEADER.size:
+            raise ValueError("File too short")
+        magic, version, _, self.count, key_length = self.HEADER.unpack_from(data)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError("Unsupported term index")
+        if data[self.HEADER.size:self.HEADER.size + key_length] != key:
+            raise ValueError("Term index is out of date")
+        if sys.byteorder != 'little':
+            raise ValueError("Term index needs a little-endian machine")
+        
+        view = memoryview(data)
+        start = self.HEADER.size + key_length + (-(self.HEADER.size + key_length) % 4)
+        end = start + 4 * (self.count + 1)
+        self.term_offsets = view[start:end].cast('I')
+        start, end = end, end + 4 * (self.count + 1)
+        self.posting_offsets = view[start:end].cast('I')
+        start, end = end, end + 4 * self.posting_offsets[self.count]
+        self.postings = view[start:end].cast('I')
+        self.terms_offset = end
+        if len(data) != self.terms_offset + self.term_offsets[self.count]:
+            raise ValueError("Damaged term index")
+    
+    @classmethod
+    def open(cls, path, key):
+        """The term index at path, or None if it is missing, damaged or for another version"""
+        try:
+            with open(path, 'rb') as f:
+                return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), key)
+        except (OSError, ValueError):
+            return None
+    
+    @staticmethod
+    def terms(shortcut):
+        """Search keys of the terms a shortcut can be found by besides its keyword"""
+        path = shortcut.get('path', '')
+        if not isinstance(path, str):
+            return set()
+        terms = set()
+        if '://' in path:
+            parts = urlsplit(path)
+            labels = (parts.hostname or '').split('.')
+            # The host, each label and each shorter domain: "tech-artists.org" finds www.tech-artists.org
+            terms.update(labels)
+            terms.update('.'.join(labels[start:]) for start in range(len(labels)))
+            terms.update(unquote(segment) for segment in parts.path.split('/'))
+        else:
+            segments = re.split(r'[\\/]+', path)
+            terms.update(segments)
+            if shortcut.get('type') in ('file', 'app'):
+                terms.add(os.path.splitext(segments[-1])[0])  # file name without its extension
+        return {BinaryCatalog.search_key(term) for term in terms if term}
+    
+    @classmethod
+    def build(cls, key, shortcuts):
+        """Index the terms of shortcuts (records in catalog order), returning the bytes"""
+        postings = {}
+        for record, shortcut in enumerate(shortcuts):
+            for term in cls.terms(shortcut):
+                postings.setdefault(term.encode('utf-8'), []).append(record)
+        terms = sorted(postings)
+        
+        term_offsets = [0]
+        posting_offsets = [0]
+        records = []
+        for term in terms:
+            term_offsets.append(term_offsets[-1] + len(term))
+            records.extend(postings[term])
+            posting_offsets.append(len(records))
+        header = cls.HEADER.pack(cls.MAGIC, cls.VERSION, 0, len(terms), len(key))
+        return b''.join([
+            header, key, bytes(-(len(header) + len(key)) % 4),
+            struct.pack(f'<{len(term_offsets)}I', *term_offsets),
+            struct.pack(f'<{len(posting_offsets)}I', *posting_offsets),
+            struct.pack(f'<{len(records)}I', *records),
+            *terms
+        ])
+    
+    def term(self, number):
+        """The number-th term, UTF-8 encoded"""
+        start = self.terms_offset + self.term_offsets[number]
+        return bytes(self.data[start:self.terms_offset + self.term_offsets[number + 1]])
+    
+    def lookup(self, prefix):
+        """Records with a term that starts with prefix"""
+        key = prefix.encode('utf-8')
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.term(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        records = set()
+        for number in range(low, self.count):
+            if not self.term(number).startswith(key):
+                break
+            records.update(self.postings[self.posting_offsets[number]:self.posting_offsets[number + 1]])
+            if len(records) >= self.LOOKUP_LIMIT:
+                break
+        return records
+    
+    def search(self, query_key):
+        """Records that have a term starting with each word of the query (a search key)
+        
+        Words are separated by slashes or spaces, and a leading URL scheme is
+        ignored, so a query can be a piece of a path or URL.
+        """
+        query_key = re.sub(r'^[a-z][a-z0-9+.-]*://', '', query_key)
+        records = None
+        for word in re.split(r'[\\/\s]+', query_key):
+            if word:
+                hits = self.lookup(word)
+                records = hits if records is None else records & hits
+                if not records:
+                    break
+        return records or set()
+
+
+class RelevanceIndex:
+    """TF-IDF vectors of a source's shortcuts, for ranking vague multi-word queries by relevance
+    
+    Each shortcut is a bag of the words in its keyword, category and path
+    (including URL hosts), weighted (1 + log tf) * idf and normalized to unit
+    length. The matrix is stored by term, like a sparse column matrix: sorted
+    terms with their idf, and for each term the records that have it with
+    their weights, as flat little-endian arrays that are memory-mapped and
+    read in place. A query is scored with a sparse dot product over the
+    posting lists of its words, so it never touches other records. Layout:
+    header (magic, format version, term count, record count, key length),
+    the version key, term offsets, posting list offsets, idf per term, the
+    posting records and weights, then the UTF-8 terms.
+    """
+    
+    MAGIC = b'FLRI'
+    VERSION = 2
+    HEADER = struct.Struct('<4sHHIII')
+    WORD_PATTERN = re.compile(r'[^\W_]+')
+    STOP_WORDS = {'http', 'https', 'www', 'file'}
+    PREFIX_TERMS = 32  # vocabulary terms a query word can expand to
+    PREFIX_WEIGHT = 0.5  # weight of a term the query word is only a prefix of
+    COMMON_RATIO = 0.1  # terms in more records than this are left out of queries that have others
+    
+    def __init__(self, data, key):
+        self.data = data
+        if len(data) < self.HEADER.size:
+            raise ValueError("File too short")
+        magic, version, _, self.count, self.records, key_length = self.HEADER.unpack_from(data)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError("Unsupported relevance index")
+        if data[self.HEADER.size:self.HEADER.size + key_length] != key:
+            raise ValueError("Relevance index is out of date")
+        if sys.byteorder != 'little':
+            raise ValueError("Relevance index needs a little-endian machine")
+        
+        view = memoryview(data)
+        start = self.HEADER.size + key_length + (-(self.HEADER.size + key_length) % 4)
+        end = start + 4 * (self.count + 1)
+        self.term_offsets = view[start:end].cast('I')
+        start, end = end, end + 4 * (self.count + 1)
+        self.posting_offsets = view[start:end].cast('I')
+        start, end = end, end + 4 * self.count
+        self.idf = view[start:end].cast('f')
+        postings = self.posting_offsets[self.count]
+        start, end = end, end + 4 * postings
+        self.posting_records = view[start:end].cast('I')
+        start, end = end, end + 4 * postings
+        self.posting_weights = view[start:end].cast('f')
+        self.terms_offset = end
+        if len(data) != self.terms_offset + self.term_offsets[self.count]:
+            raise ValueError("Damaged relevance index")
+    
+    @classmethod
+    def open(cls, path, key):
+        """The relevance index at path, or None if it is missing, damaged or for another version"""
+        try:
+            with open(path, 'rb') as f:
+                return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), key)
+        except (OSError, ValueError):
+            return None
+    
+    @classmethod
+    def words(cls, key):
+        """Words of a search key that count for relevance"""
+        return [word for word in cls.WORD_PATTERN.findall(key)
+                if len(word) > 1 and word not in cls.STOP_WORDS]
+    
+    @classmethod
+    def build(cls, key, shortcuts):
+        """Compute the TF-IDF vectors of shortcuts (records in catalog order), returning the bytes"""
+        documents = []
+        frequencies = {}
+        for shortcut in shortcuts:
+            text = ' '.join(str(shortcut.get(field, '')) for field in ('keyword', 'category', 'path'))
+            counts = {}
+            for word in cls.words(BinaryCatalog.search_key(text)):
+                counts[word] = counts.get(word, 0) + 1
+            documents.append(counts)
+            for word in counts:
+                frequencies[word] = frequencies.get(word, 0) + 1
+        idf = {word: math.log((1 + len(shortcuts)) / (1 + frequency)) + 1
+               for word, frequency in frequencies.items()}
+        
+        postings = {}
+        for record, counts in enumerate(documents):
+            weights = {word: (1 + math.log(count)) * idf[word] for word, count in counts.items()}
+            norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+            for word, weight in weights.items():
+                postings.setdefault(word, []).append((record, weight / norm))
+        
+        terms = sorted(postings, key=lambda word: word.encode('utf-8'))
+        encoded = [word.encode('utf-8') for word in terms]
+        term_offsets = [0]
+        posting_offsets = [0]
+        records = []
+        weights = []
+        for word, term in zip(terms, encoded):
+            term_offsets.append(term_offsets[-1] + len(term))
+            for record, weight in postings[word]:
+                records.append(record)
+                weights.append(weight)
+            posting_offsets.append(len(records))
+        header = cls.HEADER.pack(cls.MAGIC, cls.VERSION, 0, len(terms), len(shortcuts), len(key))
+        return b''.join([
+            header, key, bytes(-(len(header) + len(key)) % 4),
+            struct.pack(f'<{len(term_offsets)}I', *term_offsets),
+            struct.pack(f'<{len(posting_offsets)}I', *posting_offsets),
+            struct.pack(f'<{len(terms)}f', *(idf[word] for word in terms)),
+            struct.pack(f'<{len(records)}I', *records),
+            struct.pack(f'<{len(weights)}f', *weights),
+            *encoded
+        ])
+    
+    def term(self, number):
+        """The number-th term, UTF-8 encoded"""
+        start = self.terms_offset + self.term_offsets[number]
+        return bytes(self.data[start:self.terms_offset + self.term_offsets[number + 1]])
+    
+    def expand(self, word):
+        """Numbers of the terms that start with word (at most PREFIX_TERMS, the word itself first)"""
+        key = word.encode('utf-8')
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.term(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        numbers = []
+        for number in range(low, min(low + self.PREFIX_TERMS, self.count)):
+            if not self.term(number).startswith(key):
+                break
+            numbers.append(number)
+        return numbers
+    
+    def search(self, query_key, limit):
+        """Top limit (record, cosine similarity) pairs for the query (a search key), best first"""
+        query = {}
+        for word in self.words(query_key):
+            key = word.encode('utf-8')
+            for number in self.expand(word):
+                weight = self.idf[number] * (1.0 if self.term(number) == key else self.PREFIX_WEIGHT)
+                query[number] = max(query.get(number, 0.0), weight)
+        
+        # Terms most records have hardly change the ranking but cost the most to score
+        common = max(1, self.COMMON_RATIO * self.records)
+        rare = {number: weight for number, weight in query.items()
+                if self.posting_offsets[number + 1] - self.posting_offsets[number] <= common}
+        query = rare or query
+        norm = math.sqrt(sum(weight * weight for weight in query.values())) or 1.0
+        
+        scores = {}
+        for number, weight in query.items():
+            start, end = self.posting_offsets[number], self.posting_offsets[number + 1]
+            weight /= norm
+            for record, record_weight in zip(self.posting_records[start:end], self.posting_weights[start:end]):
+                scores[record] = scores.get(record, 0.0) + weight * record_weight
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+
+class CatalogSource:
+    """One shortcuts file of the catalog, with its own binary catalog and result cache
+    
+    Each source is parsed, indexed and cached on its own, keyed by its own
+    (mtime, size), so changing one file leaves the caches of the others valid.
+    Only the editor's own catalog has health_files (its path and link check
+    results), which its result cache depends on as well.
+    """
+    
+    REBUILD_LOCK_SECONDS = 60
+    MEMORY_INDEX_LIMIT = 10000  # larger sources wait for the background rebuild of their indexes
+    
+    def __init__(self, name, path, cache_dir, health_files=()):
+        self.name = name
+        self.path = path
+        self.cache_dir = cache_dir
+        self.health_files = health_files
+        try:
+            stat = os.stat(path)
+            self.signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            self.signature = None
+        
+        safe_name = re.sub(r'[^\w.-]', '_', name)
+        self.catalog_file = os.path.join(cache_dir, f"{safe_name}.bin")
+        self.catalog = None
+        if os.path.basename(path) == 'shortcuts.json':
+            # Written by the editor on save when its binary catalog option is on
+            self.catalog = BinaryCatalog.open(os.path.join(os.path.dirname(path), BinaryCatalog.FILE_NAME), path)
+        if self.catalog is None:
+            self.catalog = BinaryCatalog.open(self.catalog_file, path)
+        
+        self.result_cache_file = os.path.join(cache_dir, f"{safe_name}.results.bin")
+        self.result_cache_key = ResultCache.version_key([path, *health_files])
+        self.result_cache = ResultCache.open(self.result_cache_file, self.result_cache_key)
+        self.terms_file = os.path.join(cache_dir, f"{safe_name}.terms.bin")
+        self.terms_key = ResultCache.version_key([path])
+        self.terms = TermIndex.open(self.terms_file, self.terms_key)
+        self.relevance_file = os.path.join(cache_dir, f"{safe_name}.tfidf.bin")
+        self.relevance = RelevanceIndex.open(self.relevance_file, self.terms_key)
+        self.parsed = None
+        self.list_catalog = None
+        self.memory_terms = None
+        self.memory_relevance = None
+    
+    def shortcuts(self):
+        """The source's shortcuts, parsed on first use"""
+        if self.parsed is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.parsed = json.load(f).get('shortcuts', [])
+            except (OSError, ValueError, AttributeError):
+                self.parsed = []
+        return self.parsed
+    
+    def index(self):
+        """The binary catalog, or a ListCatalog when there is no up-to-date one"""
+        if self.catalog is not None:
+            return self.catalog
+        if self.list_catalog is None:
+            self.list_catalog = ListCatalog(self.shortcuts())
+        return self.list_catalog
+    
+    def term_index(self):
+        """The term index, built in memory when there is no up-to-date one on disk
+        
+        None for a source above MEMORY_INDEX_LIMIT shortcuts until its index is on disk.
+        """
+        if self.terms is not None:
+            return self.terms
+        if len(self.shortcuts()) > self.MEMORY_INDEX_LIMIT:
+            return None
+        if self.memory_terms is None:
+            self.memory_terms = TermIndex(TermIndex.build(b'', self.shortcuts()), b'')
+        return self.memory_terms
+    
+    def relevance_index(self):
+        """The relevance index, built in memory when there is no up-to-date one on disk
+        
+        None for a source above MEMORY_INDEX_LIMIT shortcuts until its index is on disk.
+        """
+        if self.relevance is not None:
+            return self.relevance
+        if len(self.shortcuts()) > self.MEMORY_INDEX_LIMIT:
+            return None
+        if self.memory_relevance is None:
+            self.memory_relevance = RelevanceIndex(RelevanceIndex.build(b'', self.shortcuts()), b'')
+        return self.memory_relevance
+    
+    def stale(self):
+        """True if any of the source's caches is missing or out of date"""
+        if self.signature is None:
+            return False
+        return None in (self.catalog, self.result_cache, self.terms, self.relevance)
+    
+    def refresh(self, render):
+        """Rebuild whichever of the binary catalog, the result cache and the indexes is out of date
+        
+        render(shortcut) makes the Flow Launcher result of a shortcut.
+        """
+        if self.signature is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if self.catalog is None:
+            self.rebuild(self.catalog_file, lambda: BinaryCatalog.build(self.shortcuts(), self.signature))
+        if self.result_cache is None:
+            self.rebuild(self.result_cache_file, lambda: ResultCache.build(
+                self.result_cache_key, [render(shortcut) for shortcut in self.shortcuts()]))
+        if self.terms is None:
+            self.rebuild(self.terms_file, lambda: TermIndex.build(self.terms_key, self.shortcuts()))
+        if self.relevance is None:
+            self.rebuild(self.relevance_file, lambda: RelevanceIndex.build(self.terms_key, self.shortcuts()))
+    
+    @classmethod
+    def lock(cls, lock_file):
+        """Create lock_file; False if another process holds it"""
+        try:
+            os.close(os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            try:
+                if time.time() - os.stat(lock_file).st_mtime > cls.REBUILD_LOCK_SECONDS:
+                    os.remove(lock_file)  # left behind by a process that died
+            except OSError:
+                pass
+            return False
+        except OSError:
+            return False
+    
+    @classmethod
+    def rebuild(cls, path, build):
+        """Write the bytes from build() to path, unless another process is already doing it"""
+        lock_file = path + '.lock'
+        if not cls.lock(lock_file):
+            return
+        try:
+            data = build()
+            fd, temp_path = tempfile.mkstemp(prefix='.cache-', suffix='.tmp', dir=os.path.dirname(path))
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+            except BaseException:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+                raise
+        except (OSError, ValueError):
+            pass  # e.g. mapped by another query on Windows; the next query tries again
+        finally:
+            try:
+                os.remove(lock_file)
+            except OSError:
+                pass
+
+
+class CatalogSubscription:
+    """A source downloaded from a URL, such as a team catalog, kept on disk as a shortcuts file
+    
+    sync() sends the ETag/Last-Modified of the copy on disk, so an unchanged
+    catalog answers 304, and offers deltas with A-IM (RFC 3229): a server
+    that supports them answers 226 with {"upsert": [shortcut, ...],
+    "delete": [keyword, ...]} relative to the version its ETag named instead
+    of the whole catalog. Queries only read the copy on disk, which keeps
+    working offline; sync() runs in a background process. The state
+    ({'etag', 'lastModified', 'checked', 'error'}) is kept in
+    <name>.sync.json next to the copy.
+    """
+    
+    DELTA = 'shortcuts-delta'
+    TIMEOUT = 10
+    MAX_REDIRECTS = 5
+    REFRESH_MINUTES = 60
+    ERROR_RETRY_SECONDS = 5 * 60
+    USER_AGENT = 'Flow.Launcher.Plugin.Shortcuts catalog sync'
+    REDIRECTS = {301, 302, 303, 307, 308}
+    
+    def __init__(self, name, url, cache_dir, refresh_minutes=None):
+        self.name = name
+        self.url = url
+        safe_name = re.sub(r'[^\w.-]', '_', name)
+        self.path = os.path.join(cache_dir, f"{safe_name}.json")
+        self.state_file = os.path.join(cache_dir, f"{safe_name}.sync.json")
+        self.refresh_seconds = 60 * (refresh_minutes if refresh_minutes is not None else self.REFRESH_MINUTES)
+        self.state = self.load_state()
+    
+    def load_state(self):
+        """Load the sync state from disk"""
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def save_state(self):
+        """Save the sync state to disk"""
+        try:
+            with open(self.state_file, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, indent=2)
+        except OSError:
+            pass
+    
+    def due(self):
+        """Whether it is time to check the URL again (sooner after an error)"""
+        interval = self.refresh_seconds
+        if self.state.get('error'):
+            interval = min(interval, self.ERROR_RETRY_SECONDS)
+        return time.time() - self.state.get('checked', 0) >= interval
+    
+    def sync(self):
+        """Fetch the catalog if it changed and update the copy on disk
+        
+        Returns 'updated', 'unchanged' or 'error' (the copy on disk is kept).
+        """
+        import http.client  # imported on first use, only in the background process
+        
+        have_copy = os.path.exists(self.path)
+        headers = {'User-Agent': self.USER_AGENT, 'Accept': 'application/json'}
+        if have_copy and self.state.get('etag'):
+            headers['If-None-Match'] = self.state['etag']
+            headers['A-IM'] = self.DELTA
+        if have_copy and self.state.get('lastModified'):
+            headers['If-Modified-Since'] = self.state['lastModified']
+        
+        self.state['checked'] = time.time()
+        url = self.url
+        try:
+            for _ in range(self.MAX_REDIRECTS + 1):
+                parts = urlsplit(url)
+                if parts.scheme.lower() == 'https':
+                    connection = http.client.HTTPSConnection(parts.netloc, timeout=self.TIMEOUT)
+                elif parts.scheme.lower() == 'http':
+                    connection = http.client.HTTPConnection(parts.netloc, timeout=self.TIMEOUT)
+                else:
+                    raise ValueError(f"Unsupported URL: {url}")
+                try:
+                    target = urlunsplit(('', '', parts.path or '/', parts.query, ''))
+                    connection.request('GET', target, headers=headers)
+                    response = connection.getresponse()
+                    body = response.read()
+                finally:
+                    connection.close()
+                location = response.getheader('Location')
+                if response.status in self.REDIRECTS and location:
+                    url = urljoin(url, location)
+                    continue
+                break
+            else:
+                raise ValueError("Too many redirects")
+            
+            if response.status == 304:
+                result = 'unchanged'
+            elif response.status == 226 and response.getheader('IM', '').strip() == self.DELTA:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    shortcuts = json.load(f).get('shortcuts', [])
+                self.write(self.apply_delta(shortcuts, json.loads(body.decode('utf-8'))))
+                result = 'updated'
+            elif response.status == 200:
+                shortcuts = json.loads(body.decode('utf-8')).get('shortcuts')
+                if not isinstance(shortcuts, list):
+                    raise ValueError("No shortcuts list in the catalog")
+                self.write(shortcuts)
+                result = 'updated'
+            else:
+                raise ValueError(f"HTTP {response.status}")
+        except (OSError, ValueError, LookupError, TypeError, AttributeError, http.client.HTTPException) as e:
+            self.state['error'] = str(e) or e.__class__.__name__
+            self.save_state()
+            return 'error'
+        
+        if response.status != 304:
+            self.state['etag'] = response.getheader('ETag')
+            self.state['lastModified'] = response.getheader('Last-Modified')
+        self.state['error'] = ''
+        self.save_state()
+        return result
+    
+    @staticmethod
+    def apply_delta(shortcuts, delta):
+        """Shortcuts with a delta's upserts and deletions (by keyword) applied"""
+        deleted = set(delta.get('delete', []))
+        upserts = {shortcut['keyword']: shortcut for shortcut in delta.get('upsert', [])}
+        updated = []
+        for shortcut in shortcuts:
+            keyword = shortcut.get('keyword')
+            if keyword in deleted:
+                continue
+            updated.append(upserts.pop(keyword, shortcut))
+        updated.extend(upserts.values())
+        return updated
+    
+    def write(self, shortcuts):
+        """Replace the copy on disk (temp file, then rename)"""
+        fd, temp_path = tempfile.mkstemp(prefix='.sync-', suffix='.tmp', dir=os.path.dirname(self.path))
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'shortcuts': shortcuts}, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+
 class Shortcuts(FlowLauncher):
     
+    QUERY_BUDGET_MS = 15  # time a keyword search may take before it returns what it found
+    MAX_RESULTS = 100
+    # "<query> @<cursor>" from a "More results" row; one scan position per source
+    CURSOR_PATTERN = re.compile(r'^(.*\S)\s+@(\d+(?:,\d+)*)$')
+    SECONDARY_RESULTS = 20
+    SECONDARY_WEIGHT = 0.5  # score of a path/host match relative to a keyword match
+    RELEVANCE_MIN_MATCHES = 3  # with fewer keyword and path matches, relevance matches are added
+    RELEVANCE_RESULTS = 10
+    RELEVANCE_SCALE = 50  # score of a relevance match that is identical to the query
+    SOURCES_FILE = 'sources.json'
+    CACHE_DIR = 'catalog_cache'
+    
     def __init__(self):
         self.shortcuts_file = os.path.join(parent_folder_path, 'shortcuts.json')
-        self.shortcuts = self.load_shortcuts()
-        super().__init__()
+        self.cache_dir = os.path.join(parent_folder_path, self.CACHE_DIR)
+        self.subscriptions = []
+        self.sources = self.load_sources()
+        if not self.answer_query_from_cache():
+            super().__init__()
+        
+        if self.rpc_request.get('method') == 'query':
+            # After answering: sources that changed since their caches were made are
+            # searched from memory until a background process has rebuilt the caches
+            if any(source.stale() for source in self.sources):
+                self.start_background('refresh_sources', 'refresh.lock')
+            if any(subscription.due() for subscription in self.subscriptions):
+                self.start_background('sync_sources', 'sync.lock')
+    
+    def __getattr__(self, name):
+        """Read shortcuts.json and the check results the first time they are used
+        
+        Not properties: FlowLauncher looks up its methods with inspect.getmembers(),
+        which would read every property on each query.
+        """
+        loaders = {
+            'shortcuts': self.load_shortcuts,
+            'path_health': self.load_path_health,
+            'link_health': self.load_link_health
+        }
+        if name not in loaders:
+            raise AttributeError(name)
+        value = loaders[name]()
+        setattr(self, name, value)
+        return value
+    
+    def load_sources(self):
+        """The catalog's sources, in precedence order, from sources.json
+        
+        Without sources.json the catalog is just shortcuts.json. A keyword in
+        an earlier source hides the same keyword in later ones.
+        """
+        entries = [{'name': 'personal', 'path': 'shortcuts.json'}]
+        try:
+            with open(os.path.join(parent_folder_path, self.SOURCES_FILE), 'r', encoding='utf-8') as f:
+                entries = json.load(f).get('sources', entries)
+        except (OSError, ValueError, AttributeError):
+            pass
+        
+        # The editor checks the paths and links of its own catalog only
+        health_files = [os.path.join(parent_folder_path, 'shortcut_health.json'),
+                        os.path.join(parent_folder_path, 'link_health.json')]
+        own_catalog = os.path.normcase(os.path.normpath(self.shortcuts_file))
+        sources = []
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            if entry.get('url'):
+                # Searched from the last downloaded copy; sync_sources() keeps it up to date
+                name = entry.get('name') or entry['url']
+                subscription = CatalogSubscription(name, entry['url'], self.cache_dir, entry.get('refresh_minutes'))
+                self.subscriptions.append(subscription)
+                sources.append(CatalogSource(name, subscription.path, self.cache_dir))
+            elif entry.get('path'):
+                path = os.path.join(parent_folder_path, os.path.expandvars(os.path.expanduser(entry['path'])))
+                name = entry.get('name') or os.path.splitext(os.path.basename(path))[0]
+                path = os.path.normpath(path)
+                checked = os.path.normcase(path) == own_catalog
+                sources.append(CatalogSource(name, path, self.cache_dir, health_files if checked else ()))
+        return sources
+    
+    def start_background(self, method, lock_name):
+        """Run a plugin method in a detached process, unless one holding lock_name is running
+        
+        Flow Launcher reads a query's output until its process exits, so slow work
+        (rebuilding caches, downloading subscriptions) never runs in the query's process.
+        Nothing is started when main.py runs without a request (by hand or from test.py).
+        """
+        if len(sys.argv) < 2:
+            return
+        lock_file = os.path.join(self.cache_dir, lock_name)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except OSError:
+            return
+        if not CatalogSource.lock(lock_file):
+            return
+        sys.stdout.flush()
+        try:
+            request = json.dumps({'method': method, 'parameters': []})
+            subprocess.Popen([sys.executable, os.path.abspath(__file__), request],
+                             stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                             creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+        except OSError:
+            os.remove(lock_file)
+    
+    def refresh_sources(self):
+        """Rebuild the caches of the sources that changed (run by start_background())"""
+        try:
+            for source in self.sources:
+                source.refresh(lambda shortcut: self.source_result(source, shortcut))
+        finally:
+            try:
+                os.remove(os.path.join(self.cache_dir, 'refresh.lock'))
+            except OSError:
+                pass
+    
+    def sync_sources(self):
+        """Check the subscriptions that are due (run by start_background())
+        
+        Queries never wait for the network: they search the copies on disk.
+        """
+        try:
+            for subscription in self.subscriptions:
+                if subscription.due() and subscription.sync() == 'updated':
+                    # Index and render the new copy now rather than in the next query
+                    for source in self.sources:
+                        if source.path == subscription.path:
+                            CatalogSource(source.name, source.path, source.cache_dir).refresh(
+                                lambda shortcut: self.create_result(shortcut, check_health=False))
+        finally:
+            try:
+                os.remove(os.path.join(self.cache_dir, 'sync.lock'))
+            except OSError:
+                pass
+    
+    def answer_query_from_cache(self):
+        """Print the response to a keyword query from the result caches; False if FlowLauncher has to handle it"""
+        if any(source.result_cache is None for source in self.sources) or len(sys.argv) < 2:
+            return False
+        request = json.loads(sys.argv[1])
+        parameters = request.get('parameters', [])
+        if request.get('method') != 'query' or not parameters:
+            return False
+        query_lower = parameters[0].lower().strip()
+        if query_lower.startswith('shortcutlist') or query_lower == '':
+            return False
+        
+        text, start = self.parse_cursor(parameters[0])
+        query_key = BinaryCatalog.search_key(text)
+        records, cursor = self.search(query_key, start, self.QUERY_BUDGET_MS)
+        extra = [] if start else self.more_matches(query_key, records, cursor, self.QUERY_BUDGET_MS)
+        if not records and not extra and cursor is None:
+            return False  # query() builds the "No shortcuts found" result
+        last = [] if cursor is None else [self.more_results(text, cursor, len(records))]
+        self.rpc_request = request
+        hits = [(self.sources[source].result_cache, record) for source, record in sorted(records)]
+        print(ResultCache.response(hits, extra, last).decode('ascii'))
+        return True
     
     def load_shortcuts(self):
         """Load shortcuts from JSON file"""
@@ -33,6 +1160,22 @@ class Shortcuts(FlowLauncher):
             self.logger.error(f"Error loading shortcuts: {e}")
             return []
     
+    def load_path_health(self):
+        """Load path check results written by the editor (shortcut_health.json)"""
+        try:
+            with open(os.path.join(parent_folder_path, 'shortcut_health.json'), 'r', encoding='utf-8') as f:
+                return json.load(f).get('paths', {})
+        except (OSError, ValueError):
+            return {}
+    
+    def load_link_health(self):
+        """Load link check results written by the editor (link_health.json)"""
+        try:
+            with open(os.path.join(parent_folder_path, 'link_health.json'), 'r', encoding='utf-8') as f:
+                return json.load(f).get('urls', {})
+        except (OSError, ValueError):
+            return {}
+    
     def save_shortcuts(self):
         """Save shortcuts to JSON file"""
         try:
@@ -43,8 +1186,12 @@ class Shortcuts(FlowLauncher):
             self.logger.error(f"Error saving shortcuts: {e}")
             return False
     
-    def query(self, query):
-        """Main query handler"""
+    def query(self, query, budget_ms=QUERY_BUDGET_MS):
+        """Main query handler
+        
+        A keyword search stops after MAX_RESULTS matches or budget_ms, whichever
+        comes first, and then ends with a "More results" row that continues it.
+        """
         results = []
         query_lower = query.lower().strip()
         
@@ -53,10 +1200,14 @@ class Shortcuts(FlowLauncher):
             return self.show_shortcut_list(query_lower.replace('shortcutlist', '').strip())
         
         # Search shortcuts by keyword
-        for shortcut in self.shortcuts:
-            keyword = shortcut.get('keyword', '').lower()
-            if query_lower in keyword or keyword.startswith(query_lower):
-                results.append(self.create_result(shortcut))
+        text, start = self.parse_cursor(query)
+        query_key = BinaryCatalog.search_key(text)  # the catalogs store their keys already normalized
+        records, cursor = self.search(query_key, start, budget_ms)
+        for source, record in sorted(records):
+            results.append(self.source_result(self.sources[source], self.sources[source].index().shortcut(record)))
+        if not start:
+            # Path and host (and maybe relevance) matches, merged by their lower scores
+            results.extend(self.more_matches(query_key, records, cursor, budget_ms))
         
         # Sort by priority (higher first) and keyword match quality
         results.sort(key=lambda x: (
@@ -64,6 +1215,9 @@ class Shortcuts(FlowLauncher):
             len(x.get('Title', ''))  # Shorter matches first
         ))
         
+        if cursor is not None:
+            results.append(self.more_results(text, cursor, len(records)))
+        
         if not results and query:
             results.append({
                 "Title": f"No shortcuts found for '{query}'",
@@ -77,16 +1231,209 @@ class Shortcuts(FlowLauncher):
         
         return results
     
+    def parse_cursor(self, query):
+        """Split a query into (search text, scan position in each source to start from)"""
+        match = self.CURSOR_PATTERN.match(query.strip())
+        if match:
+            return match.group(1), [int(position) for position in match.group(2).split(',')]
+        return query.strip(), []
+    
+    def search(self, query_key, start=(), budget_ms=None):
+        """Find the shortcuts whose keyword's search key contains query_key, best ranked first
+        
+        Scans every source in ranking order from its position in start and
+        merges the matches, until MAX_RESULTS are found or budget_ms runs out.
+        A match whose keyword an earlier source also has is left out. Returns
+        (records, cursor): (source number, record) pairs, and the scan
+        positions to continue from (None if every scan got to the end).
+        """
+        indexes = [source.index() for source in self.sources]
+        deadline = None if budget_ms is None else time.perf_counter() + budget_ms / 1000
+        positions = [min(start[number] if number < len(start) else 0, len(index))
+                     for number, index in enumerate(indexes)]
+        scans = [index.scan(query_key, position) for index, position in zip(indexes, positions)]
+        heads = [None] * len(indexes)  # next match of each source: (rank, position, record)
+        out_of_time = False
+        
+        def advance(number):
+            """Scan source number up to its next match; False if the time ran out"""
+            index = indexes[number]
+            for position, record in scans[number]:
+                positions[number] = position
+                if record is not None:
+                    keyword = index.keyword(position - 1)
+                    if not self.overridden(indexes, number, keyword):
+                        heads[number] = ((-index.priority(record), len(keyword)), position, record)
+                        return True
+                if deadline is not None and time.perf_counter() > deadline:
+                    return False
+            positions[number] = len(index)
+            return True
+        
+        records = []
+        for number in range(len(indexes)):
+            if not advance(number):
+                out_of_time = True
+                break
+        while not out_of_time and len(records) < self.MAX_RESULTS:
+            pending = [number for number in range(len(heads)) if heads[number] is not None]
+            if not pending:
+                break
+            number = min(pending, key=lambda number: heads[number][0])
+            records.append((number, heads[number][2]))
+            heads[number] = None
+            if len(records) < self.MAX_RESULTS:
+                out_of_time = not advance(number) or (deadline is not None and time.perf_counter() > deadline)
+        
+        # A match found but not returned is found again by the next search
+        cursor = [head[1] - 1 if head is not None else position for head, position in zip(heads, positions)]
+        if all(position >= len(index) for position, index in zip(cursor, indexes)):
+            cursor = None
+        return records, cursor
+    
+    def more_matches(self, query_key, records, cursor, budget_ms=None):
+        """Results besides the keyword matches (records) for the first page, best first
+        
+        Path and host matches, and when they and the keyword search found fewer
+        than RELEVANCE_MIN_MATCHES in the whole catalog, relevance matches.
+        They get a budget_ms of their own and return what they found by then.
+        """
+        deadline = None if budget_ms is None else time.perf_counter() + budget_ms / 1000
+        matches = self.secondary_results(query_key, deadline)
+        if (cursor is None and len(records) + len(matches) < self.RELEVANCE_MIN_MATCHES
+                and (deadline is None or time.perf_counter() < deadline)):
+            matches += self.relevance_results(query_key, set(records) | {hit for hit, _ in matches}, deadline)
+        results = [result for _, result in matches]
+        results.sort(key=lambda x: (-x.get('Score', 0), len(x.get('Title', ''))))
+        return results
+    
+    def secondary_results(self, query_key, deadline=None):
+        """Shortcuts found through their path segments, file name or URL host, as (hit, result) pairs
+        
+        Only shortcuts whose keyword doesn't match (those are keyword results,
+        on this page or a later one), at most SECONDARY_RESULTS of the highest
+        priority, scored at SECONDARY_WEIGHT. A hit is (source number, record).
+        Stops with what it has at deadline (a time.perf_counter() value).
+        """
+        indexes = [source.index() for source in self.sources]
+        hits = []
+        for number, source in enumerate(self.sources):
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            terms = source.term_index()
+            if terms is not None:
+                hits.extend((-indexes[number].priority(record), number, record)
+                            for record in terms.search(query_key))
+        hits.sort()
+        
+        results = []
+        for _, number, record in hits:
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            keyword = indexes[number].record_keyword(record)
+            if query_key in keyword or self.overridden(indexes, number, keyword):
+                continue
+            result = self.source_result(self.sources[number], indexes[number].shortcut(record))
+            if result['Score'] > 0:  # dead links stay below everything
+                result['Score'] = int(result['Score'] * self.SECONDARY_WEIGHT)
+            results.append(((number, record), result))
+            if len(results) >= self.SECONDARY_RESULTS:
+                break
+        return results
+    
+    def relevance_results(self, query_key, shown, deadline=None):
+        """The shortcuts most relevant to the query by TF-IDF, as (hit, result) pairs
+        
+        At most RELEVANCE_RESULTS, leaving out the hits in shown; scored by
+        their similarity to the query, from 0 to RELEVANCE_SCALE. Stops with
+        what it has at deadline (a time.perf_counter() value).
+        """
+        indexes = [source.index() for source in self.sources]
+        hits = []
+        for number, source in enumerate(self.sources):
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            relevance = source.relevance_index()
+            if relevance is not None:
+                hits.extend((-similarity, number, record) for record, similarity in
+                            relevance.search(query_key, self.RELEVANCE_RESULTS + len(shown)))
+        hits.sort()
+        
+        results = []
+        for similarity, number, record in hits:
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            if (number, record) in shown:
+                continue
+            if self.overridden(indexes, number, indexes[number].record_keyword(record)):
+                continue
+            result = self.source_result(self.sources[number], indexes[number].shortcut(record))
+            if result['Score'] > 0:  # dead links stay below everything
+                result['Score'] = int(-similarity * self.RELEVANCE_SCALE)
+            results.append(((number, record), result))
+            if len(results) >= self.RELEVANCE_RESULTS:
+                break
+        return results
+    
+    @staticmethod
+    def overridden(indexes, number, keyword):
+        """Whether a source before source number has keyword"""
+        return any(indexes[earlier].contains(keyword) for earlier in range(number))
+    
+    def more_results(self, text, cursor, shown):
+        """Row ending a search that stopped early; choosing it continues the search from cursor"""
+        query = f"{text} @{','.join(str(position) for position in cursor)}"
+        action_keyword = self.action_keyword()
+        if action_keyword != '*':
+            query = f"{action_keyword} {query}"
+        return {
+            "Title": "More results…",
+            "SubTitle": f"{shown} match(es) shown - press Enter to keep searching",
+            "IcoPath": "Images/shortcut.png",
+            "Score": -1000,  # below every shortcut, dead links included
+            "JsonRPCAction": {
+                "method": "Flow.Launcher.ChangeQuery",
+                "parameters": [query, True],
+                "dontHideAfterAction": True
+            }
+        }
+    
+    def action_keyword(self):
+        """The plugin's action keyword from plugin.json ("*" when it has none)"""
+        try:
+            with open(os.path.join(parent_folder_path, 'plugin.json'), 'r', encoding='utf-8') as f:
+                return json.load(f).get('ActionKeyword', '*')
+        except (OSError, ValueError):
+            return '*'
+    
+    def all_shortcuts(self):
+        """(shortcut, search key of its category) for every source, without the shortcuts an
+        earlier source overrides"""
+        seen = set()
+        shortcuts = []
+        for source in self.sources:
+            index = source.index()
+            keywords = set()
+            for record in range(len(index)):
+                keyword = index.record_keyword(record)
+                if keyword not in seen:
+                    shortcuts.append((index.shortcut(record), index.category(record)))
+                keywords.add(keyword)
+            seen |= keywords
+        return shortcuts
+    
     def show_shortcut_list(self, filter_category=''):
         """Display all shortcuts grouped by category"""
         results = []
         
         # Group shortcuts by category
         categories = {}
-        for shortcut in self.shortcuts:
+        category_keys = {}
+        for shortcut, category_key in self.all_shortcuts():
             category = shortcut.get('category', 'Uncategorized')
             if category not in categories:
                 categories[category] = []
+                category_keys[category] = category_key
             categories[category].append(shortcut)
         
         # Sort categories: Folders, Files, Apps, then alphabetically
@@ -99,7 +1446,8 @@ class Shortcuts(FlowLauncher):
         
         # Filter by category if specified
         if filter_category:
-            sorted_categories = [c for c in sorted_categories if filter_category.lower() in c.lower()]
+            filter_key = BinaryCatalog.search_key(filter_category)
+            sorted_categories = [c for c in sorted_categories if filter_key in category_keys[c]]
         
         # Add category headers and shortcuts with invisible ordering prefix
         result_counter = 1
@@ -145,7 +1493,11 @@ class Shortcuts(FlowLauncher):
         
         return results
     
-    def create_result(self, shortcut, show_category=True):
+    def source_result(self, source, shortcut):
+        """The result of a shortcut from source, flagged by the check results only if source has them"""
+        return self.create_result(shortcut, check_health=bool(source.health_files))
+    
+    def create_result(self, shortcut, show_category=True, check_health=True):
         """Create a Flow Launcher result from a shortcut"""
         keyword = shortcut.get('keyword', '')
         path = shortcut.get('path', '')
@@ -153,13 +1505,17 @@ class Shortcuts(FlowLauncher):
         category = shortcut.get('category', 'Uncategorized')
         icon = shortcut.get('icon', 'Images/shortcut.png')
         priority = shortcut.get('priority', 50)
+        priority = priority if isinstance(priority, int) else 50  # as the catalogs rank it
         open_with = shortcut.get('openWith', '')
         
         # Resolve icon path
         if icon and not os.path.isabs(icon):
             icon = os.path.join(parent_folder_path, icon)
         if not os.path.exists(icon):
-            icon = os.path.join(parent_folder_path, "Images/shortcut.png")
+            # Normalized icon missing from the cache: fall back to its original file
+            icon = shortcut.get('iconSource', '')
+            if not icon or not os.path.exists(icon):
+                icon = os.path.join(parent_folder_path, "Images/shortcut.png")
         
         # Create subtitle based on type
         if shortcut_type == 'url':
@@ -177,6 +1533,19 @@ class Shortcuts(FlowLauncher):
         if show_category:
             subtitle = f"[{category}] {subtitle}"
         
+        if shortcut.get('stale'):
+            subtitle = f"⚠ Deleted in browser - {subtitle}"
+        elif check_health and shortcut_type == 'url':
+            if self.link_health.get(path, {}).get('status') == 'dead':
+                subtitle = f"⚠ Dead link - {subtitle}"
+                priority -= 200  # below every live shortcut (priorities are 0-200)
+        elif check_health:
+            health = self.path_health.get(path, {})
+            if health.get('status') == 'missing':
+                subtitle = f"⚠ Not found - {subtitle}"
+            elif health.get('status') == 'unreachable':
+                subtitle = f"⚠ Unreachable - {subtitle}"
+        
         return {
             "Title": keyword,
             "SubTitle": subtitle,
@@ -206,7 +1575,7 @@ class Shortcuts(FlowLauncher):
         try:
             shortcut = json.loads(data) if isinstance(data, str) else data
             
-            return [
+            menu = [
                 {
                     "Title": "Open Shortcuts Editor",
                     "SubTitle": "Edit this shortcut or add new ones",
@@ -224,8 +1593,11 @@ class Shortcuts(FlowLauncher):
                         "method": "copy_to_clipboard",
                         "parameters": [shortcut.get('path', '')]
                     }
-                },
-                {
+                }
+            ]
+            # Shortcuts from team, imported or subscribed sources are changed in their own files
+            if shortcut in self.shortcuts:
+                menu.append({
                     "Title": "Delete Shortcut",
                     "SubTitle": f"Remove '{shortcut.get('keyword', '')}' from shortcuts",
                     "IcoPath": "Images/delete.png",
@@ -233,8 +1605,8 @@ class Shortcuts(FlowLauncher):
                         "method": "delete_shortcut",
                         "parameters": [shortcut.get('keyword', '')]
                     }
-                }
-            ]
+                })
+            return menu
         except Exception as e:
             self.logger.error(f"Context menu error: {e}")
             return []
@@ -268,32 +1640,98 @@ class Shortcuts(FlowLauncher):
             self.logger.error(f"Error executing shortcut: {e}")
     
     def open_editor(self, shortcut_json=None):
-        """Open the shortcuts editor GUI"""
+        """Bring the shortcuts editor GUI to the front, starting it if it isn't running"""
         try:
-            # Try multiple possible locations for the editor
-            possible_paths = [
-                # Development location
-                os.path.join(os.path.dirname(parent_folder_path), 'ShortcutsEditor', 'editor.py'),
-                # Installed alongside plugin in Plugins folder
-                os.path.join(os.path.dirname(parent_folder_path), 'Flow.Launcher.Plugin.Shortcuts.Editor', 'editor.py'),
-                # In plugin directory
-                os.path.join(parent_folder_path, 'editor.py'),
-            ]
+            keyword = ''
+            if shortcut_json:
+                shortcut = json.loads(shortcut_json) if isinstance(shortcut_json, str) else shortcut_json
+                keyword = shortcut.get('keyword', '')
             
-            editor_path = None
-            for path in possible_paths:
-                if os.path.exists(path):
-                    editor_path = path
-                    break
+            # A running editor answers on its local socket; far cheaper than starting PySide6
+            if self.activate_running_editor(keyword):
+                return
             
+            editor_path = self.find_editor()
             if editor_path:
-                subprocess.Popen([sys.executable, editor_path])
+                arguments = ['--focus', keyword] if keyword else []
+                subprocess.Popen([sys.executable, editor_path] + arguments)
             else:
                 # Fallback: open shortcuts.json in default editor
                 os.startfile(self.shortcuts_file)
         except Exception as e:
             self.logger.error(f"Error opening editor: {e}")
     
+    def activate_running_editor(self, keyword=''):
+        """Ask a running editor to come to the front and select keyword; False if none answers"""
+        # Must match ShortcutsEditorWindow.instance_server_name() in the editor
+        user = os.environ.get('USERNAME') or os.environ.get('USER', '')
+        name = f"FlowLauncherShortcutsEditor-{user}"
+        message = (json.dumps({'command': 'activate', 'keyword': keyword}) + '\n').encode('utf-8')
+        try:
+            if os.name == 'nt':
+                # The named pipe only exists while an editor is listening
+                with open('\\\\.\\pipe\\' + name, 'r+b', buffering=0) as pipe:
+                    pipe.write(message)
+                    return self.read_pipe_reply(pipe, 1.0).startswith(b'ok')
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+                connection.settimeout(1.0)
+                connection.connect(os.path.join(tempfile.gettempdir(), name))
+                connection.sendall(message)
+                return connection.recv(16).startswith(b'ok')
+        except OSError:
+            return False
+    
+    @staticmethod
+    def read_pipe_reply(pipe, timeout):
+        """What a Windows named pipe has to read within timeout seconds (b'' if nothing)
+        
+        A read on the pipe would block until the editor answers, so this polls
+        PeekNamedPipe instead; a hung editor then counts as not running.
+        """
+        import ctypes
+        import msvcrt
+        handle = msvcrt.get_osfhandle(pipe.fileno())
+        available = ctypes.c_ulong(0)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not ctypes.windll.kernel32.PeekNamedPipe(handle, None, 0, None, ctypes.byref(available), None):
+                return b''
+            if available.value:
+                return pipe.read(available.value)
+            time.sleep(0.01)
+        return b''
+    
+    def find_editor(self):
+        """Locate editor.py, remembering the result in editor_path.txt"""
+        cache_file = os.path.join(parent_folder_path, 'editor_path.txt')
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = f.read().strip()
+            if cached and os.path.exists(cached):
+                return cached
+        except OSError:
+            pass
+        
+        # Try multiple possible locations for the editor
+        possible_paths = [
+            # Development location
+            os.path.join(os.path.dirname(parent_folder_path), 'ShortcutsEditor', 'editor.py'),
+            # Installed alongside plugin in Plugins folder
+            os.path.join(os.path.dirname(parent_folder_path), 'Flow.Launcher.Plugin.Shortcuts.Editor', 'editor.py'),
+            # In plugin directory
+            os.path.join(parent_folder_path, 'editor.py'),
+        ]
+        
+        for path in possible_paths:
+            if os.path.exists(path):
+                try:
+                    with open(cache_file, 'w', encoding='utf-8') as f:
+                        f.write(path)
+                except OSError:
+                    pass
+                return path
+        return None
+    
     def copy_to_clipboard(self, text):
         """Copy text to clipboard"""
         try:
@@ -308,10 +1746,12 @@ class Shortcuts(FlowLauncher):
                          capture_output=True, shell=True)
     
     def delete_shortcut(self, keyword):
-        """Delete a shortcut by keyword"""
+        """Delete a shortcut from shortcuts.json by keyword"""
         try:
-            self.shortcuts = [s for s in self.shortcuts if s.get('keyword') != keyword]
-            self.save_shortcuts()
+            remaining = [s for s in self.shortcuts if s.get('keyword') != keyword]
+            if len(remaining) < len(self.shortcuts):
+                self.shortcuts = remaining
+                self.save_shortcuts()
         except Exception as e:
             self.logger.error(f"Error deleting shortcut: {e}")
     
@@ -7,12 +7,35 @@ Run this to test plugin functionality without Flow Launcher
 
 import sys
 import os
+import io
 import json
+import tempfile
+import time
+import threading
+from http.server import HTTPServer, ThreadingHTTPServer, BaseHTTPRequestHandler
 
 # Add plugin to path
 sys.path.insert(0, os.path.dirname(__file__))
 
-from main import Shortcuts
+from main import Shortcuts, BinaryCatalog, ResultCache, CatalogSource, CatalogSubscription, TermIndex, RelevanceIndex
+
+
+def make_source(directory, name, shortcuts):
+    """Write shortcuts to <directory>/<name>.json and return it as a catalog source"""
+    path = os.path.join(directory, f"{name}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'shortcuts': shortcuts}, f)
+    return CatalogSource(name, path, os.path.join(directory, 'catalog_cache'))
+
+
+def make_plugin(directory, **sources):
+    """A plugin without check results whose catalog is sources (name=shortcuts), cached in directory"""
+    plugin = Shortcuts()
+    plugin.path_health = {}
+    plugin.link_health = {}
+    plugin.cache_dir = os.path.join(directory, 'catalog_cache')
+    plugin.sources = [make_source(directory, name, shortcuts) for name, shortcuts in sources.items()]
+    return plugin
 
 
 def print_results(results, title="Results"):
@@ -135,6 +158,21 @@ def test_actions():
         print("[OK] Method exists")
     except:
         print("[FAIL] Method not found")
+    
+    # Delete is only offered for shortcuts.json, and deleting nothing leaves it untouched
+    with tempfile.TemporaryDirectory() as directory:
+        plugin.shortcuts_file = os.path.join(directory, 'shortcuts.json')
+        plugin.shortcuts = [{"keyword": "mine", "type": "url", "path": "https://example.com/mine"}]
+        team = {"keyword": "team", "type": "url", "path": "https://example.com/team"}
+        titles = [[item["Title"] for item in plugin.context_menu(json.dumps(shortcut))]
+                  for shortcut in (plugin.shortcuts[0], team)]
+        ok = "Delete Shortcut" in titles[0] and "Delete Shortcut" not in titles[1]
+        print(f"\n{'[OK]' if ok else '[FAIL]'} Delete offered for personal shortcuts only")
+        plugin.delete_shortcut("team")
+        unchanged = not os.path.exists(plugin.shortcuts_file)
+        plugin.delete_shortcut("mine")
+        deleted = plugin.load_shortcuts() == []
+        print(f"{'[OK]' if unchanged and deleted else '[FAIL]'} Deleting another source's keyword writes nothing")
 
 
 def test_result_creation():
@@ -161,6 +199,759 @@ def test_result_creation():
     print("\nCreated result:")
     result = plugin.create_result(sample)
     print(json.dumps(result, indent=2))
+    
+    # Shortcut the editor's path check found missing
+    plugin.path_health = {"C:/Missing/report.docx": {"status": "missing"}}
+    broken = {
+        "keyword": "report",
+        "type": "file",
+        "path": "C:/Missing/report.docx",
+        "category": "Testing"
+    }
+    
+    print("\nSubtitle of a shortcut with a missing path:")
+    print(plugin.create_result(broken)["SubTitle"])
+    
+    # Bookmark the editor's link check found dead: flagged and ranked last
+    plugin.link_health = {"https://example.com": {"status": "dead", "code": 404}}
+    dead = plugin.create_result(sample)
+    print("\nDead link result:")
+    print(f"{dead['SubTitle']} (Score: {dead['Score']})")
+
+
+def test_binary_catalog():
+    """Test the binary catalog written by the editor against the JSON search"""
+    print("\n" + "="*60)
+    print("BINARY CATALOG TEST")
+    print("="*60)
+    
+    try:
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ShortcutsEditor'))
+        from editor import BinaryCatalog as CatalogWriter
+    except ImportError as e:
+        print(f"\n[SKIP] Editor not importable: {e}")
+        return
+    
+    # The editor writes the format the plugin reads
+    def layout(catalog):
+        return [catalog.FILE_NAME, catalog.MAGIC, catalog.VERSION,
+                catalog.HEADER.format, catalog.RECORD.format, catalog.INDEX_ITEM.format]
+    
+    same = layout(CatalogWriter) == layout(BinaryCatalog)
+    print(f"\n{'[OK]' if same else '[FAIL]'} Editor and plugin agree on the format: {layout(BinaryCatalog)}")
+    
+    shortcuts = [{"keyword": f"site{i}", "type": "url", "path": f"https://example.com/{i}", "priority": i % 200,
+                  "category": ["Work", "Café", "ＦＵＬＬ"][i % 3]}
+                 for i in range(1000)]
+    shortcuts.append({"keyword": "Straße", "type": "folder", "path": "C:/Straße"})
+    
+    with tempfile.TemporaryDirectory() as directory:
+        shortcuts_file = os.path.join(directory, 'shortcuts.json')
+        with open(shortcuts_file, 'w', encoding='utf-8') as f:
+            json.dump({'shortcuts': shortcuts}, f)
+        stat = os.stat(shortcuts_file)
+        CatalogWriter.write(shortcuts_file, shortcuts, (stat.st_mtime_ns, stat.st_size))
+        
+        catalog = BinaryCatalog.open(os.path.join(directory, BinaryCatalog.FILE_NAME), shortcuts_file)
+        print(f"\nRecords: {len(catalog)}, checksum ok: {catalog.verify()}")
+        for query in ['site12', 'straße', 'nothing']:
+            key = BinaryCatalog.search_key(query)
+            found = sorted(record for _, record in catalog.scan(key) if record is not None)
+            expected = [i for i, s in enumerate(shortcuts) if key in BinaryCatalog.search_key(s['keyword'])]
+            status = "[OK]" if found == expected else "[FAIL]"
+            print(f"{status} '{query}': {len(found)} match(es)")
+        print(f"Decoded record: {catalog.shortcut(len(shortcuts) - 1)}")
+        decoded = all(catalog.shortcut(record) == shortcut
+                      and catalog.record_keyword(record) == BinaryCatalog.search_key(shortcut['keyword'])
+                      and catalog.category(record) == BinaryCatalog.search_key(shortcut.get('category', 'Uncategorized'))
+                      for record, shortcut in enumerate(shortcuts))
+        print(f"{'[OK]' if decoded else '[FAIL]'} Plugin reads every record, keyword and category the editor wrote")
+        keys = [BinaryCatalog.search_key(s['keyword']) for s in shortcuts]
+        found = all(catalog.contains(key) for key in keys)
+        missing = not any(catalog.contains(key) for key in ['site', 'site1000', 'stras', 'zzz', ''])
+        print(f"{'[OK]' if found and missing else '[FAIL]'} Keyword lookup finds every keyword and nothing else")
+        with open(os.path.join(directory, BinaryCatalog.FILE_NAME), 'rb') as f:
+            same = f.read() == BinaryCatalog.build(shortcuts, (stat.st_mtime_ns, stat.st_size))
+        print(f"{'[OK]' if same else '[FAIL]'} Plugin builds the same catalog as the editor")
+        del catalog  # release the mapping before the directory is removed
+        
+        # Editing shortcuts.json makes the binary catalog out of date
+        with open(shortcuts_file, 'a', encoding='utf-8') as f:
+            f.write('\n')
+        stale = BinaryCatalog.open(os.path.join(directory, BinaryCatalog.FILE_NAME), shortcuts_file)
+        print(f"{'[OK]' if stale is None else '[FAIL]'} Out-of-date catalog ignored")
+
+
+def test_result_cache():
+    """Test cached results against rendering them per query, and time both"""
+    print("\n" + "="*60)
+    print("RESULT CACHE TEST")
+    print("="*60)
+    
+    shortcuts = [{"keyword": f"site{i}", "type": "url", "path": f"https://example.com/{i}",
+                  "category": "Testing", "priority": i % 200, "icon": "Images/bookmark.png"}
+                 for i in range(1000)]
+    shortcuts[3]["priority"] = 50.5  # hand-edited priorities rank as the default, 50
+    shortcuts[4]["priority"] = "high"
+    records = range(len(shortcuts))
+    rounds = 20
+    
+    with tempfile.TemporaryDirectory() as directory:
+        plugin = make_plugin(directory, test=shortcuts)
+        
+        # Before: render every result and let FlowLauncher encode the response
+        start = time.perf_counter()
+        for _ in range(rounds):
+            results = [plugin.create_result(shortcuts[record]) for record in records]
+            results.sort(key=lambda x: (-x.get('Score', 0), len(x.get('Title', ''))))
+            expected = json.dumps({"result": results, "debugMessage": ""})
+        before = (time.perf_counter() - start) / rounds * 1000
+        
+        source = plugin.sources[0]
+        source.refresh(plugin.create_result)
+        cache = ResultCache.open(source.result_cache_file, source.result_cache_key)
+        
+        # After: join the cached results
+        start = time.perf_counter()
+        for _ in range(rounds):
+            response = ResultCache.response([(cache, record) for record in records]).decode('ascii')
+        after = (time.perf_counter() - start) / rounds * 1000
+        
+        status = "[OK]" if response == expected else "[FAIL]"
+        print(f"\n{status} Cached response matches the rendered one")
+        print(f"Serialization per 1,000 results: {before:.2f} ms rendered, {after:.2f} ms cached")
+        other = ResultCache.open(source.result_cache_file, b'other')
+        print(f"{'[OK]' if other is None else '[FAIL]'} Cache for another version ignored")
+        del cache, source, plugin.sources  # release the mappings before the directory is removed
+
+
+def test_query_budget():
+    """Test that a broad search returns the best matches and a row that continues it"""
+    print("\n" + "="*60)
+    print("QUERY BUDGET TEST")
+    print("="*60)
+    
+    shortcuts = [{"keyword": f"site{i}", "type": "url", "path": f"https://example.com/{i}",
+                  "priority": i % 200} for i in range(5000)]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        plugin = make_plugin(directory, test=shortcuts)
+        results = plugin.query("site")
+        more = results[-1]
+        scores = [result["Score"] for result in results[:-1]]
+        print(f"\n{len(results) - 1} results, best score {scores[0]}, then: {more['Title']} ({more['SubTitle']})")
+        best = sorted((s["priority"] for s in shortcuts), reverse=True)[:len(scores)]
+        print(f"{'[OK]' if scores == best else '[FAIL]'} Highest priorities found first")
+        
+        next_query = more["JsonRPCAction"]["parameters"][0].split(' ', 1)[1]  # without the action keyword
+        following = plugin.query(next_query)
+        print(f"Continuing with '{next_query}': best score {following[0]['Score']}")
+        first_page = {result["Title"] for result in results[:-1]}
+        print(f"{'[OK]' if not first_page & {r['Title'] for r in following[:-1]} else '[FAIL]'} No result repeated")
+        
+        results = plugin.query("site", budget_ms=0)
+        print(f"With no time budget: {len(results) - 1} result(s), then '{results[-1]['Title']}'")
+
+
+def test_sources():
+    """Test a catalog layered from several sources"""
+    print("\n" + "="*60)
+    print("CATALOG SOURCES TEST")
+    print("="*60)
+    
+    personal = [{"keyword": "shared", "type": "url", "path": "https://personal.example.com"},
+                {"keyword": "site-mine", "type": "url", "path": "https://example.com/mine", "priority": 120}]
+    team = [{"keyword": "Shared", "type": "url", "path": "https://team.example.com"}]
+    team += [{"keyword": f"site{i}", "type": "url", "path": f"https://example.com/{i}", "priority": i % 200}
+             for i in range(3000)]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        plugin = make_plugin(directory, personal=personal, team=team)
+        results = plugin.query("shared")
+        paths = [json.loads(r["JsonRPCAction"]["parameters"][0])["path"] for r in results]
+        print(f"\n{'[OK]' if paths == ['https://personal.example.com'] else '[FAIL]'} "
+              f"Earlier source overrides a keyword: {paths}")
+        
+        results = plugin.query("site")
+        scores = [result["Score"] for result in results[:-1]]
+        best = sorted([120] + [s["priority"] for s in team[1:]], reverse=True)[:len(scores)]
+        print(f"{'[OK]' if scores == best else '[FAIL]'} Sources merged in ranking order")
+        next_query = results[-1]["JsonRPCAction"]["parameters"][0].split(' ', 1)[1]
+        following = plugin.query(next_query)
+        first_page = {result["Title"] for result in results[:-1]}
+        repeated = first_page & {r['Title'] for r in following[:-1]}
+        print(f"{'[OK]' if not repeated else '[FAIL]'} Continuing with '{next_query}' repeats nothing")
+        
+        # Index and render both, then edit only the personal source
+        for source in plugin.sources:
+            source.refresh(plugin.create_result)
+        team_files = [plugin.sources[1].catalog_file, plugin.sources[1].result_cache_file]
+        team_times = [os.stat(path).st_mtime_ns for path in team_files]
+        time.sleep(0.01)
+        make_source(directory, 'personal', personal + [{"keyword": "new", "type": "url", "path": "https://new.example"}])
+        sources = [CatalogSource(s.name, s.path, s.cache_dir) for s in plugin.sources]
+        print(f"{'[OK]' if sources[0].stale() else '[FAIL]'} Edited source needs new caches")
+        fresh = not sources[1].stale()
+        print(f"{'[OK]' if fresh else '[FAIL]'} Other source keeps its caches")
+        plugin.sources = sources
+        plugin.refresh_sources()  # what the background process started after a query runs
+        rebuilt = not any(CatalogSource(s.name, s.path, s.cache_dir).stale() for s in sources)
+        print(f"{'[OK]' if rebuilt else '[FAIL]'} Background refresh rebuilt the edited source")
+        untouched = [os.stat(path).st_mtime_ns for path in team_files] == team_times
+        print(f"{'[OK]' if untouched else '[FAIL]'} Only the edited source was rebuilt")
+        del sources, fresh, plugin.sources  # release the mappings before the directory is removed
+        
+        # Check results belong to the editor's catalog: rewriting them leaves other sources' caches valid
+        import main
+        with open(os.path.join(directory, 'sources.json'), 'w', encoding='utf-8') as f:
+            json.dump({'sources': [{'name': 'mine', 'path': 'shortcuts.json'},
+                                   {'name': 'team', 'path': 'team.json'}]}, f)
+        with open(os.path.join(directory, 'shortcuts.json'), 'w', encoding='utf-8') as f:
+            json.dump({'shortcuts': personal}, f)
+        parent = main.parent_folder_path
+        main.parent_folder_path = directory
+        try:
+            plugin.shortcuts_file = os.path.join(directory, 'shortcuts.json')
+            plugin.sources = plugin.load_sources()
+            plugin.refresh_sources()
+            with open(os.path.join(directory, 'link_health.json'), 'w', encoding='utf-8') as f:
+                json.dump({'urls': {"https://example.com/2999": {"status": "dead"}}}, f)
+            plugin.sources = plugin.load_sources()
+        finally:
+            main.parent_folder_path = parent
+        stale = [source.stale() for source in plugin.sources]
+        print(f"{'[OK]' if stale == [True, False] else '[FAIL]'} New check results invalidate only "
+              f"the editor's catalog: {stale}")
+        plugin.link_health = {"https://example.com/2999": {"status": "dead"}}
+        subtitle = plugin.query("site2999")[0]["SubTitle"]
+        print(f"{'[OK]' if 'Dead link' not in subtitle else '[FAIL]'} Team shortcut not flagged: {subtitle}")
+        del stale, plugin.sources
+
+
+def test_term_index():
+    """Test finding shortcuts by path segment, file name and URL host"""
+    print("\n" + "="*60)
+    print("TERM INDEX TEST")
+    print("="*60)
+    
+    shortcuts = [
+        {"keyword": "ta", "type": "url", "path": "https://www.tech-artists.org/forum", "priority": 80},
+        {"keyword": "pfx", "type": "app", "path": "C:/Tools/PopcornFX-2.23.2/bin/PopcornFX-Editor.exe"},
+        {"keyword": "tech-notes", "type": "folder", "path": "D:/Notes/Tech"},
+        {"keyword": "tech-old", "type": "folder", "path": "D:/Notes/Old", "priority": 10}
+    ]
+    shortcuts += [{"keyword": f"site{i}", "type": "url", "path": f"https://host{i}.example.com/page{i}"}
+                  for i in range(20000)]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        plugin = make_plugin(directory, test=shortcuts)
+        source = plugin.sources[0]
+        no_index = source.term_index() is None
+        print(f"\n{'[OK]' if no_index else '[FAIL]'} No index built in the query for {len(shortcuts):,} shortcuts")
+        source.refresh(plugin.create_result)
+        plugin.sources = [CatalogSource(source.name, source.path, source.cache_dir)]
+        for query, expected in [("tech-artists.org", ["ta"]), ("popcornfx-2.23.2/bin", ["pfx"]),
+                                ("popcornfx-editor", ["pfx"]), ("https://www.tech-artists.org", ["ta"]),
+                                ("tech", ["tech-notes", "ta"]), ("host123.example.com", ["site123"])]:
+            results = plugin.query(query)
+            # Relevance matches may follow with lower scores when there are few
+            titles = [result["Title"] for result in results][:len(expected)]
+            status = "[OK]" if titles == expected else "[FAIL]"
+            print(f"{status} '{query}': {titles} (scores {[result.get('Score') for result in results[:5]]})")
+        
+        # The cached path merges path matches by score like query() does: 'ta' before 'tech-old'
+        argv, stdout = sys.argv, sys.stdout
+        sys.argv, sys.stdout = ['main.py', json.dumps({'method': 'query', 'parameters': ['tech']})], io.StringIO()
+        try:
+            answered = plugin.answer_query_from_cache()
+            cached = json.loads(sys.stdout.getvalue())['result'] if answered else []
+        finally:
+            sys.argv, sys.stdout = argv, stdout
+        same = [r['Title'] for r in cached] == [r['Title'] for r in plugin.query('tech', None)]
+        print(f"{'[OK]' if answered and same else '[FAIL]'} Cached path orders 'tech' like query(): "
+              f"{[r['Title'] for r in cached][:4]}")
+        
+        # The index on disk answers like one built in memory
+        on_disk = plugin.sources[0].terms
+        in_memory = TermIndex(TermIndex.build(b'', shortcuts), b'')
+        same = on_disk is not None and on_disk.search("example.com") == in_memory.search("example.com")
+        print(f"{'[OK]' if same else '[FAIL]'} Index on disk matches the one in memory")
+        
+        start = time.perf_counter()
+        for i in range(100):
+            on_disk.search(f"host{i * 7}.example")
+        lookup = (time.perf_counter() - start) * 10
+        start = time.perf_counter()
+        for i in range(10):
+            [s for s in shortcuts if f"host{i * 7}.example" in s["path"].lower()]
+        scan = (time.perf_counter() - start) * 100
+        print(f"Lookup in 20,000 paths: {lookup:.3f} ms indexed, {scan:.2f} ms scanning every path")
+        del on_disk, source, plugin.sources  # release the mappings before the directory is removed
+
+
+def test_relevance():
+    """Test the TF-IDF fallback for vague multi-word queries, and time it over 100,000 shortcuts"""
+    print("\n" + "="*60)
+    print("RELEVANCE TEST")
+    print("="*60)
+    
+    words = ['alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf', 'hotel', 'india', 'juliet']
+    shortcuts = [{"keyword": f"{words[i % 10]}-{words[i // 10 % 10]}-{i}", "type": "url", "category": f"Team {i % 40}",
+                  "path": f"https://{words[i // 100 % 10]}{i % 997}.example.com/{words[i % 7]}/{i}"}
+                 for i in range(100000)]
+    shortcuts.append({"keyword": "emergency-vet", "type": "url", "category": "Info",
+                      "path": "http://www.denveranimalemergency.com/"})
+    
+    with tempfile.TemporaryDirectory() as directory:
+        plugin = make_plugin(directory, test=shortcuts)
+        source = plugin.sources[0]
+        start = time.perf_counter()
+        source.refresh(plugin.create_result)
+        print(f"\nCaches for {len(shortcuts):,} shortcuts built in {time.perf_counter() - start:.1f} s")
+        source = CatalogSource(source.name, source.path, source.cache_dir)
+        plugin.sources = [source]
+        
+        results = plugin.query("vet emergency denver")
+        titles = [result["Title"] for result in results]
+        print(f"{'[OK]' if titles[:1] == ['emergency-vet'] else '[FAIL]'} 'vet emergency denver': {titles[:3]}")
+        results = plugin.query("charlie team 7 echo")
+        print(f"'charlie team 7 echo': {[(r['Title'], r['Score']) for r in results[:3]]}")
+        
+        index = source.relevance
+        for query in ["vet emergency denver", "charlie team 7 echo", "hotel india example"]:
+            rounds = 20
+            start = time.perf_counter()
+            for _ in range(rounds):
+                top = index.search(query, 10)
+            elapsed = (time.perf_counter() - start) / rounds * 1000
+            print(f"Scoring '{query}': {elapsed:.2f} ms, best similarity {top[0][1] if top else 0:.2f}")
+        del index, source, plugin.sources  # release the mappings before the directory is removed
+
+
+def test_unicode_matching():
+    """Test that accents, case folding and full-width characters don't get in the way of a match"""
+    print("\n" + "="*60)
+    print("UNICODE MATCHING TEST")
+    print("="*60)
+    
+    shortcuts = [
+        {"keyword": "Café", "type": "url", "path": "https://cafe.example.com"},
+        {"keyword": "Straße", "type": "folder", "path": "C:/Straße"},
+        {"keyword": "ＰｏｐｃｏｒｎＦＸ", "type": "app", "path": "C:/Tools/PopcornFX.exe"},
+        {"keyword": "Ελληνικά", "type": "url", "path": "https://el.example.com"},
+        {"keyword": "musik", "type": "folder", "path": "C:/Users/José/Música", "category": "Música"}
+    ]
+    queries = [("cafe", "Café"), ("CAFÉ", "Café"), ("strasse", "Straße"), ("STRASSE", "Straße"),
+               ("popcornfx", "ＰｏｐｃｏｒｎＦＸ"), ("ελληνικα", "Ελληνικά"), ("musica", "musik"), ("jose/", "musik")]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        plugin = make_plugin(directory, test=shortcuts)
+        for label in ["in memory", "from the caches"]:
+            failed = [query for query, expected in queries if plugin.query(query)[0]["Title"] != expected]
+            print(f"\n{'[OK]' if not failed else '[FAIL]'} {len(queries) - len(failed)}/{len(queries)} matched "
+                  f"{label}{f', failed: {failed}' if failed else ''}")
+            listed = [result["Title"].lstrip('\u200b') for result in plugin.query("shortcutlist MUSICA")]
+            status = "[OK]" if listed == ["═══ Música ═══", "musik"] else "[FAIL]"
+            print(f"{status} Category filter 'MUSICA' {label}: {listed}")
+            source = plugin.sources[0]
+            source.refresh(plugin.create_result)
+            plugin.sources = [CatalogSource(source.name, source.path, source.cache_dir)]
+        del source, plugin.sources  # release the mappings before the directory is removed
+
+
+def test_subscription():
+    """Test syncing a team catalog from a local stand-in server"""
+    print("\n" + "="*60)
+    print("CATALOG SUBSCRIPTION TEST")
+    print("="*60)
+    
+    versions = {'"v1"': [{"keyword": "wiki", "type": "url", "path": "https://wiki.example.com"},
+                         {"keyword": "old", "type": "url", "path": "https://old.example.com"}]}
+    versions['"v2"'] = [versions['"v1"'][0], {"keyword": "jira", "type": "url", "path": "https://jira.example.com"}]
+    server_state = {'current': '"v1"', 'responses': []}
+    
+    class CatalogHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            current = server_state['current']
+            known = self.headers.get('If-None-Match')
+            if known == current:
+                status, body = 304, b''
+            elif known in versions and self.headers.get('A-IM') == CatalogSubscription.DELTA:
+                before = {s['keyword'] for s in versions[known]}
+                after = {s['keyword'] for s in versions[current]}
+                delta = {'upsert': [s for s in versions[current] if s['keyword'] not in before],
+                         'delete': sorted(before - after)}
+                status, body = 226, json.dumps(delta).encode('utf-8')
+            else:
+                status, body = 200, json.dumps({'shortcuts': versions[current]}).encode('utf-8')
+            server_state['responses'].append(status)
+            self.send_response(status)
+            if status == 226:
+                self.send_header('IM', CatalogSubscription.DELTA)
+            self.send_header('ETag', current)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = HTTPServer(('127.0.0.1', 0), CatalogHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    with tempfile.TemporaryDirectory() as directory:
+        subscription = CatalogSubscription('team', f"http://127.0.0.1:{server.server_port}/team.json", directory)
+        
+        def keywords():
+            with open(subscription.path, 'r', encoding='utf-8') as f:
+                return [s['keyword'] for s in json.load(f)['shortcuts']]
+        
+        print(f"\nFirst sync: {subscription.sync()}, {keywords()}")
+        print(f"Second sync: {subscription.sync()}, due again: {subscription.due()}")
+        server_state['current'] = '"v2"'
+        print(f"After an update: {subscription.sync()}, {keywords()}")
+        status = "[OK]" if server_state['responses'] == [200, 304, 226] else "[FAIL]"
+        print(f"{status} Responses: {server_state['responses']}")
+        
+        server.shutdown()
+        server.server_close()
+        result = subscription.sync()
+        status = "[OK]" if result == 'error' and keywords() == ['wiki', 'jira'] else "[FAIL]"
+        print(f"{status} Offline: {result}, copy kept: {keywords()}")
+
+
+def write_bookmarks(path, checksum, bookmarks):
+    """Write a Chromium Bookmarks file with (id, name, url) bookmarks on the bookmark bar"""
+    children = [{'id': node_id, 'name': name, 'url': url, 'type': 'url', 'date_added': '13350000000000000'}
+                for node_id, name, url in bookmarks]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'checksum': checksum, 'roots': {
+            'bookmark_bar': {'type': 'folder', 'name': 'Bookmarks bar', 'children': children}}}, f)
+
+
+def test_bookmark_discovery():
+    """Test finding the Bookmarks files of every browser profile in a synthetic tree"""
+    print("\n" + "="*60)
+    print("BOOKMARK DISCOVERY TEST")
+    print("="*60)
+    
+    try:
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ShortcutsEditor'))
+        from helpers import BookmarkImporter
+    except ImportError as e:
+        print(f"\n[SKIP] Editor not importable: {e}")
+        return
+    
+    with tempfile.TemporaryDirectory() as root:
+        user_data = os.path.join(root, 'Google', 'Chrome', 'User Data')
+        profiles = {'Default': [('1', 'Wiki', 'https://wiki.example.com/')],
+                    'Profile 1': [('1', 'Jira', 'https://jira.example.com'), ('2', 'Wiki', 'https://WIKI.example.com')],
+                    'Profile 10': [('1', 'Docs', 'https://docs.example.com/?utm_source=mail')],
+                    'Profile 2': [('1', 'Docs', 'https://docs.example.com/')]}
+        for profile, bookmarks in profiles.items():
+            os.makedirs(os.path.join(user_data, profile))
+            write_bookmarks(os.path.join(user_data, profile, 'Bookmarks'), '01', bookmarks)
+        os.makedirs(os.path.join(user_data, 'Profile 3'))  # no Bookmarks file
+        os.makedirs(os.path.join(user_data, 'System Profile'))
+        with open(os.path.join(user_data, 'Local State'), 'w', encoding='utf-8') as f:
+            json.dump({'profile': {'info_cache': {'Profile 1': {'name': 'Work'}}}}, f)
+        opera = os.path.join(root, 'Opera Software', 'Opera Stable')
+        os.makedirs(opera)
+        write_bookmarks(os.path.join(opera, 'Bookmarks'), '01', [('1', 'News', 'https://news.example.com')])
+        
+        paths = BookmarkImporter.get_browser_bookmark_paths(root)
+        expected = ['Chrome', 'Chrome - Work (Profile 1)', 'Chrome - Profile 2', 'Chrome - Profile 10', 'Opera']
+        print(f"\n{'[OK]' if list(paths) == expected else '[FAIL]'} Profiles found in order: {list(paths)}")
+        
+        merged = BookmarkImporter.parse_bookmark_files(paths)
+        found = [(bookmark['source'], bookmark['name']) for bookmark in merged]
+        expected = [('Chrome', 'Wiki'), ('Chrome - Work (Profile 1)', 'Jira'), ('Chrome - Profile 2', 'Docs'),
+                    ('Opera', 'News')]
+        print(f"{'[OK]' if found == expected else '[FAIL]'} Parsed together, same URLs once: {found}")
+        
+        empty = BookmarkImporter.get_browser_bookmark_paths(os.path.join(root, 'nothing'))
+        print(f"{'[OK]' if empty == {} else '[FAIL]'} No browsers under an empty root")
+
+
+def test_bookmark_import():
+    """Test URL normalization and merging imported bookmarks into the catalog"""
+    print("\n" + "="*60)
+    print("BOOKMARK IMPORT TEST")
+    print("="*60)
+    
+    try:
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ShortcutsEditor'))
+        from helpers import BookmarkImporter
+    except ImportError as e:
+        print(f"\n[SKIP] Editor not importable: {e}")
+        return
+    
+    print()
+    for url, expected in [("HTTPS://Example.COM:443/Docs/?utm_source=mail&b=2&a=1#", "https://example.com/Docs?a=1&b=2"),
+                          ("http://example.com:8080/a/", "http://example.com:8080/a"),
+                          ("https://example.com/path?fbclid=1", "https://example.com/path"),
+                          ("not a url", "not a url")]:
+        normalized = BookmarkImporter.normalize_url(url)
+        print(f"{'[OK]' if normalized == expected else '[FAIL]'} {url} -> {normalized}")
+    
+    shortcuts = [{"keyword": "docs", "type": "url", "path": "https://example.com/docs"}]
+    imported = [{"keyword": "docs", "type": "url", "path": "HTTPS://EXAMPLE.com/docs/?utm_medium=x"},
+                {"keyword": "docs", "type": "url", "path": "https://example.com/a"},
+                {"keyword": "docs", "type": "url", "path": "https://example.com/b"},
+                {"keyword": "docs", "type": "url", "path": "https://example.com/a/"}]
+    counts = BookmarkImporter.merge_shortcuts(shortcuts, imported)
+    keywords = [shortcut["keyword"] for shortcut in shortcuts]
+    ok = counts == (2, 2, 2) and keywords == ["docs", "docs-1", "docs-2"]
+    print(f"{'[OK]' if ok else '[FAIL]'} Known URLs skipped, keywords numbered: {counts} {keywords}")
+    
+    # Each new keyword is cut to its shortest prefix no other keyword shares (at least 3 characters)
+    keywords = BookmarkImporter.shortest_unique_keywords(
+        ["github-issues", "github-pulls", "gitlab", "jira", "ab", "wiki", "wiki"], ["git", "jenkins"])
+    expected = ["github-i", "github-p", "gitl", "jir", "ab", "wiki", "wiki"]
+    print(f"{'[OK]' if keywords == expected else '[FAIL]'} Shortest unique keywords: {keywords}")
+
+
+def test_bookmark_sync():
+    """Test re-syncing imported browser bookmarks"""
+    print("\n" + "="*60)
+    print("BOOKMARK SYNC TEST")
+    print("="*60)
+    
+    try:
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ShortcutsEditor'))
+        from catalog_state import BookmarkSync
+    except ImportError as e:
+        print(f"\n[SKIP] Editor not importable: {e}")
+        return
+    
+    with tempfile.TemporaryDirectory() as directory:
+        bookmarks_file = os.path.join(directory, 'Bookmarks')
+        write_bookmarks(bookmarks_file, '01', [('1', 'Wiki', 'https://wiki.example.com/')])
+        sync = BookmarkSync(os.path.join(directory, 'shortcuts.json'))
+        sync.add_source('Chrome', bookmarks_file, use_folder_as_category=False)
+        shortcuts = []
+        
+        # A read that fails (file locked by the browser) is retried on the next sync
+        write_bookmarks(bookmarks_file, '02', [('1', 'Wiki', 'https://wiki.example.com/'),
+                                               ('2', 'Jira', 'https://jira.example.com/')])
+        
+        def locked(bookmark_file):
+            raise PermissionError(13, "The process cannot access the file", str(bookmark_file))
+        
+        sync.read_bookmarks = locked
+        failed = sync.sync(shortcuts)
+        del sync.read_bookmarks
+        retried = BookmarkSync(os.path.join(directory, 'shortcuts.json')).sync(shortcuts)
+        ok = failed['added'] == 0 and retried['added'] == 1 and [s['path'] for s in shortcuts] == ['https://jira.example.com/']
+        print(f"{'[OK]' if ok else '[FAIL]'} Failed read retried: {failed} then {retried}")
+        
+        def resync(checksum, bookmarks):
+            write_bookmarks(bookmarks_file, checksum, bookmarks)
+            stat = os.stat(bookmarks_file)
+            os.utime(bookmarks_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))  # a later save
+            return sync.sync(shortcuts)
+        
+        wiki = ('1', 'Wiki', 'https://wiki.example.com/')
+        sync = BookmarkSync(os.path.join(directory, 'shortcuts.json'))
+        totals = resync('02', [wiki, ('2', 'Jira', 'https://jira.example.com/')])
+        print(f"{'[OK]' if totals['unchanged'] == 1 else '[FAIL]'} Same checksum skipped: {totals}")
+        
+        totals = resync('03', [wiki, ('2', 'Jira', 'https://jira.example.com/browse')])
+        ok = totals['updated'] == 1 and shortcuts[0]['path'] == 'https://jira.example.com/browse'
+        print(f"{'[OK]' if ok else '[FAIL]'} Changed bookmark updated: {totals}")
+        
+        totals = resync('04', [wiki, ('3', 'Docs', 'https://docs.example.com/')])
+        ok = (totals['added'] == 1 and totals['stale'] == 1 and shortcuts[0].get('stale')
+              and shortcuts[1]['path'] == 'https://docs.example.com/')
+        print(f"{'[OK]' if ok else '[FAIL]'} New bookmark added, deleted one marked stale: {totals}")
+        
+        totals = resync('05', [wiki, ('2', 'Jira', 'https://jira.example.com/browse'),
+                               ('3', 'Docs', 'https://docs.example.com/')])
+        ok = totals['updated'] == 1 and not shortcuts[0].get('stale') and len(shortcuts) == 2
+        print(f"{'[OK]' if ok else '[FAIL]'} Restored bookmark no longer stale: {totals}")
+
+
+def test_undo_journal():
+    """Test undo/redo round trips of the editor's change journal"""
+    print("\n" + "="*60)
+    print("UNDO JOURNAL TEST")
+    print("="*60)
+    
+    try:
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ShortcutsEditor'))
+        from editor import UndoJournal
+    except ImportError as e:
+        print(f"\n[SKIP] Editor not importable: {e}")
+        return
+    
+    shortcuts = [{"keyword": f"site{i}", "type": "url", "path": f"https://example.com/{i}"} for i in range(6)]
+    original = json.loads(json.dumps(shortcuts))
+    journal = UndoJournal()
+    
+    # Delete rows 1 and 4, then insert a shortcut at row 2, as the editor records them
+    removed = [(4, shortcuts[4]), (1, shortcuts[1])]
+    for index, _ in removed:
+        del shortcuts[index]
+    journal.record("Delete 2 shortcuts", removed=removed)
+    added = {"keyword": "new", "type": "folder", "path": "C:/New"}
+    shortcuts.insert(2, added)
+    journal.record("Add 'new'", inserted=[(2, added)])
+    edited = json.loads(json.dumps(shortcuts))
+    
+    labels = [journal.undo(shortcuts), journal.undo(shortcuts)]
+    ok = shortcuts == original and labels == ["Add 'new'", "Delete 2 shortcuts"]
+    print(f"\n{'[OK]' if ok else '[FAIL]'} Undo after delete and insert restores the catalog: {labels}")
+    labels = [journal.redo(shortcuts), journal.redo(shortcuts)]
+    ok = shortcuts == edited and journal.redo(shortcuts) is None
+    print(f"{'[OK]' if ok else '[FAIL]'} Redo re-applies both: {labels}")
+    
+    # Consecutive edits of one field are one step
+    for path in ["C:/New2", "C:/New23"]:
+        journal.record("Edit 'new'", changed=[(2, {"path": (shortcuts[2]["path"], path)})])
+        shortcuts[2]["path"] = path
+    journal.undo(shortcuts)
+    ok = shortcuts == edited and journal.undo_label() == "Add 'new'"
+    print(f"{'[OK]' if ok else '[FAIL]'} Edits of the same field merged into one undo step")
+    
+    # The oldest commands go once the history is over its memory cap
+    small = UndoJournal(max_bytes=2000)
+    for i in range(20):
+        small.record(f"Add {i}", inserted=[(i, {"keyword": f"k{i}", "path": "x" * 100})])
+    ok = 1 <= len(small.undo_stack) < 20 and small.total_bytes <= 2000 and small.undo_label() == "Add 19"
+    print(f"{'[OK]' if ok else '[FAIL]'} History capped at {small.total_bytes} bytes, "
+          f"{len(small.undo_stack)} of 20 commands kept")
+
+
+def test_catalog_merge():
+    """Test merging external changes to shortcuts.json into the editor's catalog"""
+    print("\n" + "="*60)
+    print("CATALOG MERGE TEST")
+    print("="*60)
+    
+    try:
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ShortcutsEditor'))
+        from editor import UndoJournal, CatalogMerge
+    except ImportError as e:
+        print(f"\n[SKIP] Editor not importable: {e}")
+        return
+    
+    base = [{"keyword": k, "type": "url", "path": f"https://{k}.example.com"} for k in ["wiki", "jira", "docs", "mail"]]
+    ours = json.loads(json.dumps(base))
+    ours[0]["priority"] = 150  # edited in the editor
+    theirs = json.loads(json.dumps(base))
+    del theirs[1]  # deleted from the plugin's context menu
+    theirs[1]["path"] = "https://docs.example.org"  # docs, changed on disk
+    theirs.append({"keyword": "chat", "type": "url", "path": "https://chat.example.com"})
+    
+    updates, conflicts = CatalogMerge.diff(base, ours, theirs)
+    before = json.loads(json.dumps(ours))
+    inserted, removed, changed = CatalogMerge.apply(ours, updates)
+    journal = UndoJournal()
+    journal.record("External Change", inserted=inserted, removed=removed, changed=changed)
+    merged = json.loads(json.dumps(ours))
+    expected = [dict(base[0], priority=150), dict(base[2], path="https://docs.example.org"), base[3], theirs[-1]]
+    ok = not conflicts and merged == expected
+    print(f"\n{'[OK]' if ok else '[FAIL]'} Disk changes merged, editor's edit kept: {[s['keyword'] for s in merged]}")
+    
+    journal.undo(ours)
+    undone = ours == before
+    journal.redo(ours)
+    print(f"{'[OK]' if undone and ours == merged else '[FAIL]'} Merge undone and redone as one step")
+    
+    # The same record changed differently on both sides needs a decision
+    ours[0]["path"] = "https://wiki.example.net"
+    theirs[0]["path"] = "https://wiki.example.org"
+    updates, conflicts = CatalogMerge.diff(merged, ours, theirs)
+    ok = list(conflicts) == [("wiki", 0)] and ("wiki", 0) not in updates
+    print(f"{'[OK]' if ok else '[FAIL]'} Conflicting edits reported: {list(conflicts)}")
+
+
+def test_link_health():
+    """Test the editor's link check against a local stand-in server"""
+    print("\n" + "="*60)
+    print("LINK HEALTH TEST")
+    print("="*60)
+    
+    try:
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ShortcutsEditor'))
+        from catalog_state import LinkHealth
+    except ImportError as e:
+        print(f"\n[SKIP] Editor not importable: {e}")
+        return
+    
+    requests = []
+    
+    class LinkHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive, as most servers do
+        
+        def do_HEAD(self):
+            self.respond()
+        
+        def do_GET(self):
+            self.respond()
+        
+        def respond(self):
+            requests.append((self.command, self.path, self.headers.get('Range')))
+            headers = {}
+            if self.path == '/ok':
+                status = 304 if self.headers.get('If-None-Match') == '"ok"' else 200
+                headers['ETag'] = '"ok"'
+            elif self.path == '/missing':
+                status = 404
+            elif self.path in ('/no-head', '/no-head-moved'):
+                status = 405 if self.command == 'HEAD' else 206
+                if self.command == 'GET' and self.path == '/no-head-moved':
+                    status = 301
+                    headers['Location'] = '/ok'
+            elif self.path == '/moved':
+                status = 301
+                headers['Location'] = '/ok'
+            else:
+                status = 500
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), LinkHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    
+    # A port nothing listens on
+    closed = HTTPServer(('127.0.0.1', 0), BaseHTTPRequestHandler)
+    refused_port = closed.server_port
+    closed.server_close()
+    
+    expected = {f"{base}/ok": ('ok', 200), f"{base}/missing": ('dead', 404),
+                f"{base}/no-head": ('ok', 206), f"{base}/moved": ('ok', 200),
+                f"{base}/no-head-moved": ('ok', 200), f"http://127.0.0.1:{refused_port}/": ('dead', None)}
+    try:
+        results = LinkHealth.scan(list(expected), {})
+        for url, (status, code) in expected.items():
+            entry = results.get(url, {})
+            ok = (entry.get('status'), entry.get('code')) == (status, code)
+            print(f"{'[OK]' if ok else '[FAIL]'} {url}: {entry.get('status')} {entry.get('code')} {entry.get('error') or ''}")
+        
+        fallback = [(method, rng) for method, path, rng in requests if path == '/no-head']
+        status = "[OK]" if fallback == [('HEAD', None), ('GET', 'bytes=0-0')] else "[FAIL]"
+        print(f"{status} HEAD rejected, retried as a one-byte GET: {fallback}")
+        
+        redirected = [rng for method, path, rng in requests if path == '/ok' and method == 'GET']
+        status = "[OK]" if redirected == [None] else "[FAIL]"
+        print(f"{status} Range dropped when the GET fallback is redirected: {redirected}")
+        
+        del requests[:]
+        again = LinkHealth.scan([f"{base}/ok"], results)
+        entry = again[f"{base}/ok"]
+        ok = (entry['status'], entry['code'], entry['etag']) == ('ok', 304, '"ok"')
+        print(f"{'[OK]' if ok else '[FAIL]'} Second run: {entry['status']} {entry['code']}, ETag kept: {entry['etag']}")
+    finally:
+        server.shutdown()
+        server.server_close()
 
 
 def main():
@@ -169,11 +960,28 @@ def main():
     print(" "*20 + "SHORTCUTS PLUGIN TEST SUITE")
     print("="*80)
     
+    # Keep the plugin's own catalog_cache/ out of the tests
+    cache_dir = tempfile.TemporaryDirectory()
+    Shortcuts.CACHE_DIR = cache_dir.name
     try:
         test_data_operations()
         test_query()
         test_actions()
         test_result_creation()
+        test_binary_catalog()
+        test_result_cache()
+        test_query_budget()
+        test_sources()
+        test_subscription()
+        test_bookmark_discovery()
+        test_bookmark_import()
+        test_bookmark_sync()
+        test_undo_journal()
+        test_catalog_merge()
+        test_link_health()
+        test_term_index()
+        test_relevance()
+        test_unicode_matching()
         
         print("\n" + "="*80)
         print(" "*30 + "TESTS COMPLETE")
@@ -187,6 +995,8 @@ def main():
         print("="*80)
         import traceback
         traceback.print_exc()
+    finally:
+        cache_dir.cleanup()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark harness for the Shortcuts Editor
+
+Drives ShortcutsEditorWindow and BookmarkImportDialog with Qt's offscreen
+platform over synthetic catalogs and synthetic Chromium Bookmarks files,
+and prints timings (milliseconds) plus peak RSS as JSON:
+
+    python benchmark.py --sizes 1000,10000 --bookmarks 5000 --repeat 3
+
+Meant for Linux: settings and caches are redirected to a temporary
+directory through XDG_CONFIG_HOME/XDG_CACHE_HOME, so the benchmark never
+touches the real editor settings.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+WORK_DIR = tempfile.mkdtemp(prefix='shortcuts-benchmark-')
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ['XDG_CONFIG_HOME'] = os.path.join(WORK_DIR, 'config')
+os.environ['XDG_CACHE_HOME'] = os.path.join(WORK_DIR, 'cache')
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import PySide6
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QSettings
+
+import editor
+from editor import ShortcutsEditorWindow
+from dialogs import BookmarkImportDialog
+from helpers import BookmarkImporter
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def make_catalog(count):
+    """Synthetic shortcuts: mostly URLs, some folders, files and apps"""
+    types = ['url'] * 7 + ['folder', 'file', 'app']
+    shortcuts = []
+    for i in range(count):
+        shortcut_type = types[i % len(types)]
+        if shortcut_type == 'url':
+            path = f"https://site{i % 997}.example.com/page/{i}?ref=bench"
+        elif shortcut_type == 'app':
+            path = f"C:/Program Files/App{i}/app{i}.exe"
+        else:
+            path = f"C:/Users/bench/Documents/Project {i % 50}/item{i}"
+        shortcuts.append({
+            'keyword': f"{shortcut_type}-{i}",
+            'type': shortcut_type,
+            'path': path,
+            'category': f"Category {i % 25}",
+            'priority': 50 + i % 150,
+            'icon': 'Images/bookmark.png'
+        })
+    return shortcuts
+
+
+def make_bookmarks_file(path, count, per_folder=40):
+    """Synthetic Chromium Bookmarks file with nested folders"""
+    next_id = iter(range(1, 10 * count + 100))
+
+    def node(name, url):
+        return {'date_added': '13350000000000000', 'id': str(next(next_id)), 'name': name,
+                'type': 'url', 'url': url}
+
+    def folder(name, children):
+        return {'children': children, 'date_added': '13350000000000000', 'date_modified': '0',
+                'id': str(next(next_id)), 'name': name, 'type': 'folder'}
+
+    folders = []
+    for start in range(0, count, per_folder):
+        children = [node(f"Bookmark {i} - Example Page", f"https://host{i % 1499}.example.org/article/{i}")
+                    for i in range(start, min(start + per_folder, count))]
+        folders.append(folder(f"Folder {start // per_folder}", [folder("Nested", children)]))
+
+    data = {
+        'checksum': '0' * 32,
+        'roots': {
+            'bookmark_bar': folder('Bookmarks bar', folders[: len(folders) // 2]),
+            'other': folder('Other bookmarks', folders[len(folders) // 2:]),
+            'synced': folder('Mobile bookmarks', [])
+        },
+        'version': 1
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+
+def wait_until(app, condition, timeout=120):
+    """Run the event loop until condition() holds"""
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("Benchmark step did not finish")
+        app.processEvents()
+
+
+def table_filled(window):
+    """Whether the chunked table fill has reached the last row"""
+    return not window.loading and window.table_fill_row >= len(window.shortcuts)
+
+
+def quiet_window(window):
+    """Stop background chores that would run into the measurements"""
+    window.health_timer.stop()
+    window.sync_timer.stop()
+
+
+def timed(timings, step, function):
+    """Run function once, appending its duration in ms to timings[step]"""
+    start = time.perf_counter()
+    result = function()
+    timings.setdefault(step, []).append((time.perf_counter() - start) * 1000)
+    return result
+
+
+def bench_catalog(app, count, bookmarks_file, repeat):
+    """Time one catalog size; returns the result record"""
+    catalog_dir = os.path.join(WORK_DIR, f'catalog-{count}')
+    os.makedirs(catalog_dir, exist_ok=True)
+    shortcuts_file = os.path.join(catalog_dir, 'shortcuts.json')
+    with open(shortcuts_file, 'w', encoding='utf-8') as f:
+        json.dump({'shortcuts': make_catalog(count)}, f, indent=2)
+
+    settings = QSettings('AMoorer', 'ShortcutsEditor')
+    settings.setValue('custom_shortcuts_location', shortcuts_file)
+    settings.setValue('autosave', False)
+
+    timings = {}
+    for _ in range(repeat):
+        window = timed(timings, 'window_construction', ShortcutsEditorWindow)
+        timed(timings, 'first_load', lambda: wait_until(app, lambda: table_filled(window)))
+        quiet_window(window)
+
+        timed(timings, 'load_shortcuts',
+              lambda: (window.load_shortcuts(), wait_until(app, lambda: table_filled(window))))
+        quiet_window(window)
+        timed(timings, 'update_table',
+              lambda: (window.update_table(), wait_until(app, lambda: table_filled(window))))
+        timed(timings, 'save', window.save_shortcuts)
+        last_keyword = window.shortcuts[-1]['keyword']
+        timed(timings, 'focus_shortcut', lambda: window.focus_shortcut(last_keyword))
+
+        # Bookmark import: parse the file, fill the dialog, select all, convert and merge
+        dialog = BookmarkImportDialog(window)
+        timed(timings, 'import_parse',
+              lambda: BookmarkImporter.parse_bookmark_files({'Bench': bookmarks_file}))
+        timed(timings, 'import_load_dialog',
+              lambda: dialog.load_bookmarks_from_files({'Bench': bookmarks_file}, 'Bench'))
+        existing = {shortcut['keyword'] for shortcut in window.shortcuts}
+        imported = timed(timings, 'import_select_all',
+                         lambda: (dialog.bookmark_list.selectAll(), dialog.get_selected_shortcuts(existing))[1])
+        timed(timings, 'import_merge',
+              lambda: (BookmarkImporter.merge_shortcuts(window.shortcuts, imported),
+                       window.update_table(), wait_until(app, lambda: table_filled(window))))
+        dialog.deleteLater()
+
+        window.close()
+        window.deleteLater()
+        app.processEvents()
+
+    return {
+        'shortcuts': count,
+        'repeat': repeat,
+        'timings_ms': {step: {'median': round(statistics.median(values), 2), 'min': round(min(values), 2)}
+                       for step, values in timings.items()},
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Shortcuts Editor offscreen")
+    parser.add_argument('--sizes', default='1000,10000', help="comma-separated catalog sizes")
+    parser.add_argument('--bookmarks', type=int, default=5000, help="bookmarks in the synthetic Bookmarks file")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per catalog size")
+    parser.add_argument('--output', help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    app.setApplicationName("Shortcuts Editor")
+    app.setOrganizationName("AMoorer")
+
+    # The dialogs report results in message boxes, which would block offscreen
+    editor.QMessageBox.information = staticmethod(lambda *args, **kwargs: None)
+
+    try:
+        bookmarks_file = os.path.join(WORK_DIR, 'Bookmarks')
+        make_bookmarks_file(bookmarks_file, args.bookmarks)
+
+        report = {
+            'python': platform.python_version(),
+            'pyside6': PySide6.__version__,
+            'platform': platform.platform(),
+            'qpa_platform': os.environ['QT_QPA_PLATFORM'],
+            'bookmarks': args.bookmarks,
+            'results': [bench_catalog(app, int(size), bookmarks_file, args.repeat)
+                        for size in args.sizes.split(',') if size.strip()],
+            'peak_rss_mb': peak_rss_mb()
+        }
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
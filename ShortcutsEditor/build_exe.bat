@@ -39,6 +39,9 @@ python -m PyInstaller --noconfirm ^
     --hidden-import "PySide6.QtCore" ^
     --hidden-import "PySide6.QtGui" ^
     --hidden-import "PySide6.QtWidgets" ^
+    --hidden-import "dialogs" ^
+    --hidden-import "helpers" ^
+    --hidden-import "catalog_state" ^
     --exclude-module "matplotlib" ^
     --exclude-module "scipy" ^
     --exclude-module "pandas" ^
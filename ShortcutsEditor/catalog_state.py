@@ -0,0 +1,611 @@
+# -*- coding: utf-8 -*-
+"""
+Side files of the Shortcuts Editor's catalog
+
+Bookmark sync state and path and link check results, kept next to the
+shortcuts file. Read with the catalog on every start, so this module stays
+small; the bookmark and icon helpers (helpers.py) are imported on first use.
+"""
+
+import os
+import json
+import re
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit, urljoin
+
+
+class BookmarkSync:
+    """Incremental re-sync of imported browser bookmarks
+    
+    State lives in bookmark_sync.json next to the shortcuts file. For every
+    synced Bookmarks file it records the file's checksum, mtime and size, and
+    per bookmark id the date_added/date_modified values plus a name/URL
+    fingerprint seen at the last sync. Synced shortcuts carry a
+    'bookmarkId' of the form '<source>#<id>'.
+    """
+    
+    STATE_FILE = 'bookmark_sync.json'
+    CHECKSUM_PATTERN = re.compile(rb'"checksum"\s*:\s*"([0-9a-fA-F]*)"')
+    
+    def __init__(self, shortcuts_file):
+        self.state_file = os.path.join(os.path.dirname(shortcuts_file), self.STATE_FILE)
+        self.sources = self.load_state()
+    
+    def load_state(self):
+        """Load sync state from disk"""
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('sources', {})
+        except (OSError, ValueError):
+            return {}
+    
+    def save_state(self):
+        """Save sync state to disk"""
+        try:
+            with open(self.state_file, 'w', encoding='utf-8') as f:
+                json.dump({'sources': self.sources}, f, indent=2, ensure_ascii=False)
+            return True
+        except OSError as e:
+            print(f"Error saving bookmark sync state: {e}")
+            return False
+    
+    @staticmethod
+    def bookmark_id(source_name, node_id):
+        """Identifier linking a shortcut to a bookmark node"""
+        return f"{source_name}#{node_id}"
+    
+    @staticmethod
+    def node_state(bookmark):
+        """Per-node values compared between syncs"""
+        fingerprint = hashlib.sha1(f"{bookmark['name']}\n{bookmark['url']}".encode('utf-8')).hexdigest()[:16]
+        return [bookmark.get('date_added', ''), bookmark.get('date_modified', ''), fingerprint]
+    
+    @classmethod
+    def read_checksum(cls, bookmark_file):
+        """Read the 'checksum' field from the head of a Bookmarks file without parsing it"""
+        with open(bookmark_file, 'rb') as f:
+            match = cls.CHECKSUM_PATTERN.search(f.read(512))
+        return match.group(1).decode('ascii') if match else None
+    
+    @staticmethod
+    def read_bookmarks(bookmark_file):
+        """Parse a Bookmarks file, returning (checksum, bookmarks)"""
+        from helpers import BookmarkImporter
+        with open(bookmark_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data.get('checksum'), BookmarkImporter.extract_chromium_bookmarks(data)
+    
+    def add_source(self, name, bookmark_file, category='Bookmarks', use_folder_as_category=True, priority=80):
+        """Start syncing a Bookmarks file
+        
+        The current contents become the baseline: later syncs only import
+        bookmarks added or changed after this point.
+        """
+        bookmark_file = Path(bookmark_file)
+        checksum, bookmarks = self.read_bookmarks(bookmark_file)
+        stat = bookmark_file.stat()
+        self.sources[name] = {
+            'path': str(bookmark_file),
+            'category': category,
+            'use_folder_as_category': use_folder_as_category,
+            'priority': priority,
+            'checksum': checksum,
+            'mtime': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'nodes': {b['id']: self.node_state(b) for b in bookmarks if b['id']}
+        }
+        return self.save_state()
+    
+    def remove_source(self, name):
+        """Stop syncing a source"""
+        if self.sources.pop(name, None) is not None:
+            self.save_state()
+    
+    def sync(self, shortcuts):
+        """Bring synced shortcuts up to date with their browsers
+        
+        Modifies shortcuts in place. Sources whose file is unchanged (same
+        mtime/size, or same checksum) are skipped without parsing. Returns a
+        dict with 'added', 'updated', 'stale' and 'unchanged' counts.
+        """
+        totals = {'added': 0, 'updated': 0, 'stale': 0, 'unchanged': 0}
+        state_changed = False
+        
+        for name, source in self.sources.items():
+            bookmark_file = Path(source['path'])
+            try:
+                stat = bookmark_file.stat()
+                if source.get('mtime') == stat.st_mtime_ns and source.get('size') == stat.st_size:
+                    totals['unchanged'] += 1
+                    continue
+                
+                checksum = self.read_checksum(bookmark_file)
+                if checksum and checksum == source.get('checksum'):
+                    bookmarks = None
+                else:
+                    checksum, bookmarks = self.read_bookmarks(bookmark_file)
+            except (OSError, ValueError) as e:
+                # Keep the old mtime/size so the next sync reads the file again
+                print(f"Error syncing bookmarks from {name}: {e}")
+                continue
+            
+            source['mtime'] = stat.st_mtime_ns
+            source['size'] = stat.st_size
+            state_changed = True
+            if bookmarks is None:
+                totals['unchanged'] += 1
+                continue
+            
+            source['checksum'] = checksum
+            for key, count in self.sync_source(shortcuts, name, source, bookmarks).items():
+                totals[key] += count
+        
+        if state_changed:
+            self.save_state()
+        
+        return totals
+    
+    def sync_source(self, shortcuts, name, source, bookmarks):
+        """Apply one source's changed nodes to the shortcuts"""
+        counts = {'added': 0, 'updated': 0, 'stale': 0}
+        prefix = self.bookmark_id(name, '')
+        synced = {s['bookmarkId']: s for s in shortcuts if s.get('bookmarkId', '').startswith(prefix)}
+        old_nodes = source.get('nodes', {})
+        new_nodes = {}
+        new_bookmarks = []
+        
+        for bookmark in bookmarks:
+            node_id = bookmark['id']
+            if not node_id:
+                continue
+            
+            state = self.node_state(bookmark)
+            new_nodes[node_id] = state
+            old_state = old_nodes.get(node_id)
+            if old_state == state:
+                continue
+            
+            shortcut = synced.get(self.bookmark_id(name, node_id))
+            if shortcut is not None:
+                shortcut['path'] = bookmark['url']
+                shortcut.pop('stale', None)
+                counts['updated'] += 1
+            elif old_state is None:
+                # Bookmarks changed but never imported were left out on purpose
+                new_bookmarks.append(bookmark)
+        
+        # Bookmarks deleted in the browser
+        for node_id in old_nodes.keys() - new_nodes.keys():
+            shortcut = synced.get(self.bookmark_id(name, node_id))
+            if shortcut is not None and not shortcut.get('stale'):
+                shortcut['stale'] = True
+                counts['stale'] += 1
+        
+        if new_bookmarks:
+            from helpers import BookmarkImporter, FaviconCache
+            imported = []
+            for bookmark in new_bookmarks:
+                if source.get('use_folder_as_category', True) and bookmark['folder']:
+                    category = bookmark['folder'].replace('/', ' > ')
+                else:
+                    category = source.get('category', 'Bookmarks')
+                imported.append({
+                    'keyword': BookmarkImporter.make_keyword(bookmark['name'] or bookmark['url']),
+                    'type': 'url',
+                    'path': bookmark['url'],
+                    'category': category,
+                    'priority': source.get('priority', 80),
+                    'icon': 'Images/bookmark.png',
+                    'bookmarkId': self.bookmark_id(name, bookmark['id'])
+                })
+            
+            keywords = BookmarkImporter.shortest_unique_keywords(
+                [shortcut['keyword'] for shortcut in imported],
+                (s.get('keyword', '') for s in shortcuts))
+            for shortcut, keyword in zip(imported, keywords):
+                shortcut['keyword'] = keyword
+            
+            favicons_file = Path(source['path']).with_name('Favicons')
+            if favicons_file.is_file():
+                FaviconCache(os.path.dirname(self.state_file)).apply(imported, favicons_file)
+            
+            counts['added'], _, _ = BookmarkImporter.merge_shortcuts(shortcuts, imported)
+        
+        source['nodes'] = new_nodes
+        return counts
+
+
+class PathHealth:
+    """Concurrent check that folder/file/app shortcut paths still exist
+    
+    Results live in shortcut_health.json next to the shortcuts file (the
+    plugin reads it to flag broken shortcuts), keyed by the path as written
+    in the shortcut: {'status', 'mtime', 'checked', 'error'}, where status
+    is 'ok', 'missing' or 'unreachable'. A scan only probes paths that
+    aren't cached or whose entry expired. Probes run in a thread pool; one
+    that takes longer than PROBE_TIMEOUT (e.g. on a dead network share)
+    counts as unreachable, and the remaining paths on that drive or share
+    are marked unreachable without probing them.
+    """
+    
+    STATE_FILE = 'shortcut_health.json'
+    PATH_TYPES = ('folder', 'file', 'app')
+    PROBE_TIMEOUT = 2.0
+    MAX_WORKERS = 16
+    PROBES_PER_ROOT = 4
+    OK_TTL = 6 * 60 * 60
+    BROKEN_TTL = 10 * 60
+    EXECUTABLE_PATTERN = re.compile(r'^\s*(?:"([^"]+)"|(.+?\.(?:exe|bat|cmd|com|lnk))(?:\s|$))', re.IGNORECASE)
+    
+    def __init__(self, shortcuts_file):
+        self.state_file = os.path.join(os.path.dirname(shortcuts_file), self.STATE_FILE)
+        self.paths = self.load_state()
+    
+    def load_state(self):
+        """Load cached results from disk"""
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('paths', {})
+        except (OSError, ValueError):
+            return {}
+    
+    def save_state(self):
+        """Save cached results to disk"""
+        try:
+            with open(self.state_file, 'w', encoding='utf-8') as f:
+                json.dump({'paths': self.paths}, f, indent=2, ensure_ascii=False)
+            return True
+        except OSError as e:
+            print(f"Error saving path health: {e}")
+            return False
+    
+    @classmethod
+    def target(cls, shortcut):
+        """File system path to probe for a shortcut, or None if it can't be checked"""
+        if shortcut.get('type', 'app') not in cls.PATH_TYPES:
+            return None
+        path = os.path.expandvars(shortcut.get('path', '').strip())
+        if shortcut.get('type') == 'app':
+            # Apps may carry arguments; commands found on PATH can't be judged here
+            match = cls.EXECUTABLE_PATTERN.match(path)
+            if match:
+                path = match.group(1) or match.group(2)
+        if not path or not os.path.isabs(path):
+            return None
+        return path
+    
+    @staticmethod
+    def share_root(path):
+        """Drive or network share a path lives on (first directory where there are none)"""
+        drive, rest = os.path.splitdrive(path)
+        if drive:
+            return drive.lower()
+        return rest.replace('\\', '/').lstrip('/').split('/', 1)[0]
+    
+    @staticmethod
+    def probe(path):
+        """Worker thread: stat one path, returning a cache entry"""
+        entry = {'status': 'ok', 'mtime': None, 'checked': time.time(), 'error': ''}
+        try:
+            entry['mtime'] = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            entry.update(status='missing', error="Path not found")
+        except OSError as e:
+            entry.update(status='unreachable', error=e.strerror or str(e))
+        return entry
+    
+    def is_expired(self, entry, now):
+        """Whether a cached entry should be probed again"""
+        ttl = self.OK_TTL if entry.get('status') == 'ok' else self.BROKEN_TTL
+        return now - entry.get('checked', 0) > ttl
+    
+    def pending(self, shortcuts, force=False):
+        """(key, path) of shortcuts whose path needs probing"""
+        now = time.time()
+        pending = {}
+        for shortcut in shortcuts:
+            path = self.target(shortcut)
+            key = shortcut.get('path', '')
+            if path is None or key in pending:
+                continue
+            entry = self.paths.get(key)
+            if force or entry is None or self.is_expired(entry, now):
+                pending[key] = (key, path)
+        return list(pending.values())
+    
+    @classmethod
+    def scan(cls, pending):
+        """Worker thread: probe paths concurrently, returning key -> entry
+        
+        Never waits on a single probe for longer than PROBE_TIMEOUT, and runs
+        at most PROBES_PER_ROOT probes per drive or share at a time so probes
+        hanging on one share can't occupy every worker.
+        """
+        results = {}
+        queued = list(pending)
+        running = {}  # future -> (key, root, start time)
+        active = {}  # root -> probes running on it
+        dead_roots = set()
+        
+        def unreachable(error):
+            return {'status': 'unreachable', 'mtime': None, 'checked': time.time(), 'error': error}
+        
+        # Room for the probes left hanging on dead shares, on top of the live ones
+        executor = ThreadPoolExecutor(max_workers=cls.MAX_WORKERS * 2)
+        try:
+            while queued or running:
+                waiting = []
+                for key, path in queued:
+                    root = cls.share_root(path)
+                    if root in dead_roots:
+                        results[key] = unreachable("Drive or share not responding")
+                    elif len(running) < cls.MAX_WORKERS and active.get(root, 0) < cls.PROBES_PER_ROOT:
+                        running[executor.submit(cls.probe, path)] = (key, root, time.monotonic())
+                        active[root] = active.get(root, 0) + 1
+                    else:
+                        waiting.append((key, path))
+                queued = waiting
+                if not running:
+                    continue
+                
+                done, _ = wait(running, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key, root, _ = running.pop(future)
+                    active[root] -= 1
+                    results[key] = future.result()
+                
+                now = time.monotonic()
+                for future, (key, root, started) in list(running.items()):
+                    if now - started > cls.PROBE_TIMEOUT:
+                        # Leave the hung probe behind and skip the rest of that share
+                        dead_roots.add(root)
+                        results[key] = unreachable(f"No response within {cls.PROBE_TIMEOUT:g} s")
+                        del running[future]
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return results
+    
+    def update(self, results, shortcuts):
+        """Merge scan results and forget paths no shortcut uses anymore"""
+        self.paths.update(results)
+        in_use = {shortcut.get('path', '') for shortcut in shortcuts}
+        for key in [key for key in self.paths if key not in in_use]:
+            del self.paths[key]
+        return self.save_state()
+    
+    def problem(self, shortcut):
+        """Error message if the shortcut's path was found broken, else None"""
+        entry = self.paths.get(shortcut.get('path', ''))
+        if entry is None or entry.get('status') == 'ok' or self.target(shortcut) is None:
+            return None
+        return entry.get('error') or entry.get('status')
+
+
+class LinkHealth:
+    """Liveness check for url shortcuts
+    
+    Results live in link_health.json next to the shortcuts file (the plugin
+    reads it to demote dead links), keyed by the URL: {'status', 'code',
+    'etag', 'lastModified', 'checked', 'error'}, where status is 'ok',
+    'dead' (404/410, unknown host, connection refused) or 'error' (timeouts,
+    server errors and the like, retried sooner).
+    
+    URLs are grouped by host. Each host gets at most PER_HOST keep-alive
+    connections that check its URLs one after the other, while up to
+    MAX_WORKERS connections run in parallel. Every URL is tried with HEAD
+    first, then with a one-byte GET for servers that reject HEAD, and the
+    cached ETag/Last-Modified are sent so unchanged pages answer 304.
+    """
+    
+    STATE_FILE = 'link_health.json'
+    MAX_WORKERS = 32
+    PER_HOST = 2
+    TIMEOUT = 10
+    MAX_REDIRECTS = 5
+    MAX_BODY = 64 * 1024
+    OK_TTL = 7 * 24 * 60 * 60
+    BROKEN_TTL = 24 * 60 * 60
+    USER_AGENT = 'Mozilla/5.0 (compatible; ShortcutsEditor link check)'
+    HEAD_REJECTED = {400, 403, 405, 406, 501}
+    REDIRECTS = {301, 302, 303, 307, 308}
+    DEAD_CODES = {404, 410}
+    
+    def __init__(self, shortcuts_file):
+        self.state_file = os.path.join(os.path.dirname(shortcuts_file), self.STATE_FILE)
+        self.urls = self.load_state()
+    
+    def load_state(self):
+        """Load cached results from disk"""
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('urls', {})
+        except (OSError, ValueError):
+            return {}
+    
+    def save_state(self):
+        """Save cached results to disk"""
+        try:
+            with open(self.state_file, 'w', encoding='utf-8') as f:
+                json.dump({'urls': self.urls}, f, indent=2, ensure_ascii=False)
+            return True
+        except OSError as e:
+            print(f"Error saving link health: {e}")
+            return False
+    
+    def pending(self, shortcuts, force=False):
+        """http(s) URLs of url shortcuts that aren't cached or whose entry expired"""
+        now = time.time()
+        pending = {}
+        for shortcut in shortcuts:
+            url = shortcut.get('path', '')
+            if shortcut.get('type') != 'url' or urlsplit(url).scheme.lower() not in ('http', 'https'):
+                continue
+            entry = self.urls.get(url)
+            ttl = self.OK_TTL if entry and entry.get('status') == 'ok' else self.BROKEN_TTL
+            if force or entry is None or now - entry.get('checked', 0) > ttl:
+                pending[url] = True
+        return list(pending)
+    
+    @classmethod
+    def connect(cls, scheme, netloc):
+        """New connection to a host; http.client reopens it by itself after close()"""
+        import http.client  # imported on first use; it pulls in the email package
+        if scheme == 'https':
+            return http.client.HTTPSConnection(netloc, timeout=cls.TIMEOUT)
+        return http.client.HTTPConnection(netloc, timeout=cls.TIMEOUT)
+    
+    @classmethod
+    def request(cls, connection, method, target, headers):
+        """Send one request on a keep-alive connection, returning the response
+        
+        A server may drop an idle keep-alive connection at any time, so a
+        request that fails that way is sent once more on a new connection.
+        """
+        import http.client
+        for attempt in range(2):
+            try:
+                connection.request(method, target, headers=headers)
+                response = connection.getresponse()
+                break
+            except (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+                    ConnectionResetError, BrokenPipeError):
+                connection.close()
+                if attempt:
+                    raise
+        
+        # Read the body so the connection can be reused, unless it's too big to bother
+        response.read(cls.MAX_BODY)
+        if not response.isclosed():
+            connection.close()
+        return response
+    
+    @classmethod
+    def check_url(cls, connection_for, url, cached):
+        """Check one URL, following redirects; returns a cache entry"""
+        import http.client
+        import socket
+        entry = {'status': 'error', 'code': None, 'etag': cached.get('etag'),
+                 'lastModified': cached.get('lastModified'), 'checked': time.time(), 'error': ''}
+        headers = {'User-Agent': cls.USER_AGENT, 'Accept': '*/*'}
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('lastModified'):
+            headers['If-Modified-Since'] = cached['lastModified']
+        
+        method = 'HEAD'
+        connection = None
+        try:
+            for _ in range(cls.MAX_REDIRECTS + 2):  # one extra for the GET fallback
+                parts = urlsplit(url)
+                target = urlunsplit(('', '', parts.path or '/', parts.query, ''))
+                connection = connection_for(parts.scheme.lower(), parts.netloc.lower())
+                response = cls.request(connection, method, target, headers)
+                code = response.status
+                
+                if method == 'HEAD' and code in cls.HEAD_REJECTED:
+                    method = 'GET'
+                    headers['Range'] = 'bytes=0-0'
+                    continue
+                location = response.getheader('Location')
+                if code in cls.REDIRECTS and location:
+                    url = urljoin(url, location)
+                    headers.pop('If-None-Match', None)
+                    headers.pop('If-Modified-Since', None)
+                    headers.pop('Range', None)
+                    continue
+                break
+            else:
+                entry['error'] = "Too many redirects"
+                return entry
+        except socket.gaierror:
+            entry.update(status='dead', error="Unknown host")
+            return entry
+        except ConnectionRefusedError:
+            entry.update(status='dead', error="Connection refused")
+            return entry
+        except (OSError, http.client.HTTPException) as e:
+            # Timeouts, TLS errors, broken responses: maybe temporary
+            if connection is not None:
+                connection.close()
+            entry['error'] = str(e) or e.__class__.__name__
+            return entry
+        
+        entry['code'] = code
+        if code == 304 or 200 <= code < 300 or code in (401, 403):
+            # A login wall or bot blocker still means the page is there
+            entry['status'] = 'ok'
+            if code != 304:
+                entry['etag'] = response.getheader('ETag')
+                entry['lastModified'] = response.getheader('Last-Modified')
+        elif code in cls.DEAD_CODES:
+            entry.update(status='dead', error=f"HTTP {code}")
+        else:
+            entry['error'] = f"HTTP {code}"
+        return entry
+    
+    @classmethod
+    def check_urls(cls, urls, cached, stop=None, progress=None):
+        """Worker thread: check URLs one after the other over pooled keep-alive connections"""
+        connections = {}
+        
+        def connection_for(scheme, netloc):
+            key = (scheme, netloc)
+            if key not in connections:
+                connections[key] = cls.connect(scheme, netloc)
+            return connections[key]
+        
+        results = {}
+        try:
+            for url in urls:
+                if stop is not None and stop.is_set():
+                    break
+                results[url] = cls.check_url(connection_for, url, cached.get(url, {}))
+                if progress is not None:
+                    progress()
+        finally:
+            for connection in connections.values():
+                connection.close()
+        return results
+    
+    @classmethod
+    def scan(cls, urls, cached, stop=None, progress=None):
+        """Worker thread: check URLs, PER_HOST connections per host and MAX_WORKERS overall
+        
+        Returns url -> entry for every URL checked before stop was set.
+        """
+        by_host = {}
+        for url in urls:
+            parts = urlsplit(url)
+            by_host.setdefault((parts.scheme.lower(), parts.netloc.lower()), []).append(url)
+        
+        # Split each host's URLs over its connections; start with the longest queues
+        batches = [host_urls[i::cls.PER_HOST] for host_urls in by_host.values()
+                   for i in range(min(cls.PER_HOST, len(host_urls)))]
+        batches.sort(key=len, reverse=True)
+        
+        results = {}
+        with ThreadPoolExecutor(max_workers=cls.MAX_WORKERS) as executor:
+            futures = [executor.submit(cls.check_urls, batch, cached, stop, progress) for batch in batches]
+            for future in futures:
+                results.update(future.result())
+        return results
+    
+    def update(self, results, shortcuts):
+        """Merge scan results and forget URLs no shortcut uses anymore"""
+        self.urls.update(results)
+        in_use = {shortcut.get('path', '') for shortcut in shortcuts}
+        for url in [url for url in self.urls if url not in in_use]:
+            del self.urls[url]
+        return self.save_state()
+    
+    def problem(self, shortcut):
+        """Error message if the shortcut's URL was found dead, else None"""
+        if shortcut.get('type') != 'url':
+            return None
+        entry = self.urls.get(shortcut.get('path', ''))
+        if entry is None or entry.get('status') != 'dead':
+            return None
+        return entry.get('error') or "Dead link"
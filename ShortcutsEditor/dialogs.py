@@ -0,0 +1,659 @@
+# -*- coding: utf-8 -*-
+"""
+Dialogs of the Shortcuts Editor, imported the first time one is opened
+"""
+
+import os
+import re
+from pathlib import Path
+from PySide6.QtWidgets import (QApplication, QVBoxLayout, QHBoxLayout, QPushButton, QDialog,
+                               QFormLayout, QLineEdit, QComboBox, QSpinBox, QFileDialog, QLabel,
+                               QMessageBox, QGroupBox, QListWidget, QCheckBox, QProgressDialog)
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QPixmap
+
+from helpers import BookmarkImporter, HistoryImporter, FaviconCache
+from catalog_state import BookmarkSync
+
+
+class ShortcutDialog(QDialog):
+    """Dialog for adding/editing a shortcut"""
+    
+    def __init__(self, parent=None, shortcut=None, thumbnails=None, base_dir=''):
+        super().__init__(parent)
+        self.shortcut = shortcut or {}
+        self.icon_path = self.shortcut.get('icon', '')
+        self.thumbnails = thumbnails
+        self.base_dir = base_dir
+        if thumbnails is not None:
+            thumbnails.thumbnailReady.connect(self.on_thumbnail_ready)
+        
+        self.setWindowTitle("Edit Shortcut" if shortcut else "Add Shortcut")
+        self.setMinimumWidth(600)
+        self.setup_ui()
+        
+        if shortcut:
+            self.load_shortcut(shortcut)
+    
+    def setup_ui(self):
+        """Setup the dialog UI"""
+        layout = QVBoxLayout()
+        
+        # Form layout
+        form_layout = QFormLayout()
+        
+        # Keyword
+        self.keyword_edit = QLineEdit()
+        self.keyword_edit.setPlaceholderText("e.g., 'docs', 'myapp', 'google'")
+        form_layout.addRow("Keyword:", self.keyword_edit)
+        
+        # Type
+        self.type_combo = QComboBox()
+        self.type_combo.addItems(['folder', 'file', 'app', 'url'])
+        self.type_combo.currentTextChanged.connect(self.on_type_changed)
+        form_layout.addRow("Type:", self.type_combo)
+        
+        # Path
+        path_layout = QHBoxLayout()
+        self.path_edit = QLineEdit()
+        self.path_edit.setPlaceholderText("Path or URL")
+        self.browse_btn = QPushButton("Browse...")
+        self.browse_btn.clicked.connect(self.browse_path)
+        path_layout.addWidget(self.path_edit)
+        path_layout.addWidget(self.browse_btn)
+        form_layout.addRow("Path/URL:", path_layout)
+        
+        # Category
+        self.category_edit = QLineEdit()
+        self.category_edit.setPlaceholderText("e.g., 'Folders', 'Development', 'Social'")
+        form_layout.addRow("Category:", self.category_edit)
+        
+        # Open With (for files)
+        self.openwith_layout = QHBoxLayout()
+        self.openwith_edit = QLineEdit()
+        self.openwith_edit.setPlaceholderText("Optional: Application to open file with")
+        self.openwith_browse_btn = QPushButton("Browse...")
+        self.openwith_browse_btn.clicked.connect(self.browse_openwith)
+        self.openwith_layout.addWidget(self.openwith_edit)
+        self.openwith_layout.addWidget(self.openwith_browse_btn)
+        
+        self.openwith_label = QLabel("Open With:")
+        form_layout.addRow(self.openwith_label, self.openwith_layout)
+        
+        # Priority
+        self.priority_spin = QSpinBox()
+        self.priority_spin.setRange(0, 200)
+        self.priority_spin.setValue(100)
+        self.priority_spin.setToolTip("Higher values appear first in search results")
+        form_layout.addRow("Priority:", self.priority_spin)
+        
+        # Icon
+        icon_group = QGroupBox("Icon")
+        icon_layout = QHBoxLayout()
+        
+        self.icon_preview = QLabel()
+        self.icon_preview.setFixedSize(48, 48)
+        self.icon_preview.setScaledContents(True)
+        self.icon_preview.setStyleSheet("border: 1px solid #ccc;")
+        
+        self.icon_path_edit = QLineEdit()
+        self.icon_path_edit.setPlaceholderText("Path to icon file")
+        self.icon_path_edit.textChanged.connect(self.update_icon_preview)
+        
+        self.icon_browse_btn = QPushButton("Browse...")
+        self.icon_browse_btn.clicked.connect(self.browse_icon)
+        
+        icon_layout.addWidget(self.icon_preview)
+        icon_layout.addWidget(self.icon_path_edit)
+        icon_layout.addWidget(self.icon_browse_btn)
+        icon_group.setLayout(icon_layout)
+        
+        layout.addLayout(form_layout)
+        layout.addWidget(icon_group)
+        
+        # Buttons
+        button_layout = QHBoxLayout()
+        self.save_btn = QPushButton("Save")
+        self.save_btn.clicked.connect(self.accept)
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.clicked.connect(self.reject)
+        button_layout.addStretch()
+        button_layout.addWidget(self.save_btn)
+        button_layout.addWidget(self.cancel_btn)
+        
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+        
+        # Initial setup
+        self.on_type_changed(self.type_combo.currentText())
+    
+    def on_type_changed(self, shortcut_type):
+        """Handle type change"""
+        is_file = shortcut_type == 'file'
+        self.openwith_label.setVisible(is_file)
+        self.openwith_edit.setVisible(is_file)
+        self.openwith_browse_btn.setVisible(is_file)
+        
+        # Update placeholder
+        if shortcut_type == 'url':
+            self.path_edit.setPlaceholderText("https://example.com")
+            self.browse_btn.setEnabled(False)
+        else:
+            self.path_edit.setPlaceholderText(f"Path to {shortcut_type}")
+            self.browse_btn.setEnabled(True)
+        
+        # Auto-suggest category
+        if not self.category_edit.text():
+            category_map = {
+                'folder': 'Folders',
+                'file': 'Files',
+                'app': 'Apps',
+                'url': 'Bookmarks'
+            }
+            self.category_edit.setText(category_map.get(shortcut_type, ''))
+    
+    def browse_path(self):
+        """Browse for path"""
+        shortcut_type = self.type_combo.currentText()
+        
+        if shortcut_type == 'folder':
+            path = QFileDialog.getExistingDirectory(self, "Select Folder")
+        elif shortcut_type == 'file':
+            path, _ = QFileDialog.getOpenFileName(self, "Select File")
+        elif shortcut_type == 'app':
+            path, _ = QFileDialog.getOpenFileName(self, "Select Application", 
+                                                  filter="Executables (*.exe);;All Files (*.*)")
+        else:
+            return
+        
+        if path:
+            self.path_edit.setText(path)
+    
+    def browse_openwith(self):
+        """Browse for application to open file with"""
+        path, _ = QFileDialog.getOpenFileName(self, "Select Application",
+                                              filter="Executables (*.exe);;All Files (*.*)")
+        if path:
+            self.openwith_edit.setText(path)
+    
+    def browse_icon(self):
+        """Browse for icon file"""
+        path, _ = QFileDialog.getOpenFileName(self, "Select Icon",
+                                              filter="Images (*.png *.jpg *.ico *.bmp);;All Files (*.*)")
+        if path:
+            self.icon_path_edit.setText(path)
+    
+    def icon_file(self, icon):
+        """Absolute path of an icon as the plugin would resolve it"""
+        if icon and not os.path.isabs(icon):
+            icon = os.path.join(self.base_dir, icon)
+        return icon
+    
+    def update_icon_preview(self, path):
+        """Update icon preview"""
+        path = self.icon_file(path)
+        if self.thumbnails is not None:
+            # Decoded in the background; on_thumbnail_ready fills it in
+            pixmap = self.thumbnails.get(path) if path else None
+        elif path and os.path.exists(path):
+            pixmap = QPixmap(path)
+        else:
+            pixmap = None
+        
+        if pixmap:
+            self.icon_preview.setPixmap(pixmap)
+        else:
+            self.icon_preview.clear()
+    
+    def done(self, result):
+        """Close the dialog and stop following the shared thumbnail cache"""
+        if self.thumbnails is not None:
+            self.thumbnails.thumbnailReady.disconnect(self.on_thumbnail_ready)
+            self.thumbnails = None
+        super().done(result)
+    
+    def on_thumbnail_ready(self, path):
+        """Show a thumbnail that finished loading if it's still the current icon"""
+        if path == self.icon_file(self.icon_path_edit.text().strip()):
+            self.update_icon_preview(self.icon_path_edit.text().strip())
+    
+    def load_shortcut(self, shortcut):
+        """Load shortcut data into form"""
+        self.keyword_edit.setText(shortcut.get('keyword', ''))
+        
+        shortcut_type = shortcut.get('type', 'app')
+        index = self.type_combo.findText(shortcut_type)
+        if index >= 0:
+            self.type_combo.setCurrentIndex(index)
+        
+        self.path_edit.setText(shortcut.get('path', ''))
+        self.category_edit.setText(shortcut.get('category', ''))
+        self.openwith_edit.setText(shortcut.get('openWith', ''))
+        self.priority_spin.setValue(shortcut.get('priority', 100))
+        
+        # Show the original icon file rather than its normalized copy
+        icon = shortcut.get('iconSource') or shortcut.get('icon', '')
+        self.icon_path_edit.setText(icon)
+        if icon:
+            self.update_icon_preview(icon)
+    
+    def get_shortcut(self):
+        """Get shortcut data from form"""
+        # Keep fields the form doesn't edit (e.g. bookmarkId)
+        shortcut = dict(self.shortcut)
+        shortcut.update({
+            'keyword': self.keyword_edit.text().strip(),
+            'type': self.type_combo.currentText(),
+            'path': self.path_edit.text().strip(),
+            'category': self.category_edit.text().strip() or 'Uncategorized',
+            'priority': self.priority_spin.value(),
+            'icon': self.icon_path_edit.text().strip() or 'Images/shortcut.png'
+        })
+        
+        if self.type_combo.currentText() == 'file':
+            shortcut['openWith'] = self.openwith_edit.text().strip()
+        else:
+            shortcut.pop('openWith', None)
+        
+        # Unchanged icon: keep pointing at its normalized copy
+        if shortcut['icon'] == self.shortcut.get('iconSource'):
+            shortcut['icon'] = self.shortcut['icon']
+        else:
+            shortcut.pop('iconSource', None)
+        
+        return shortcut
+
+
+class BulkEditDialog(QDialog):
+    """Dialog for changing several shortcuts at once"""
+    
+    def __init__(self, parent=None, count=0, categories=()):
+        super().__init__(parent)
+        self.setWindowTitle(f"Bulk Edit {count} Shortcuts")
+        self.setMinimumWidth(500)
+        self.setup_ui(categories)
+    
+    def setup_ui(self, categories):
+        """Setup the dialog UI"""
+        layout = QVBoxLayout()
+        
+        # Each change only applies when its checkbox is ticked
+        form_layout = QFormLayout()
+        
+        self.set_category = QCheckBox("Set category:")
+        self.category_combo = QComboBox()
+        self.category_combo.setEditable(True)
+        self.category_combo.addItems(sorted(categories))
+        self.category_combo.currentTextChanged.connect(lambda: self.set_category.setChecked(True))
+        form_layout.addRow(self.set_category, self.category_combo)
+        
+        self.set_priority = QCheckBox("Set priority:")
+        self.priority_spin = QSpinBox()
+        self.priority_spin.setRange(0, 200)
+        self.priority_spin.setValue(100)
+        self.priority_spin.valueChanged.connect(lambda: self.set_priority.setChecked(True))
+        form_layout.addRow(self.set_priority, self.priority_spin)
+        
+        self.set_type = QCheckBox("Set type:")
+        self.type_combo = QComboBox()
+        self.type_combo.addItems(['folder', 'file', 'app', 'url'])
+        self.type_combo.currentTextChanged.connect(lambda: self.set_type.setChecked(True))
+        form_layout.addRow(self.set_type, self.type_combo)
+        
+        layout.addLayout(form_layout)
+        
+        # Find/replace in paths
+        replace_group = QGroupBox("Find and Replace in Paths")
+        replace_group.setCheckable(True)
+        replace_group.setChecked(False)
+        self.replace_group = replace_group
+        replace_layout = QFormLayout()
+        
+        self.find_edit = QLineEdit()
+        self.find_edit.setPlaceholderText("e.g., C:/Users/old-name")
+        self.replace_edit = QLineEdit()
+        self.replace_edit.setPlaceholderText("e.g., C:/Users/new-name")
+        self.match_case = QCheckBox("Match case")
+        self.match_case.setChecked(True)
+        
+        replace_layout.addRow("Find:", self.find_edit)
+        replace_layout.addRow("Replace with:", self.replace_edit)
+        replace_layout.addRow("", self.match_case)
+        replace_group.setLayout(replace_layout)
+        layout.addWidget(replace_group)
+        
+        # Buttons
+        button_layout = QHBoxLayout()
+        apply_btn = QPushButton("Apply")
+        apply_btn.clicked.connect(self.accept)
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.clicked.connect(self.reject)
+        button_layout.addStretch()
+        button_layout.addWidget(apply_btn)
+        button_layout.addWidget(cancel_btn)
+        
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+    
+    def get_updates(self):
+        """Field values to set on every selected shortcut"""
+        updates = {}
+        if self.set_category.isChecked():
+            updates['category'] = self.category_combo.currentText().strip() or 'Uncategorized'
+        if self.set_priority.isChecked():
+            updates['priority'] = self.priority_spin.value()
+        if self.set_type.isChecked():
+            updates['type'] = self.type_combo.currentText()
+        return updates
+    
+    def get_path_replacement(self):
+        """(pattern, replacement) to apply to paths, or None"""
+        find = self.find_edit.text()
+        if not self.replace_group.isChecked() or not find:
+            return None
+        flags = 0 if self.match_case.isChecked() else re.IGNORECASE
+        # Replace with a function so backslashes in Windows paths stay literal
+        replace_with = self.replace_edit.text()
+        return re.compile(re.escape(find), flags), lambda match: replace_with
+
+
+class BookmarkImportDialog(QDialog):
+    """Dialog for importing bookmarks"""
+    
+    ALL_BROWSERS = "All Browsers ({count} profiles)"
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.selected_bookmarks = []
+        self.loaded_files = {}
+        self.favicon_files = {}
+        
+        self.setWindowTitle("Import Bookmarks")
+        self.setMinimumSize(700, 500)
+        self.setup_ui()
+    
+    def setup_ui(self):
+        """Setup the dialog UI"""
+        layout = QVBoxLayout()
+        
+        # Browser selection
+        browser_group = QGroupBox("Select Browser")
+        browser_layout = QVBoxLayout()
+        
+        self.browser_combo = QComboBox()
+        self.available_browsers = BookmarkImporter.get_browser_bookmark_paths()
+        
+        if self.available_browsers:
+            if len(self.available_browsers) > 1:
+                self.browser_combo.addItem(self.ALL_BROWSERS.format(count=len(self.available_browsers)))
+            self.browser_combo.addItems(self.available_browsers.keys())
+        else:
+            self.browser_combo.addItem("(No browsers found - use Browse)")
+            self.browser_combo.setEnabled(False)
+        
+        browser_layout.addWidget(QLabel("Browser:"))
+        browser_layout.addWidget(self.browser_combo)
+        
+        # Button layout for Load and Browse
+        btn_layout = QHBoxLayout()
+        
+        load_btn = QPushButton("Load Bookmarks")
+        load_btn.clicked.connect(self.load_bookmarks)
+        load_btn.setEnabled(bool(self.available_browsers))
+        
+        browse_btn = QPushButton("Browse...")
+        browse_btn.clicked.connect(self.browse_bookmarks)
+        
+        btn_layout.addWidget(load_btn)
+        btn_layout.addWidget(browse_btn)
+        browser_layout.addLayout(btn_layout)
+        
+        # Most visited sites from browser history, prioritized by visit count
+        history_layout = QHBoxLayout()
+        
+        self.top_sites_count = QSpinBox()
+        self.top_sites_count.setRange(10, 1000)
+        self.top_sites_count.setValue(100)
+        self.top_sites_count.setPrefix("Top ")
+        self.top_sites_count.setSuffix(" sites")
+        
+        top_sites_btn = QPushButton("Load Top Sites from History")
+        top_sites_btn.setToolTip("Priorities are derived from how often each site was visited")
+        top_sites_btn.clicked.connect(self.load_top_sites)
+        top_sites_btn.setEnabled(bool(self.available_browsers))
+        
+        history_layout.addWidget(self.top_sites_count)
+        history_layout.addWidget(top_sites_btn)
+        browser_layout.addLayout(history_layout)
+        
+        browser_group.setLayout(browser_layout)
+        layout.addWidget(browser_group)
+        
+        # Bookmark list
+        list_group = QGroupBox("Select Bookmarks to Import")
+        list_layout = QVBoxLayout()
+        
+        self.bookmark_list = QListWidget()
+        self.bookmark_list.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
+        list_layout.addWidget(self.bookmark_list)
+        
+        # Selection controls
+        select_layout = QHBoxLayout()
+        select_all_btn = QPushButton("Select All")
+        select_all_btn.clicked.connect(self.bookmark_list.selectAll)
+        deselect_all_btn = QPushButton("Deselect All")
+        deselect_all_btn.clicked.connect(self.bookmark_list.clearSelection)
+        select_layout.addWidget(select_all_btn)
+        select_layout.addWidget(deselect_all_btn)
+        select_layout.addStretch()
+        list_layout.addLayout(select_layout)
+        
+        list_group.setLayout(list_layout)
+        layout.addWidget(list_group)
+        
+        # Import settings
+        settings_group = QGroupBox("Import Settings")
+        settings_layout = QFormLayout()
+        
+        self.default_category = QLineEdit("Bookmarks")
+        self.default_priority = QSpinBox()
+        self.default_priority.setRange(0, 200)
+        self.default_priority.setValue(80)
+        
+        self.use_folder_as_category = QCheckBox("Use bookmark folder as category")
+        self.use_folder_as_category.setChecked(True)
+        
+        self.short_keywords = QCheckBox("Generate shortest unique keywords")
+        self.short_keywords.setChecked(True)
+        self.short_keywords.setToolTip("Abbreviate each keyword to the shortest prefix no other shortcut starts with")
+        
+        settings_layout.addRow("Default Category:", self.default_category)
+        settings_layout.addRow("Default Priority:", self.default_priority)
+        settings_layout.addRow("", self.use_folder_as_category)
+        settings_layout.addRow("", self.short_keywords)
+        
+        self.use_favicons = QCheckBox("Use the browser's favicons as icons")
+        self.use_favicons.setChecked(True)
+        settings_layout.addRow("", self.use_favicons)
+        
+        self.keep_in_sync = QCheckBox("Keep in sync with the browser")
+        self.keep_in_sync.setToolTip("Import bookmarks added later and flag ones deleted in the browser")
+        settings_layout.addRow("", self.keep_in_sync)
+        
+        settings_group.setLayout(settings_layout)
+        layout.addWidget(settings_group)
+        
+        # Buttons
+        button_layout = QHBoxLayout()
+        self.import_btn = QPushButton("Import Selected")
+        self.import_btn.clicked.connect(self.accept)
+        self.import_btn.setEnabled(False)
+        
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.clicked.connect(self.reject)
+        
+        button_layout.addStretch()
+        button_layout.addWidget(self.import_btn)
+        button_layout.addWidget(cancel_btn)
+        
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+    
+    def browse_bookmarks(self):
+        """Browse for a bookmarks file manually"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, 
+            "Select Bookmarks File",
+            "",
+            "Bookmark Files (Bookmarks);;JSON Files (*.json);;All Files (*.*)"
+        )
+        
+        if file_path:
+            self.load_bookmarks_from_file(Path(file_path), "Custom Location")
+    
+    def get_selected_browser_files(self, available_files, description):
+        """Files of the selected browser, or of every browser for the "All Browsers" entry
+        
+        Returns (files, source_name); files is empty if the selected browser has none.
+        """
+        browser = self.browser_combo.currentText()
+        
+        if browser not in self.available_browsers:
+            # "All Browsers" entry: every discovered profile at once
+            files = {name: path for name, path in available_files.items() if path.exists()}
+            return files, f"{len(files)} browser profile(s)"
+        
+        file_path = available_files.get(browser)
+        if not file_path or not file_path.exists():
+            QMessageBox.warning(self, "Error", f"{description} not found for {browser}")
+            return {}, browser
+        return {browser: file_path}, browser
+    
+    def load_bookmarks(self):
+        """Load bookmarks from selected browser (or from all of them)"""
+        bookmark_files, source_name = self.get_selected_browser_files(self.available_browsers, "Bookmark file")
+        if bookmark_files:
+            self.load_bookmarks_from_files(bookmark_files, source_name)
+    
+    def load_top_sites(self):
+        """Load the most visited sites from the selected browser's history"""
+        history_files, source_name = self.get_selected_browser_files(
+            HistoryImporter.get_browser_history_paths(), "History database")
+        if not history_files:
+            return
+        
+        progress = QProgressDialog("Reading browser history...", None, 0, 0, self)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.show()
+        
+        QApplication.processEvents()
+        
+        sites = HistoryImporter.read_top_sites(history_files, self.top_sites_count.value())
+        
+        progress.close()
+        
+        if not sites:
+            QMessageBox.information(self, "No History", "No visited sites found in the browser history.")
+            return
+        
+        self.bookmark_list.clear()
+        self.all_bookmarks = sites
+        self.loaded_files = {}
+        self.favicon_files = {name: path.with_name('Favicons') for name, path in history_files.items()}
+        
+        for site in sites:
+            name = site['name'] or site['url']
+            self.bookmark_list.addItem(f"{name} ({site['visit_count']} visits, priority {site['priority']})")
+        
+        self.import_btn.setEnabled(True)
+        QMessageBox.information(self, "Success", f"Loaded {len(sites)} top sites from {source_name}")
+    
+    def load_bookmarks_from_file(self, bookmark_file, source_name):
+        """Load and parse bookmarks from a file"""
+        self.load_bookmarks_from_files({source_name: bookmark_file}, source_name)
+    
+    def load_bookmarks_from_files(self, bookmark_files, source_name):
+        """Load, parse and merge bookmarks from one or more files"""
+        # Parse bookmarks
+        progress = QProgressDialog("Loading bookmarks...", None, 0, 0, self)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.show()
+        
+        QApplication.processEvents()
+        
+        bookmarks = BookmarkImporter.parse_bookmark_files(bookmark_files)
+        
+        progress.close()
+        
+        if not bookmarks:
+            QMessageBox.information(self, "No Bookmarks", "No bookmarks found in the selected file.")
+            return
+        
+        # Populate list
+        self.bookmark_list.clear()
+        self.all_bookmarks = bookmarks
+        self.loaded_files = dict(bookmark_files)
+        self.favicon_files = {name: Path(path).with_name('Favicons') for name, path in bookmark_files.items()}
+        
+        show_source = len(bookmark_files) > 1
+        for bookmark in bookmarks:
+            folder = bookmark['folder'] or 'Root'
+            name = bookmark['name'] or bookmark['url']
+            item_text = f"{name} ({folder})"
+            if show_source:
+                item_text += f" [{bookmark['source']}]"
+            self.bookmark_list.addItem(item_text)
+        
+        self.import_btn.setEnabled(True)
+        QMessageBox.information(self, "Success", f"Loaded {len(bookmarks)} bookmarks from {source_name}")
+    
+    def get_selected_shortcuts(self, existing_keywords=(), plugin_dir=None):
+        """Convert selected bookmarks to shortcuts
+        
+        If plugin_dir is given, favicons are cached under its Images folder.
+        """
+        selected_items = self.bookmark_list.selectedItems()
+        selected_indices = [self.bookmark_list.row(item) for item in selected_items]
+        
+        shortcuts = []
+        by_source = {}
+        for idx in selected_indices:
+            bookmark = self.all_bookmarks[idx]
+            
+            # Determine category
+            if self.use_folder_as_category.isChecked() and bookmark['folder']:
+                category = bookmark['folder'].replace('/', ' > ')
+            else:
+                category = self.default_category.text()
+            
+            # Create keyword from name (lowercase, replace spaces with dashes)
+            keyword = BookmarkImporter.make_keyword(bookmark['name'] or bookmark['url'])
+            
+            # Create shortcut with relative icon path
+            shortcut = {
+                'keyword': keyword,
+                'type': 'url',
+                'path': bookmark['url'],
+                'category': category,
+                'priority': bookmark.get('priority', self.default_priority.value()),
+                'icon': 'Images/bookmark.png'  # Keep relative path
+            }
+            if self.keep_in_sync.isChecked() and bookmark['id']:
+                shortcut['bookmarkId'] = BookmarkSync.bookmark_id(bookmark['source'], bookmark['id'])
+            shortcuts.append(shortcut)
+            by_source.setdefault(bookmark['source'], []).append(shortcut)
+        
+        if plugin_dir and self.use_favicons.isChecked():
+            favicon_cache = FaviconCache(plugin_dir)
+            for source, source_shortcuts in by_source.items():
+                favicons_file = self.favicon_files.get(source)
+                if favicons_file and favicons_file.is_file():
+                    favicon_cache.apply(source_shortcuts, favicons_file)
+        
+        if self.short_keywords.isChecked():
+            keywords = BookmarkImporter.shortest_unique_keywords(
+                [shortcut['keyword'] for shortcut in shortcuts], existing_keywords)
+            for shortcut, keyword in zip(shortcuts, keywords):
+                shortcut['keyword'] = keyword
+        
+        return shortcuts
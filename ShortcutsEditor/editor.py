@@ -1,17 +1,33 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import time
+STARTED = time.perf_counter()  # reference point of the SHORTCUTS_EDITOR_TIMING report
+
 import sys
 import os
 import json
+import struct
+import zlib
+import hashlib
+import unicodedata
+import tempfile
+import threading
+import argparse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                                QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton,
-                               QDialog, QFormLayout, QLineEdit, QComboBox, QSpinBox,
-                               QFileDialog, QLabel, QMessageBox, QHeaderView, QGroupBox,
-                               QListWidget, QCheckBox, QProgressDialog, QMenuBar, QTextEdit)
-from PySide6.QtCore import Qt, QSettings
-from PySide6.QtGui import QIcon, QPixmap, QAction
+                               QDialog, QFileDialog, QLabel, QMessageBox, QHeaderView, QTextEdit)
+from PySide6.QtCore import (Qt, QSettings, QTimer, QObject, Signal,
+                            QStandardPaths, QSize, QFileSystemWatcher)
+from PySide6.QtGui import QIcon, QPixmap, QImage, QAction, QKeySequence
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+# Dialogs (dialogs.py) and the bookmark and icon helpers (helpers.py) are
+# imported where they are first used, so they stay out of startup; the small
+# side-file classes (catalog_state.py) are loaded with the catalog
 
 
 def resource_path(relative_path):
@@ -23,474 +39,550 @@ def resource_path(relative_path):
     return Path(base_path) / relative_path
 
 
-class ShortcutDialog(QDialog):
-    """Dialog for adding/editing a shortcut"""
+class StartupTiming:
+    """Startup timing report
     
-    def __init__(self, parent=None, shortcut=None):
-        super().__init__(parent)
-        self.shortcut = shortcut or {}
-        self.icon_path = self.shortcut.get('icon', '')
-        
-        self.setWindowTitle("Edit Shortcut" if shortcut else "Add Shortcut")
-        self.setMinimumWidth(600)
-        self.setup_ui()
-        
-        if shortcut:
-            self.load_shortcut(shortcut)
+    Set SHORTCUTS_EDITOR_TIMING=1 to print, once the window was painted and
+    the table filled, the milliseconds since editor.py started at which each
+    startup step (imports, window, first paint, catalog read, table filled)
+    completed.
+    """
     
-    def setup_ui(self):
-        """Setup the dialog UI"""
-        layout = QVBoxLayout()
-        
-        # Form layout
-        form_layout = QFormLayout()
-        
-        # Keyword
-        self.keyword_edit = QLineEdit()
-        self.keyword_edit.setPlaceholderText("e.g., 'docs', 'myapp', 'google'")
-        form_layout.addRow("Keyword:", self.keyword_edit)
-        
-        # Type
-        self.type_combo = QComboBox()
-        self.type_combo.addItems(['folder', 'file', 'app', 'url'])
-        self.type_combo.currentTextChanged.connect(self.on_type_changed)
-        form_layout.addRow("Type:", self.type_combo)
-        
-        # Path
-        path_layout = QHBoxLayout()
-        self.path_edit = QLineEdit()
-        self.path_edit.setPlaceholderText("Path or URL")
-        self.browse_btn = QPushButton("Browse...")
-        self.browse_btn.clicked.connect(self.browse_path)
-        path_layout.addWidget(self.path_edit)
-        path_layout.addWidget(self.browse_btn)
-        form_layout.addRow("Path/URL:", path_layout)
-        
-        # Category
-        self.category_edit = QLineEdit()
-        self.category_edit.setPlaceholderText("e.g., 'Folders', 'Development', 'Social'")
-        form_layout.addRow("Category:", self.category_edit)
-        
-        # Open With (for files)
-        self.openwith_layout = QHBoxLayout()
-        self.openwith_edit = QLineEdit()
-        self.openwith_edit.setPlaceholderText("Optional: Application to open file with")
-        self.openwith_browse_btn = QPushButton("Browse...")
-        self.openwith_browse_btn.clicked.connect(self.browse_openwith)
-        self.openwith_layout.addWidget(self.openwith_edit)
-        self.openwith_layout.addWidget(self.openwith_browse_btn)
-        
-        self.openwith_label = QLabel("Open With:")
-        form_layout.addRow(self.openwith_label, self.openwith_layout)
-        
-        # Priority
-        self.priority_spin = QSpinBox()
-        self.priority_spin.setRange(0, 200)
-        self.priority_spin.setValue(100)
-        self.priority_spin.setToolTip("Higher values appear first in search results")
-        form_layout.addRow("Priority:", self.priority_spin)
-        
-        # Icon
-        icon_group = QGroupBox("Icon")
-        icon_layout = QHBoxLayout()
-        
-        self.icon_preview = QLabel()
-        self.icon_preview.setFixedSize(48, 48)
-        self.icon_preview.setScaledContents(True)
-        self.icon_preview.setStyleSheet("border: 1px solid #ccc;")
-        
-        self.icon_path_edit = QLineEdit()
-        self.icon_path_edit.setPlaceholderText("Path to icon file")
-        self.icon_path_edit.textChanged.connect(self.update_icon_preview)
-        
-        self.icon_browse_btn = QPushButton("Browse...")
-        self.icon_browse_btn.clicked.connect(self.browse_icon)
-        
-        icon_layout.addWidget(self.icon_preview)
-        icon_layout.addWidget(self.icon_path_edit)
-        icon_layout.addWidget(self.icon_browse_btn)
-        icon_group.setLayout(icon_layout)
-        
-        layout.addLayout(form_layout)
-        layout.addWidget(icon_group)
-        
-        # Buttons
-        button_layout = QHBoxLayout()
-        self.save_btn = QPushButton("Save")
-        self.save_btn.clicked.connect(self.accept)
-        self.cancel_btn = QPushButton("Cancel")
-        self.cancel_btn.clicked.connect(self.reject)
-        button_layout.addStretch()
-        button_layout.addWidget(self.save_btn)
-        button_layout.addWidget(self.cancel_btn)
-        
-        layout.addLayout(button_layout)
-        self.setLayout(layout)
-        
-        # Initial setup
-        self.on_type_changed(self.type_combo.currentText())
-    
-    def on_type_changed(self, shortcut_type):
-        """Handle type change"""
-        is_file = shortcut_type == 'file'
-        self.openwith_label.setVisible(is_file)
-        self.openwith_edit.setVisible(is_file)
-        self.openwith_browse_btn.setVisible(is_file)
-        
-        # Update placeholder
-        if shortcut_type == 'url':
-            self.path_edit.setPlaceholderText("https://example.com")
-            self.browse_btn.setEnabled(False)
-        else:
-            self.path_edit.setPlaceholderText(f"Path to {shortcut_type}")
-            self.browse_btn.setEnabled(True)
-        
-        # Auto-suggest category
-        if not self.category_edit.text():
-            category_map = {
-                'folder': 'Folders',
-                'file': 'Files',
-                'app': 'Apps',
-                'url': 'Bookmarks'
-            }
-            self.category_edit.setText(category_map.get(shortcut_type, ''))
-    
-    def browse_path(self):
-        """Browse for path"""
-        shortcut_type = self.type_combo.currentText()
-        
-        if shortcut_type == 'folder':
-            path = QFileDialog.getExistingDirectory(self, "Select Folder")
-        elif shortcut_type == 'file':
-            path, _ = QFileDialog.getOpenFileName(self, "Select File")
-        elif shortcut_type == 'app':
-            path, _ = QFileDialog.getOpenFileName(self, "Select Application", 
-                                                  filter="Executables (*.exe);;All Files (*.*)")
-        else:
-            return
-        
-        if path:
-            self.path_edit.setText(path)
-    
-    def browse_openwith(self):
-        """Browse for application to open file with"""
-        path, _ = QFileDialog.getOpenFileName(self, "Select Application",
-                                              filter="Executables (*.exe);;All Files (*.*)")
-        if path:
-            self.openwith_edit.setText(path)
-    
-    def browse_icon(self):
-        """Browse for icon file"""
-        path, _ = QFileDialog.getOpenFileName(self, "Select Icon",
-                                              filter="Images (*.png *.jpg *.ico *.bmp);;All Files (*.*)")
-        if path:
-            self.icon_path_edit.setText(path)
-    
-    def update_icon_preview(self, path):
-        """Update icon preview"""
-        if path and os.path.exists(path):
-            pixmap = QPixmap(path)
-            self.icon_preview.setPixmap(pixmap)
-        else:
-            self.icon_preview.clear()
-    
-    def load_shortcut(self, shortcut):
-        """Load shortcut data into form"""
-        self.keyword_edit.setText(shortcut.get('keyword', ''))
-        
-        shortcut_type = shortcut.get('type', 'app')
-        index = self.type_combo.findText(shortcut_type)
-        if index >= 0:
-            self.type_combo.setCurrentIndex(index)
-        
-        self.path_edit.setText(shortcut.get('path', ''))
-        self.category_edit.setText(shortcut.get('category', ''))
-        self.openwith_edit.setText(shortcut.get('openWith', ''))
-        self.priority_spin.setValue(shortcut.get('priority', 100))
-        
-        icon = shortcut.get('icon', '')
-        self.icon_path_edit.setText(icon)
-        if icon:
-            self.update_icon_preview(icon)
-    
-    def get_shortcut(self):
-        """Get shortcut data from form"""
-        shortcut = {
-            'keyword': self.keyword_edit.text().strip(),
-            'type': self.type_combo.currentText(),
-            'path': self.path_edit.text().strip(),
-            'category': self.category_edit.text().strip() or 'Uncategorized',
-            'priority': self.priority_spin.value(),
-            'icon': self.icon_path_edit.text().strip() or 'Images/shortcut.png'
-        }
-        
-        if self.type_combo.currentText() == 'file':
-            shortcut['openWith'] = self.openwith_edit.text().strip()
-        
-        return shortcut
+    FINAL_STEPS = ('first paint', 'table filled')
+    enabled = os.environ.get('SHORTCUTS_EDITOR_TIMING', '') not in ('', '0')
+    marks = {}
+    reported = False
+    
+    @classmethod
+    def mark(cls, step):
+        """Record when a step finished (only its first occurrence)"""
+        if cls.enabled and not cls.reported and step not in cls.marks:
+            cls.marks[step] = round((time.perf_counter() - STARTED) * 1000, 1)
+            if all(final in cls.marks for final in cls.FINAL_STEPS):
+                cls.report()
+    
+    @classmethod
+    def report(cls):
+        """Print the report to stderr (windowed builds have none)"""
+        if cls.enabled and not cls.reported and sys.stderr is not None:
+            print(json.dumps({'startup_ms': cls.marks}), file=sys.stderr)
+        cls.reported = True
 
 
-class BookmarkImporter:
-    """Import bookmarks from various browsers"""
+class ThumbnailCache(QObject):
+    """Icon thumbnails keyed by path and mtime, decoded off the GUI thread
     
-    @staticmethod
-    def get_browser_bookmark_paths():
-        """Get standard bookmark file locations for different browsers"""
-        local_appdata = os.getenv('LOCALAPPDATA', '')
-        appdata = os.getenv('APPDATA', '')
-        
-        paths = {
-            'Chrome': Path(local_appdata) / 'Google' / 'Chrome' / 'User Data' / 'Default' / 'Bookmarks',
-            'Edge': Path(local_appdata) / 'Microsoft' / 'Edge' / 'User Data' / 'Default' / 'Bookmarks',
-            'Opera': Path(appdata) / 'Opera Software' / 'Opera Stable' / 'Bookmarks',
-            'Brave': Path(local_appdata) / 'BraveSoftware' / 'Brave-Browser' / 'User Data' / 'Default' / 'Bookmarks',
-        }
-        
-        return {name: path for name, path in paths.items() if path.exists()}
+    get() answers from an in-memory LRU; on a miss it returns None and a
+    worker thread loads the thumbnail from the on-disk cache (or decodes
+    and scales the source image, then writes it there), after which
+    thumbnailReady is emitted with the requested path.
+    """
     
-    @staticmethod
-    def parse_chromium_bookmarks(bookmark_file):
-        """Parse Chromium-based browser bookmarks (Chrome, Edge, Opera, Brave)"""
+    thumbnailReady = Signal(str)
+    # Worker -> GUI thread hand-off; QPixmap may only be created on the GUI thread
+    images_ready = Signal(str, object, object)
+    
+    THUMBNAIL_SIZE = 48
+    MEMORY_ITEMS = 512
+    
+    def __init__(self, cache_dir=None, parent=None):
+        super().__init__(parent)
+        if cache_dir is None:
+            cache_dir = os.path.join(
+                QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation), 'thumbnails')
+        self.cache_dir = cache_dir
+        self.memory = OrderedDict()  # (path, mtime_ns) -> QPixmap, or None if undecodable
+        self.pending = set()
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.images_ready.connect(self.on_image_ready)
+    
+    def get(self, path):
+        """Return the thumbnail for path, or None while it loads (or if it can't be read)"""
         try:
-            with open(bookmark_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            bookmarks = []
-            
-            def extract_bookmarks(node, folder_path=''):
-                """Recursively extract bookmarks from bookmark tree"""
-                if isinstance(node, dict):
-                    node_type = node.get('type')
-                    
-                    if node_type == 'url':
-                        # This is a bookmark
-                        bookmarks.append({
-                            'name': node.get('name', ''),
-                            'url': node.get('url', ''),
-                            'folder': folder_path
-                        })
-                    elif node_type == 'folder':
-                        # This is a folder, recurse into children
-                        folder_name = node.get('name', '')
-                        new_path = f"{folder_path}/{folder_name}" if folder_path else folder_name
-                        
-                        children = node.get('children', [])
-                        for child in children:
-                            extract_bookmarks(child, new_path)
-                
-                elif isinstance(node, list):
-                    for item in node:
-                        extract_bookmarks(item, folder_path)
-            
-            # Start extraction from bookmark roots
-            roots = data.get('roots', {})
-            for root_name, root_node in roots.items():
-                if root_name in ['bookmark_bar', 'other', 'synced']:
-                    extract_bookmarks(root_node)
-            
-            return bookmarks
+            key = (path, os.stat(path).st_mtime_ns)
+        except (OSError, ValueError):
+            return None
+        
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return self.memory[key]
+        
+        if key not in self.pending:
+            self.pending.add(key)
+            self.executor.submit(self.load, key)
+        return None
+    
+    def disk_path(self, key):
+        """Location of a thumbnail in the on-disk cache"""
+        digest = hashlib.sha1(f"{key[0]}|{key[1]}|{self.THUMBNAIL_SIZE}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest + '.png')
+    
+    def load(self, key):
+        """Worker thread: load a thumbnail from disk, or decode and cache it"""
+        image = QImage()
+        try:
+            cached_file = self.disk_path(key)
+            if os.path.exists(cached_file):
+                image = QImage(cached_file)
+            if image.isNull():
+                from helpers import IconCache
+                image = IconCache.load_best_image(key[0])
+                if not image.isNull():
+                    image = image.scaled(self.THUMBNAIL_SIZE, self.THUMBNAIL_SIZE,
+                                         Qt.AspectRatioMode.KeepAspectRatio,
+                                         Qt.TransformationMode.SmoothTransformation)
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    image.save(cached_file, 'PNG')
         except Exception as e:
-            print(f"Error parsing bookmarks: {e}")
-            return []
+            print(f"Error loading thumbnail for {key[0]}: {e}")
+        self.images_ready.emit(key[0], key, image)
+    
+    def on_image_ready(self, path, key, image):
+        """GUI thread: store the decoded thumbnail and notify listeners"""
+        self.pending.discard(key)
+        self.memory[key] = None if image.isNull() else QPixmap.fromImage(image)
+        while len(self.memory) > self.MEMORY_ITEMS:
+            self.memory.popitem(last=False)
+        self.thumbnailReady.emit(path)
+    
+    @staticmethod
+    def resolve(icon, base_dir):
+        """Absolute path of an icon as the plugin would resolve it"""
+        if icon and not os.path.isabs(icon):
+            icon = os.path.join(base_dir, icon)
+        return icon
 
 
-class BookmarkImportDialog(QDialog):
-    """Dialog for importing bookmarks"""
+class UndoJournal:
+    """Undo/redo history of catalog changes, stored as compact diffs
     
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.selected_bookmarks = []
-        
-        self.setWindowTitle("Import Bookmarks")
-        self.setMinimumSize(700, 500)
-        self.setup_ui()
+    A command only holds what changed: records inserted or removed, by
+    index (the record dicts are shared with the catalog, not copied), and
+    changed fields as (old, new) pairs. Consecutive edits of the same
+    field of the same shortcut merge into one command. The oldest commands
+    are dropped once the estimated size of the history exceeds max_bytes.
     
-    def setup_ui(self):
-        """Setup the dialog UI"""
-        layout = QVBoxLayout()
-        
-        # Browser selection
-        browser_group = QGroupBox("Select Browser")
-        browser_layout = QVBoxLayout()
-        
-        self.browser_combo = QComboBox()
-        self.available_browsers = BookmarkImporter.get_browser_bookmark_paths()
-        
-        if self.available_browsers:
-            self.browser_combo.addItems(self.available_browsers.keys())
-        else:
-            self.browser_combo.addItem("(No browsers found - use Browse)")
-            self.browser_combo.setEnabled(False)
-        
-        browser_layout.addWidget(QLabel("Browser:"))
-        browser_layout.addWidget(self.browser_combo)
-        
-        # Button layout for Load and Browse
-        btn_layout = QHBoxLayout()
-        
-        load_btn = QPushButton("Load Bookmarks")
-        load_btn.clicked.connect(self.load_bookmarks)
-        load_btn.setEnabled(bool(self.available_browsers))
-        
-        browse_btn = QPushButton("Browse...")
-        browse_btn.clicked.connect(self.browse_bookmarks)
-        
-        btn_layout.addWidget(load_btn)
-        btn_layout.addWidget(browse_btn)
-        browser_layout.addLayout(btn_layout)
-        
-        browser_group.setLayout(browser_layout)
-        layout.addWidget(browser_group)
-        
-        # Bookmark list
-        list_group = QGroupBox("Select Bookmarks to Import")
-        list_layout = QVBoxLayout()
-        
-        self.bookmark_list = QListWidget()
-        self.bookmark_list.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
-        list_layout.addWidget(self.bookmark_list)
-        
-        # Selection controls
-        select_layout = QHBoxLayout()
-        select_all_btn = QPushButton("Select All")
-        select_all_btn.clicked.connect(self.bookmark_list.selectAll)
-        deselect_all_btn = QPushButton("Deselect All")
-        deselect_all_btn.clicked.connect(self.bookmark_list.clearSelection)
-        select_layout.addWidget(select_all_btn)
-        select_layout.addWidget(deselect_all_btn)
-        select_layout.addStretch()
-        list_layout.addLayout(select_layout)
-        
-        list_group.setLayout(list_layout)
-        layout.addWidget(list_group)
-        
-        # Import settings
-        settings_group = QGroupBox("Import Settings")
-        settings_layout = QFormLayout()
-        
-        self.default_category = QLineEdit("Bookmarks")
-        self.default_priority = QSpinBox()
-        self.default_priority.setRange(0, 200)
-        self.default_priority.setValue(80)
-        
-        self.use_folder_as_category = QCheckBox("Use bookmark folder as category")
-        self.use_folder_as_category.setChecked(True)
-        
-        settings_layout.addRow("Default Category:", self.default_category)
-        settings_layout.addRow("Default Priority:", self.default_priority)
-        settings_layout.addRow("", self.use_folder_as_category)
-        
-        settings_group.setLayout(settings_layout)
-        layout.addWidget(settings_group)
-        
-        # Buttons
-        button_layout = QHBoxLayout()
-        self.import_btn = QPushButton("Import Selected")
-        self.import_btn.clicked.connect(self.accept)
-        self.import_btn.setEnabled(False)
-        
-        cancel_btn = QPushButton("Cancel")
-        cancel_btn.clicked.connect(self.reject)
-        
-        button_layout.addStretch()
-        button_layout.addWidget(self.import_btn)
-        button_layout.addWidget(cancel_btn)
-        
-        layout.addLayout(button_layout)
-        self.setLayout(layout)
-    
-    def browse_bookmarks(self):
-        """Browse for a bookmarks file manually"""
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, 
-            "Select Bookmarks File",
-            "",
-            "Bookmark Files (Bookmarks);;JSON Files (*.json);;All Files (*.*)"
-        )
-        
-        if file_path:
-            self.load_bookmarks_from_file(Path(file_path), "Custom Location")
+    Indices of 'changed' and 'removed' refer to the catalog before the
+    command, those of 'inserted' to the catalog after it.
+    """
     
-    def load_bookmarks(self):
-        """Load bookmarks from selected browser"""
-        browser = self.browser_combo.currentText()
-        bookmark_file = self.available_browsers.get(browser)
-        
-        if not bookmark_file or not bookmark_file.exists():
-            QMessageBox.warning(self, "Error", f"Bookmark file not found for {browser}")
-            return
-        
-        self.load_bookmarks_from_file(bookmark_file, browser)
+    MISSING = None  # old/new value of a field that isn't set
     
-    def load_bookmarks_from_file(self, bookmark_file, source_name):
-        """Load and parse bookmarks from a file"""
-        # Parse bookmarks
-        progress = QProgressDialog("Loading bookmarks...", None, 0, 0, self)
-        progress.setWindowModality(Qt.WindowModality.WindowModal)
-        progress.show()
-        
-        QApplication.processEvents()
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.undo_stack = []
+        self.redo_stack = []
+        self.total_bytes = 0
+    
+    @staticmethod
+    def field_changes(old, new):
+        """Fields that differ between two versions of a record, as field -> (old, new)"""
+        return {field: (old.get(field), new.get(field))
+                for field in old.keys() | new.keys() if old.get(field) != new.get(field)}
+    
+    @staticmethod
+    def snapshot(shortcuts):
+        """Shallow copy of the catalog for record_since()"""
+        return [dict(shortcut) for shortcut in shortcuts]
+    
+    def record_since(self, label, snapshot, shortcuts):
+        """Record changes made after snapshot() by code that only edits in place and appends"""
+        changed = []
+        for index, before in enumerate(snapshot):
+            changes = self.field_changes(before, shortcuts[index])
+            if changes:
+                changed.append((index, changes))
+        inserted = [(index, shortcuts[index]) for index in range(len(snapshot), len(shortcuts))]
+        return self.record(label, inserted=inserted, changed=changed)
+    
+    @staticmethod
+    def estimate_size(command):
+        """Rough memory footprint of a command in bytes"""
+        size = 200
+        for _, record in command['inserted'] + command['removed']:
+            size += 100 + sum(60 + len(str(key)) + len(str(value)) for key, value in record.items())
+        for _, changes in command['changed']:
+            size += 100 + sum(80 + len(str(old)) + len(str(new)) for old, new in changes.values())
+        return size
+    
+    def record(self, label, inserted=(), removed=(), changed=(), mergeable=True):
+        """Add a command for a change that has already been applied"""
+        command = {
+            'label': label,
+            'inserted': sorted(inserted, key=lambda entry: entry[0]),
+            'removed': sorted(removed, key=lambda entry: entry[0]),
+            'changed': [(index, changes) for index, changes in changed if changes]
+        }
+        if not (command['inserted'] or command['removed'] or command['changed']):
+            return False
         
-        bookmarks = BookmarkImporter.parse_chromium_bookmarks(bookmark_file)
+        for redo_command in self.redo_stack:
+            self.total_bytes -= redo_command['size']
+        self.redo_stack.clear()
         
-        progress.close()
+        if mergeable and self.merge(command):
+            return True
         
-        if not bookmarks:
-            QMessageBox.information(self, "No Bookmarks", "No bookmarks found in the selected file.")
-            return
+        command['size'] = self.estimate_size(command)
+        self.undo_stack.append(command)
+        self.total_bytes += command['size']
         
-        # Populate list
-        self.bookmark_list.clear()
-        self.all_bookmarks = bookmarks
+        # Keep at least the newest command, however large
+        while self.total_bytes > self.max_bytes and len(self.undo_stack) > 1:
+            self.total_bytes -= self.undo_stack.pop(0)['size']
+        return True
+    
+    def merge(self, command):
+        """Fold a single-field edit into the previous edit of the same field"""
+        if not self.undo_stack or command['inserted'] or command['removed'] or len(command['changed']) != 1:
+            return False
+        previous = self.undo_stack[-1]
+        if previous['inserted'] or previous['removed'] or len(previous['changed']) != 1:
+            return False
         
-        for bookmark in bookmarks:
-            folder = bookmark['folder'] or 'Root'
-            name = bookmark['name'] or bookmark['url']
-            item_text = f"{name} ({folder})"
-            self.bookmark_list.addItem(item_text)
+        index, changes = command['changed'][0]
+        previous_index, previous_changes = previous['changed'][0]
+        if index != previous_index or len(changes) != 1 or changes.keys() != previous_changes.keys():
+            return False
         
-        self.import_btn.setEnabled(True)
-        QMessageBox.information(self, "Success", f"Loaded {len(bookmarks)} bookmarks from {source_name}")
+        field = next(iter(changes))
+        previous_changes[field] = (previous_changes[field][0], changes[field][1])
+        previous['label'] = command['label']
+        return True
     
-    def get_selected_shortcuts(self):
-        """Convert selected bookmarks to shortcuts"""
-        selected_items = self.bookmark_list.selectedItems()
-        selected_indices = [self.bookmark_list.row(item) for item in selected_items]
-        
-        shortcuts = []
-        for idx in selected_indices:
-            bookmark = self.all_bookmarks[idx]
-            
-            # Determine category
-            if self.use_folder_as_category.isChecked() and bookmark['folder']:
-                category = bookmark['folder'].replace('/', ' > ')
+    @staticmethod
+    def set_fields(record, changes, use_new):
+        """Apply the old or new side of field changes to a record"""
+        for field, (old, new) in changes.items():
+            value = new if use_new else old
+            if value is UndoJournal.MISSING:
+                record.pop(field, None)
             else:
-                category = self.default_category.text()
-            
-            # Create keyword from name (lowercase, replace spaces with dashes)
-            name = bookmark['name'] or bookmark['url']
-            keyword = name.lower().replace(' ', '-').replace('/', '-')[:30]
-            
-            # Remove special characters
-            keyword = ''.join(c for c in keyword if c.isalnum() or c == '-')
-            
-            # Create shortcut with relative icon path
-            shortcut = {
-                'keyword': keyword,
-                'type': 'url',
-                'path': bookmark['url'],
-                'category': category,
-                'priority': self.default_priority.value(),
-                'icon': 'Images/bookmark.png'  # Keep relative path
-            }
-            shortcuts.append(shortcut)
-        
-        return shortcuts
+                record[field] = value
+    
+    def undo(self, shortcuts):
+        """Revert the last command on shortcuts, returning its label (None if nothing to undo)"""
+        if not self.undo_stack:
+            return None
+        command = self.undo_stack.pop()
+        
+        for index, _ in reversed(command['inserted']):
+            del shortcuts[index]
+        for index, record in command['removed']:
+            shortcuts.insert(index, record)
+        for index, changes in command['changed']:
+            self.set_fields(shortcuts[index], changes, use_new=False)
+        
+        self.redo_stack.append(command)
+        return command['label']
+    
+    def redo(self, shortcuts):
+        """Re-apply the last undone command, returning its label (None if nothing to redo)"""
+        if not self.redo_stack:
+            return None
+        command = self.redo_stack.pop()
+        
+        for index, changes in command['changed']:
+            self.set_fields(shortcuts[index], changes, use_new=True)
+        for index, _ in reversed(command['removed']):
+            del shortcuts[index]
+        for index, record in command['inserted']:
+            shortcuts.insert(index, record)
+        
+        self.undo_stack.append(command)
+        return command['label']
+    
+    def clear(self):
+        """Forget all history, e.g. after the catalog was reloaded"""
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.total_bytes = 0
+    
+    def undo_label(self):
+        """Label of the command undo() would revert"""
+        return self.undo_stack[-1]['label'] if self.undo_stack else None
+    
+    def redo_label(self):
+        """Label of the command redo() would re-apply"""
+        return self.redo_stack[-1]['label'] if self.redo_stack else None
+
+
+class CatalogMerge:
+    """Three-way, record-level merge of a shortcuts file changed by another program
+    
+    Records are matched by keyword (the n-th record with a keyword matches
+    the n-th one with that keyword in the other version). Starting from the
+    version last read from or written to disk (base), a record changed only
+    on disk is taken from disk, one changed only in the editor is kept, and
+    one changed differently on both sides is a conflict.
+    """
+    
+    @staticmethod
+    def keyed(shortcuts):
+        """Map (keyword, occurrence) -> index"""
+        keys = {}
+        occurrences = {}
+        for index, shortcut in enumerate(shortcuts):
+            keyword = shortcut.get('keyword', '')
+            occurrence = occurrences.get(keyword, 0)
+            occurrences[keyword] = occurrence + 1
+            keys[(keyword, occurrence)] = index
+        return keys
+    
+    @staticmethod
+    def diff(base, ours, theirs):
+        """Compare the three versions, returning (updates, conflicts)
+        
+        Both map a record key to the record on disk (None if it was deleted
+        there): updates can be applied as they are, conflicts need a decision.
+        """
+        base_keys = CatalogMerge.keyed(base)
+        our_keys = CatalogMerge.keyed(ours)
+        their_keys = CatalogMerge.keyed(theirs)
+        
+        def lookup(shortcuts, keys, key):
+            index = keys.get(key)
+            return None if index is None else shortcuts[index]
+        
+        updates = {}
+        conflicts = {}
+        for key in base_keys.keys() | their_keys.keys():
+            old = lookup(base, base_keys, key)
+            new = lookup(theirs, their_keys, key)
+            if new == old:
+                continue  # not changed on disk, whatever the editor did stands
+            mine = lookup(ours, our_keys, key)
+            if mine == new:
+                continue
+            if mine == old:
+                updates[key] = new
+            else:
+                conflicts[key] = new
+        return updates, conflicts
+    
+    @staticmethod
+    def apply(shortcuts, updates):
+        """Apply updates from diff() to shortcuts in place
+        
+        Returns (inserted, removed, changed) in the form UndoJournal.record() takes.
+        """
+        keys = CatalogMerge.keyed(shortcuts)
+        inserted_records = []
+        removed = []
+        changed = []
+        for key, new in updates.items():
+            index = keys.get(key)
+            if index is None:
+                if new is not None:
+                    inserted_records.append(dict(new))
+            elif new is None:
+                removed.append((index, shortcuts[index]))
+            else:
+                changes = UndoJournal.field_changes(shortcuts[index], new)
+                UndoJournal.set_fields(shortcuts[index], changes, use_new=True)
+                changed.append((index, changes))
+        
+        if removed:
+            removed_rows = {index for index, _ in removed}
+            shortcuts[:] = [s for index, s in enumerate(shortcuts) if index not in removed_rows]
+        inserted = [(len(shortcuts) + offset, record) for offset, record in enumerate(inserted_records)]
+        shortcuts.extend(inserted_records)
+        return inserted, removed, changed
+
+
+class BinaryCatalog:
+    """Compact copy of the catalog (shortcuts.bin) the plugin memory-maps instead of parsing JSON
+    
+    Layout, little endian and every section 8-byte aligned:
+    
+    - header: magic, format version, record count, (mtime_ns, size) of the
+      shortcuts.json it was made from, section offsets, file size, CRC32 of
+      everything after the header and CRC32 of the header itself
+    - records: one fixed-width (string offset, string length, priority) per
+      shortcut, in catalog order
+    - keyword index: record numbers in the order the plugin ranks results
+      (higher priority, then shorter keyword, first), and the offset of each
+      of those keywords in the keyword text (plus its end)
+    - keyword text: the search keys of the keywords (see search_key()) in
+      that order, each followed by a newline, so a search that scans it
+      finds the best matches first
+    - sorted keyword index: the positions in that order sorted by keyword
+      (bytewise), so the plugin can look up a keyword by binary search
+    - rank index: each record's position in ranking order, in catalog order
+      (the keyword of a record without a search)
+    - category keys: the search key of each shortcut's category, in catalog
+      order, as offsets (plus the end) into their concatenated text
+    - string table: each shortcut as compact JSON
+    
+    Must match BinaryCatalog in the plugin's main.py; the plugin's test.py
+    reads a catalog written here and compares the format constants.
+    """
+    
+    FILE_NAME = 'shortcuts.bin'
+    MAGIC = b'FLSC'
+    VERSION = 5
+    HEADER = struct.Struct('<4sHHIqqQQQQQQQQQQII')
+    RECORD = struct.Struct('<QIi')
+    INDEX_ITEM = struct.Struct('<I')
+    REPLACE_ATTEMPTS = 10
+    REPLACE_RETRY_DELAY = 0.05  # seconds
+    
+    @classmethod
+    def path_for(cls, shortcuts_file):
+        """The binary catalog that goes with shortcuts_file"""
+        return os.path.join(os.path.dirname(shortcuts_file), cls.FILE_NAME)
+    
+    @staticmethod
+    def aligned(size):
+        """Round size up to a multiple of 8"""
+        return (size + 7) & ~7
+    
+    @staticmethod
+    def search_key(text):
+        """Form of text that plugin searches compare: compatibility-decomposed, without accents
+        and case-folded"""
+        decomposed = unicodedata.normalize('NFKD', text)
+        return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+    
+    @classmethod
+    def build(cls, shortcuts, source_signature):
+        """Encode shortcuts as the binary catalog, returning its bytes"""
+        strings = bytearray()
+        records = bytearray()
+        priorities = []
+        for shortcut in shortcuts:
+            encoded = json.dumps(shortcut, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            priority = shortcut.get('priority', 50)
+            priorities.append(priority if isinstance(priority, int) else 50)
+            records += cls.RECORD.pack(len(strings), len(encoded), priorities[-1])
+            strings += encoded
+        
+        # Newlines separate keywords in the keyword text, so they can't be part of one
+        keywords = [cls.search_key(shortcut.get('keyword', '')).replace('\n', ' ').encode('utf-8')
+                    for shortcut in shortcuts]
+        order = sorted(range(len(shortcuts)),
+                       key=lambda record: (-priorities[record], len(shortcuts[record].get('keyword', ''))))
+        keyword_text = bytearray()
+        offsets = bytearray()
+        for record in order:
+            offsets += cls.INDEX_ITEM.pack(len(keyword_text))
+            keyword_text += keywords[record] + b'\n'
+        offsets += cls.INDEX_ITEM.pack(len(keyword_text))
+        if len(keyword_text) > 0xFFFFFFFF:
+            raise ValueError("Keywords too long for a binary catalog")
+        index = b''.join(cls.INDEX_ITEM.pack(record) for record in order)
+        # Entries by keyword, so finding a keyword takes a binary search instead of a scan
+        by_keyword = sorted(range(len(order)), key=lambda entry: keywords[order[entry]])
+        sorted_index = b''.join(cls.INDEX_ITEM.pack(entry) for entry in by_keyword)
+        ranks = [0] * len(order)
+        for entry, record in enumerate(order):
+            ranks[record] = entry
+        rank_index = b''.join(cls.INDEX_ITEM.pack(entry) for entry in ranks)
+        
+        category_text = bytearray()
+        category_offsets = bytearray()
+        for shortcut in shortcuts:
+            category_offsets += cls.INDEX_ITEM.pack(len(category_text))
+            category_text += cls.search_key(shortcut.get('category', 'Uncategorized')).encode('utf-8')
+        category_offsets += cls.INDEX_ITEM.pack(len(category_text))
+        if len(category_text) > 0xFFFFFFFF:
+            raise ValueError("Categories too long for a binary catalog")
+        
+        sections = [records, index, offsets, keyword_text, sorted_index, rank_index,
+                    category_offsets, category_text, strings]
+        section_offsets = []
+        body = bytearray()
+        position = cls.aligned(cls.HEADER.size)
+        for section in sections:
+            section_offsets.append(position)
+            body += section + bytes(cls.aligned(len(section)) - len(section))
+            position += cls.aligned(len(section))
+        body = bytes(cls.aligned(cls.HEADER.size) - cls.HEADER.size) + body
+        
+        mtime_ns, size = source_signature or (0, 0)
+        fields = [cls.MAGIC, cls.VERSION, cls.HEADER.size, len(shortcuts), mtime_ns, size,
+                  *section_offsets, position, zlib.crc32(body)]
+        header = cls.HEADER.pack(*fields, 0)
+        header = cls.HEADER.pack(*fields, zlib.crc32(header[:-4]))
+        return header + body
+    
+    @classmethod
+    def write(cls, shortcuts_file, shortcuts, source_signature):
+        """Write the binary catalog for shortcuts_file (temp file, then rename)"""
+        path = cls.path_for(shortcuts_file)
+        fd, temp_path = tempfile.mkstemp(prefix='.shortcuts-', suffix='.tmp', dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(cls.build(shortcuts, source_signature))
+            for attempt in range(cls.REPLACE_ATTEMPTS):
+                try:
+                    os.replace(temp_path, path)
+                    break
+                except PermissionError:
+                    # Windows can't replace the file while a plugin process has it mapped;
+                    # those only live for one query
+                    if attempt == cls.REPLACE_ATTEMPTS - 1:
+                        raise
+                    time.sleep(cls.REPLACE_RETRY_DELAY)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+    
+    @classmethod
+    def verify(cls, path):
+        """Check the header and body checksums of a binary catalog; returns its record count"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < cls.HEADER.size:
+            raise ValueError("File too short")
+        fields = cls.HEADER.unpack_from(data)
+        if fields[0] != cls.MAGIC or fields[1] != cls.VERSION:
+            raise ValueError("Not a version %d binary catalog" % cls.VERSION)
+        if zlib.crc32(data[:cls.HEADER.size - 4]) != fields[-1]:
+            raise ValueError("Header checksum mismatch")
+        if fields[-3] != len(data) or zlib.crc32(data[cls.HEADER.size:]) != fields[-2]:
+            raise ValueError("Body checksum mismatch")
+        return fields[3]
+    
+    @classmethod
+    def compile(cls, shortcuts_file):
+        """Command line: write and verify the binary catalog of shortcuts_file; returns an exit code"""
+        try:
+            shortcuts = ShortcutsEditorWindow.read_shortcuts_file(shortcuts_file)
+            cls.write(shortcuts_file, shortcuts, ShortcutsEditorWindow.file_signature(shortcuts_file))
+            count = cls.verify(cls.path_for(shortcuts_file))
+        except (OSError, ValueError) as e:
+            print(f"Failed to compile {shortcuts_file}: {e}", file=sys.stderr)
+            return 1
+        print(f"Wrote {count} shortcuts to {cls.path_for(shortcuts_file)}")
+        return 0
 
 
 class ShortcutsEditorWindow(QMainWindow):
     """Main editor window"""
     
+    BOOKMARK_SYNC_INTERVAL_MS = 10 * 60 * 1000
+    AUTOSAVE_DELAY_MS = 750
+    FILE_CHANGE_DELAY_MS = 300
+    FILE_POLL_INTERVAL_MS = 2000
+    HEALTH_CHECK_DELAY_MS = 2000
+    BOOKMARK_SYNC_STARTUP_DELAY_MS = 5000
+    TABLE_FILL_CHUNK = 500
+    
+    # Background save finished: (change generation written, error message or '',
+    # (snapshot written, file signature) or None)
+    save_finished = Signal(int, str, object)
+    # Catalog read by the worker thread on startup: (catalog or None, error message or '')
+    catalog_read = Signal(object, str)
+    # Path health scan finished: key -> entry (see PathHealth)
+    health_finished = Signal(object)
+    # Link check progress (URLs checked, total) and results: url -> entry (see LinkHealth)
+    links_progress = Signal(int, int)
+    links_finished = Signal(object)
+    
     def __init__(self):
         super().__init__()
         
@@ -505,6 +597,69 @@ class ShortcutsEditorWindow(QMainWindow):
             self.shortcuts_file = self.find_shortcuts_file()
         
         self.shortcuts = []
+        self.bookmark_sync = None  # side files of the catalog, set by the first load
+        self.path_health = None
+        self.link_health = None
+        self.thumbnails = ThumbnailCache(parent=self)
+        self.undo_journal = UndoJournal(
+            self.settings.value('undo_memory_mb', 32, type=int) * 1024 * 1024)
+        
+        # Autosave: every change bumps dirty_generation; a debounce timer
+        # coalesces them into one background write of a snapshot
+        self.dirty_generation = 0
+        self.saved_generation = 0
+        self.save_future = None
+        self.save_executor = ThreadPoolExecutor(max_workers=1)
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setSingleShot(True)
+        self.autosave_timer.setInterval(self.AUTOSAVE_DELAY_MS)
+        self.autosave_timer.timeout.connect(self.autosave)
+        self.save_finished.connect(self.on_save_finished)
+        
+        # Path health: incremental background scans, debounced after edits
+        self.health_future = None
+        self.health_executor = ThreadPoolExecutor(max_workers=1)
+        self.health_timer = QTimer(self)
+        self.health_timer.setSingleShot(True)
+        self.health_timer.setInterval(self.HEALTH_CHECK_DELAY_MS)
+        self.health_timer.timeout.connect(self.check_paths)
+        self.health_finished.connect(self.on_health_finished)
+        
+        # Link check: runs on demand, can be stopped
+        self.links_future = None
+        self.links_stop = threading.Event()
+        self.links_executor = ThreadPoolExecutor(max_workers=1)
+        self.links_progress.connect(self.on_links_progress)
+        self.links_finished.connect(self.on_links_finished)
+        
+        # External changes: the version last read from or written to disk is
+        # the base for merging edits other programs (e.g. the plugin) make
+        self.disk_file = None
+        self.disk_shortcuts = []
+        self.disk_signature = None
+        self.file_read_retries = 0
+        self.file_watcher = QFileSystemWatcher(self)
+        self.file_watcher.fileChanged.connect(lambda path: self.file_change_timer.start())
+        self.file_change_timer = QTimer(self)
+        self.file_change_timer.setSingleShot(True)
+        self.file_change_timer.setInterval(self.FILE_CHANGE_DELAY_MS)
+        self.file_change_timer.timeout.connect(self.check_external_change)
+        # Fallback for files the watcher can't watch (e.g. some network drives)
+        self.file_poll_timer = QTimer(self)
+        self.file_poll_timer.setInterval(self.FILE_POLL_INTERVAL_MS)
+        self.file_poll_timer.timeout.connect(self.check_external_change)
+        
+        # Large catalogs fill the table a chunk at a time from the event loop
+        self.table_fill_row = 0
+        self.table_fill_timer = QTimer(self)
+        self.table_fill_timer.setSingleShot(True)
+        self.table_fill_timer.setInterval(0)
+        self.table_fill_timer.timeout.connect(self.fill_table_chunk)
+        
+        self.loading = False
+        self.pending_focus = ''
+        self.first_paint_done = False
+        self.catalog_read.connect(self.on_catalog_read)
         
         self.setWindowTitle("Flow Launcher Shortcuts Editor")
         self.setMinimumSize(900, 600)
@@ -512,7 +667,13 @@ class ShortcutsEditorWindow(QMainWindow):
         self.restore_geometry()
         self.setup_menu()
         self.setup_ui()
-        self.load_shortcuts()
+        self.load_shortcuts_in_background()
+        
+        # Periodically pick up bookmarks changed in synced browsers
+        self.sync_timer = QTimer(self)
+        self.sync_timer.setInterval(self.BOOKMARK_SYNC_INTERVAL_MS)
+        self.sync_timer.timeout.connect(lambda: self.sync_bookmarks(show_message=False))
+        self.sync_timer.start()
     
     def setup_menu(self):
         """Setup menu bar"""
@@ -525,12 +686,58 @@ class ShortcutsEditorWindow(QMainWindow):
         change_location_action.triggered.connect(self.change_save_location)
         file_menu.addAction(change_location_action)
         
+        self.autosave_action = QAction("Autosave in Background", self)
+        self.autosave_action.setCheckable(True)
+        self.autosave_action.setChecked(self.settings.value('autosave', True, type=bool))
+        self.autosave_action.toggled.connect(self.on_autosave_toggled)
+        file_menu.addAction(self.autosave_action)
+        
+        self.binary_catalog_action = QAction("Write Binary Catalog (shortcuts.bin)", self)
+        self.binary_catalog_action.setCheckable(True)
+        self.binary_catalog_action.setChecked(self.settings.value('binary_catalog', False, type=bool))
+        self.binary_catalog_action.toggled.connect(self.on_binary_catalog_toggled)
+        file_menu.addAction(self.binary_catalog_action)
+        
+        sync_action = QAction("Sync Bookmarks Now", self)
+        sync_action.triggered.connect(lambda: self.sync_bookmarks())
+        file_menu.addAction(sync_action)
+        
         file_menu.addSeparator()
         
         exit_action = QAction("E&xit", self)
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
         
+        # Edit menu
+        edit_menu = menubar.addMenu("&Edit")
+        
+        self.undo_action = QAction("&Undo", self)
+        self.undo_action.setShortcut(QKeySequence.StandardKey.Undo)
+        self.undo_action.triggered.connect(self.undo)
+        edit_menu.addAction(self.undo_action)
+        
+        self.redo_action = QAction("&Redo", self)
+        self.redo_action.setShortcut(QKeySequence.StandardKey.Redo)
+        self.redo_action.triggered.connect(self.redo)
+        edit_menu.addAction(self.redo_action)
+        
+        # Tools menu
+        tools_menu = menubar.addMenu("&Tools")
+        
+        check_paths_action = QAction("Check Paths Now", self)
+        check_paths_action.triggered.connect(lambda: self.check_paths(force=True))
+        tools_menu.addAction(check_paths_action)
+        
+        check_links_action = QAction("Check Links Now", self)
+        check_links_action.triggered.connect(self.check_links)
+        tools_menu.addAction(check_links_action)
+        
+        tools_menu.addSeparator()
+        
+        normalize_icons_action = QAction("Normalize Icons Now", self)
+        normalize_icons_action.triggered.connect(self.normalize_icons)
+        tools_menu.addAction(normalize_icons_action)
+        
         # Help menu
         help_menu = menubar.addMenu("&Help")
         
@@ -576,20 +783,28 @@ class ShortcutsEditorWindow(QMainWindow):
         
         # Table
         self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels(['Keyword', 'Type', 'Path/URL', 'Category', 'Priority', 'Icon'])
+        self.table.setColumnCount(7)
+        self.table.setHorizontalHeaderLabels(['', 'Keyword', 'Type', 'Path/URL', 'Category', 'Priority', 'Icon'])
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
         self.table.horizontalHeader().setStretchLastSection(False)
-        self.table.setColumnWidth(0, 120)
-        self.table.setColumnWidth(1, 80)
-        self.table.setColumnWidth(2, 300)
-        self.table.setColumnWidth(3, 120)
-        self.table.setColumnWidth(4, 80)
-        self.table.setColumnWidth(5, 100)
+        self.table.setColumnWidth(0, 32)
+        self.table.setColumnWidth(1, 120)
+        self.table.setColumnWidth(2, 80)
+        self.table.setColumnWidth(3, 300)
+        self.table.setColumnWidth(4, 120)
+        self.table.setColumnWidth(5, 80)
+        self.table.setColumnWidth(6, 100)
+        self.table.setIconSize(QSize(20, 20))
         self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QTableWidget.SelectionMode.ExtendedSelection)
         self.table.doubleClicked.connect(self.edit_shortcut)
         layout.addWidget(self.table)
         
+        # Icon thumbnails are requested only for rows scrolled into view
+        self.pending_icon_rows = {}  # icon path -> rows waiting for its thumbnail
+        self.table.verticalScrollBar().valueChanged.connect(self.load_visible_icons)
+        self.thumbnails.thumbnailReady.connect(self.on_thumbnail_ready)
+        
         # Buttons
         button_layout = QHBoxLayout()
         
@@ -602,6 +817,10 @@ class ShortcutsEditorWindow(QMainWindow):
         self.delete_btn = QPushButton("Delete")
         self.delete_btn.clicked.connect(self.delete_shortcut)
         
+        self.bulk_edit_btn = QPushButton("Bulk Edit...")
+        self.bulk_edit_btn.setToolTip("Change category, priority, type or paths of all selected shortcuts")
+        self.bulk_edit_btn.clicked.connect(self.bulk_edit)
+        
         self.import_btn = QPushButton("Import Bookmarks...")
         self.import_btn.clicked.connect(self.import_bookmarks)
         
@@ -611,6 +830,7 @@ class ShortcutsEditorWindow(QMainWindow):
         button_layout.addWidget(self.add_btn)
         button_layout.addWidget(self.edit_btn)
         button_layout.addWidget(self.delete_btn)
+        button_layout.addWidget(self.bulk_edit_btn)
         button_layout.addWidget(self.import_btn)
         button_layout.addStretch()
         button_layout.addWidget(self.refresh_btn)
@@ -622,55 +842,474 @@ class ShortcutsEditorWindow(QMainWindow):
         self.status_label.setStyleSheet("padding: 10px;")
         layout.addWidget(self.status_label)
         
+        self.save_status_label = QLabel()
+        self.statusBar().addPermanentWidget(self.save_status_label)
+        
         central_widget.setLayout(layout)
     
     def load_shortcuts(self):
         """Load shortcuts from JSON file"""
+        self.begin_load()
         try:
-            if os.path.exists(self.shortcuts_file):
-                with open(self.shortcuts_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.shortcuts = data.get('shortcuts', [])
-            else:
-                self.shortcuts = []
-                # Create empty file
-                self.save_shortcuts()
-            
-            self.update_table()
-            self.status_label.setText(f"Loaded {len(self.shortcuts)} shortcuts")
+            self.finish_load(self.read_catalog(self.shortcuts_file))
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load shortcuts:\n{e}")
     
+    def load_shortcuts_in_background(self):
+        """First load: read the catalog on the save worker while the window paints"""
+        self.begin_load()
+        self.set_loading(True)
+        self.save_executor.submit(self.read_catalog_in_worker, self.shortcuts_file)
+    
+    def read_catalog_in_worker(self, shortcuts_file):
+        """Worker thread: read the catalog and hand it to the GUI thread"""
+        try:
+            self.catalog_read.emit(self.read_catalog(shortcuts_file), '')
+        except Exception as e:
+            self.catalog_read.emit(None, str(e) or e.__class__.__name__)
+    
+    def on_catalog_read(self, catalog, error):
+        """Show the catalog read by load_shortcuts_in_background()"""
+        StartupTiming.mark('catalog read')
+        self.set_loading(False)
+        if error:
+            if self.path_health is None:
+                # Rows, checks and syncs of shortcuts added from here on still need the side files
+                self.install_side_files(self.read_side_files(self.shortcuts_file))
+            self.status_label.setText("Failed to load shortcuts")
+            QMessageBox.critical(self, "Error", f"Failed to load shortcuts:\n{error}")
+            return
+        self.finish_load(catalog)
+        
+        # Browser bookmark files can be large; leave them until the editor is up
+        QTimer.singleShot(self.BOOKMARK_SYNC_STARTUP_DELAY_MS, lambda: self.sync_bookmarks(show_message=False))
+    
+    @staticmethod
+    def read_side_files(shortcuts_file):
+        """Bookmark sync state and path/link check results kept next to the shortcuts file"""
+        from catalog_state import BookmarkSync, PathHealth, LinkHealth
+        return {
+            'bookmark_sync': BookmarkSync(shortcuts_file),
+            'path_health': PathHealth(shortcuts_file),
+            'link_health': LinkHealth(shortcuts_file)
+        }
+    
+    @staticmethod
+    def read_catalog(shortcuts_file):
+        """Read the shortcuts file and its side files; safe to call from a worker thread"""
+        catalog = {
+            'file': shortcuts_file,
+            'signature': ShortcutsEditorWindow.file_signature(shortcuts_file),
+            'shortcuts': [],
+            **ShortcutsEditorWindow.read_side_files(shortcuts_file)
+        }
+        if catalog['signature'] is not None:
+            catalog['shortcuts'] = ShortcutsEditorWindow.read_shortcuts_file(shortcuts_file)
+        return catalog
+    
+    def begin_load(self):
+        """Save pending changes and forget state tied to the catalog about to be replaced"""
+        self.flush_autosave()
+        
+        # History refers to records by index, so it can't survive a reload
+        self.undo_journal.clear()
+        self.update_undo_actions()
+        
+        # No merging of external changes until there is a base to merge against
+        self.disk_file = None
+        self.disk_shortcuts = []
+        self.disk_signature = None
+        self.watch_file()
+    
+    def finish_load(self, catalog):
+        """Install a catalog returned by read_catalog()"""
+        self.install_side_files(catalog)
+        self.shortcuts = catalog['shortcuts']
+        self.disk_file = catalog['file']
+        self.disk_signature = catalog['signature']
+        self.disk_shortcuts = UndoJournal.snapshot(self.shortcuts)
+        if self.disk_signature is None:
+            # Create empty file
+            self.save_shortcuts()
+        
+        self.update_table()
+        self.status_label.setText(f"Loaded {len(self.shortcuts)} shortcuts")
+        self.health_timer.start()
+        if self.pending_focus:
+            self.focus_shortcut(self.pending_focus)
+            self.pending_focus = ''
+    
+    def install_side_files(self, side_files):
+        """Use the objects returned by read_side_files()"""
+        self.bookmark_sync = side_files['bookmark_sync']
+        self.path_health = side_files['path_health']
+        self.link_health = side_files['link_health']
+    
+    def set_loading(self, loading):
+        """Lock the UI while the catalog is read in the background"""
+        self.loading = loading
+        self.menuBar().setEnabled(not loading)
+        self.centralWidget().setEnabled(not loading)
+        if loading:
+            self.status_label.setText("Loading shortcuts...")
+    
+    def paintEvent(self, event):
+        """Note the first paint for the startup timing report"""
+        super().paintEvent(event)
+        if not self.first_paint_done:
+            self.first_paint_done = True
+            StartupTiming.mark('first paint')
+    
     def save_shortcuts(self):
         """Save shortcuts to JSON file"""
         try:
             # Ensure directory exists
             os.makedirs(os.path.dirname(self.shortcuts_file), exist_ok=True)
             
-            with open(self.shortcuts_file, 'w', encoding='utf-8') as f:
-                json.dump({'shortcuts': self.shortcuts}, f, indent=2, ensure_ascii=False)
+            # Don't overwrite what another program just changed
+            self.check_external_change(write_back=False)
+            
+            snapshot = UndoJournal.snapshot(self.shortcuts)
+            signature, warning = self.write_shortcuts_file(
+                self.shortcuts_file, snapshot, self.binary_catalog_action.isChecked())
+            self.disk_file = self.shortcuts_file
+            self.disk_shortcuts, self.disk_signature = snapshot, signature
+            self.watch_file()
             
+            self.autosave_timer.stop()
+            self.saved_generation = self.dirty_generation
+            self.update_save_status()
             self.status_label.setText(f"Saved {len(self.shortcuts)} shortcuts")
+            if warning:
+                self.statusBar().showMessage(warning, 10000)
             return True
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save shortcuts:\n{e}")
             return False
     
+    @staticmethod
+    def read_shortcuts_file(shortcuts_file):
+        """Read the list of shortcuts from a shortcuts file"""
+        with open(shortcuts_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or not isinstance(data.get('shortcuts', []), list):
+            raise ValueError("Not a shortcuts file")
+        return data.get('shortcuts', [])
+    
+    @staticmethod
+    def file_signature(path):
+        """(mtime, size) of a file, or None if it doesn't exist"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    @staticmethod
+    def write_shortcuts_file(shortcuts_file, shortcuts, binary=False):
+        """Write the catalog to a temp file next to shortcuts_file, then rename it over the original
+        
+        With binary, also writes the matching binary catalog (shortcuts.bin).
+        Returns the file signature of the written file and a warning, empty unless
+        the binary catalog could not be written.
+        """
+        directory = os.path.dirname(shortcuts_file)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix='.shortcuts-', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'shortcuts': shortcuts}, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, shortcuts_file)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        
+        signature = ShortcutsEditorWindow.file_signature(shortcuts_file)
+        warning = ''
+        if binary:
+            try:
+                BinaryCatalog.write(shortcuts_file, shortcuts, signature)
+            except (OSError, ValueError) as e:
+                # The plugin ignores a binary catalog that doesn't match shortcuts.json
+                warning = f"Failed to write binary catalog: {e}"
+        return signature, warning
+    
+    def shortcuts_changed(self):
+        """Persist a change: queue a background save in autosave mode, otherwise save now"""
+        self.update_undo_actions()
+        if not self.autosave_action.isChecked():
+            self.health_timer.start()
+            return self.save_shortcuts()
+        
+        self.health_timer.start()
+        self.dirty_generation += 1
+        self.autosave_timer.start()  # restarting the timer coalesces rapid changes
+        self.update_save_status()
+        return True
+    
+    def autosave(self):
+        """Hand a snapshot of the catalog to the save worker"""
+        if self.saved_generation >= self.dirty_generation:
+            return
+        if self.save_future is not None and not self.save_future.done():
+            # One write at a time; try again once the current one finishes
+            self.autosave_timer.start()
+            return
+        
+        # Don't overwrite what another program just changed
+        self.check_external_change(write_back=False)
+        
+        snapshot = UndoJournal.snapshot(self.shortcuts)
+        self.save_future = self.save_executor.submit(
+            self.write_snapshot, self.shortcuts_file, snapshot, self.dirty_generation,
+            self.binary_catalog_action.isChecked())
+        self.update_save_status()
+    
+    def write_snapshot(self, shortcuts_file, snapshot, generation, binary=False):
+        """Worker thread: write a snapshot and report back to the GUI thread"""
+        try:
+            written = (snapshot, *self.write_shortcuts_file(shortcuts_file, snapshot, binary))
+            error = ''
+        except Exception as e:
+            written = None
+            error = str(e) or e.__class__.__name__
+        self.save_finished.emit(generation, error, written)
+    
+    def on_save_finished(self, generation, error, written):
+        """Record the outcome of a background save"""
+        if error:
+            self.statusBar().showMessage(f"Autosave failed: {error}", 10000)
+        else:
+            self.saved_generation = max(self.saved_generation, generation)
+            snapshot, signature, warning = written
+            if self.disk_file == self.shortcuts_file:
+                self.disk_shortcuts, self.disk_signature = snapshot, signature
+            self.watch_file()  # replacing the file drops it from the watcher
+            if warning:
+                self.statusBar().showMessage(warning, 10000)
+        self.update_save_status()
+    
+    def update_save_status(self):
+        """Show the save state in the status bar"""
+        if self.save_future is not None and not self.save_future.done():
+            self.save_status_label.setText("Saving...")
+        elif self.saved_generation < self.dirty_generation:
+            self.save_status_label.setText("Unsaved changes")
+        else:
+            self.save_status_label.setText("All changes saved")
+    
+    def flush_autosave(self):
+        """Finish any queued or running background save, e.g. before reloading or closing"""
+        self.autosave_timer.stop()
+        if self.save_future is not None:
+            self.save_future.result()
+            QApplication.processEvents()  # deliver save_finished
+        if self.saved_generation < self.dirty_generation:
+            self.save_shortcuts()
+    
+    def on_autosave_toggled(self, checked):
+        """Remember the autosave setting; turning it off saves pending changes now"""
+        self.settings.setValue('autosave', checked)
+        if not checked:
+            self.flush_autosave()
+    
+    def on_binary_catalog_toggled(self, checked):
+        """Remember the binary catalog setting; write or remove shortcuts.bin right away"""
+        self.settings.setValue('binary_catalog', checked)
+        if checked:
+            self.flush_autosave()
+            self.save_shortcuts()
+        else:
+            try:
+                os.remove(BinaryCatalog.path_for(self.shortcuts_file))
+            except OSError:
+                pass
+    
+    def watch_file(self):
+        """(Re)watch the shortcuts file, polling it where that isn't possible"""
+        watched = self.file_watcher.files()
+        others = [path for path in watched if path != self.shortcuts_file]
+        if others:
+            self.file_watcher.removePaths(others)
+        if self.shortcuts_file in watched or self.file_watcher.addPath(self.shortcuts_file):
+            self.file_poll_timer.stop()
+        elif not self.file_poll_timer.isActive():
+            self.file_poll_timer.start()
+    
+    def check_external_change(self, write_back=True):
+        """Merge changes another program made to the shortcuts file into the catalog
+        
+        Only records changed on disk are touched; the user is asked only about
+        records that were also changed, differently, in the editor. With
+        write_back, edits the file doesn't have yet are saved afterwards.
+        """
+        if self.disk_file != self.shortcuts_file:
+            return  # the base belongs to another file, e.g. while changing location
+        if self.save_future is not None and not self.save_future.done():
+            self.file_change_timer.start()  # our own write; look again once it's done
+            return
+        
+        self.watch_file()
+        signature = self.file_signature(self.shortcuts_file)
+        if signature is None or signature == self.disk_signature:
+            return
+        
+        try:
+            theirs = self.read_shortcuts_file(self.shortcuts_file)
+        except (OSError, ValueError) as e:
+            # Probably caught in the middle of a write; give it a moment
+            self.file_read_retries += 1
+            if self.file_read_retries <= 5:
+                self.file_change_timer.start()
+            else:
+                self.file_read_retries = 0
+                self.disk_signature = signature
+                self.statusBar().showMessage(f"Ignored unreadable change to shortcuts file: {e}", 10000)
+            return
+        self.file_read_retries = 0
+        self.disk_signature = signature
+        if theirs == self.disk_shortcuts:
+            return
+        
+        updates, conflicts = CatalogMerge.diff(self.disk_shortcuts, self.shortcuts, theirs)
+        self.disk_shortcuts = theirs
+        if conflicts and self.use_file_versions(conflicts):
+            updates.update(conflicts)
+        
+        inserted, removed, changed = CatalogMerge.apply(self.shortcuts, updates)
+        if self.undo_journal.record("External Change", inserted=inserted, removed=removed,
+                                    changed=changed, mergeable=False):
+            self.update_table()
+            self.status_label.setText(
+                f"Merged changes from disk: {len(inserted)} added, {len(removed)} removed, {len(changed)} updated")
+        
+        if write_back and self.shortcuts != theirs:
+            self.shortcuts_changed()
+        else:
+            self.update_undo_actions()
+    
+    def use_file_versions(self, conflicts):
+        """Ask whether conflicting records should be taken from the file"""
+        keywords = sorted(keyword for keyword, _ in conflicts)
+        listed = ', '.join(f"'{keyword}'" for keyword in keywords[:10])
+        if len(keywords) > 10:
+            listed += f" and {len(keywords) - 10} more"
+        reply = QMessageBox.question(
+            self,
+            "Shortcuts Changed on Disk",
+            f"{len(keywords)} shortcut(s) were changed both here and by another program: {listed}.\n\n"
+            "Use the versions from the file? Choose No to keep your changes.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        return reply == QMessageBox.StandardButton.Yes
+    
     def update_table(self):
-        """Update table with current shortcuts"""
+        """Update table with current shortcuts
+        
+        Only the first TABLE_FILL_CHUNK rows are filled right away; the rest
+        follow in chunks from the event loop, so a large catalog doesn't
+        freeze the window.
+        """
         self.table.setRowCount(len(self.shortcuts))
+        self.pending_icon_rows = {}
+        self.table_fill_row = 0
+        self.fill_table_chunk()
         
-        for row, shortcut in enumerate(self.shortcuts):
-            self.table.setItem(row, 0, QTableWidgetItem(shortcut.get('keyword', '')))
-            self.table.setItem(row, 1, QTableWidgetItem(shortcut.get('type', '')))
-            self.table.setItem(row, 2, QTableWidgetItem(shortcut.get('path', '')))
-            self.table.setItem(row, 3, QTableWidgetItem(shortcut.get('category', '')))
-            self.table.setItem(row, 4, QTableWidgetItem(str(shortcut.get('priority', 100))))
-            self.table.setItem(row, 5, QTableWidgetItem(shortcut.get('icon', '')))
+        # Wait for the new rows to be laid out before asking which are visible
+        QTimer.singleShot(0, self.load_visible_icons)
+    
+    def fill_table_chunk(self):
+        """Fill the next chunk of rows, scheduling the one after it"""
+        start = self.table_fill_row
+        end = min(start + self.TABLE_FILL_CHUNK, len(self.shortcuts))
+        for row in range(start, end):
+            self.set_table_row(row, self.shortcuts[row])
+        self.table_fill_row = end
+        
+        if end < len(self.shortcuts):
+            self.table_fill_timer.start()
+        else:
+            StartupTiming.mark('table filled')
+    
+    def update_table_rows(self, rows):
+        """Refresh only the given rows, e.g. after a bulk edit"""
+        for row in rows:
+            self.set_table_row(row, self.shortcuts[row])
+        QTimer.singleShot(0, self.load_visible_icons)
+    
+    def set_table_row(self, row, shortcut):
+        """Fill one table row from a shortcut"""
+        self.table.setItem(row, 0, QTableWidgetItem())
+        self.table.setItem(row, 1, QTableWidgetItem(shortcut.get('keyword', '')))
+        self.table.setItem(row, 2, QTableWidgetItem(shortcut.get('type', '')))
+        self.table.setItem(row, 3, QTableWidgetItem(shortcut.get('path', '')))
+        self.table.setItem(row, 4, QTableWidgetItem(shortcut.get('category', '')))
+        self.table.setItem(row, 5, QTableWidgetItem(str(shortcut.get('priority', 100))))
+        self.table.setItem(row, 6, QTableWidgetItem(shortcut.get('iconSource') or shortcut.get('icon', '')))
+        
+        problem = self.path_health.problem(shortcut) or self.link_health.problem(shortcut)
+        if shortcut.get('stale'):
+            for column in range(self.table.columnCount()):
+                item = self.table.item(row, column)
+                item.setForeground(Qt.GlobalColor.gray)
+                item.setToolTip("Deleted in the browser since it was imported")
+        elif problem:
+            for column in range(self.table.columnCount()):
+                item = self.table.item(row, column)
+                item.setForeground(Qt.GlobalColor.red)
+                item.setToolTip(f"Broken shortcut: {problem}")
+    
+    def selected_rows(self):
+        """Indices of the selected rows, in ascending order"""
+        return sorted(index.row() for index in self.table.selectionModel().selectedRows())
+    
+    def icon_file(self, shortcut):
+        """Absolute path of the image shown for a shortcut"""
+        base_dir = os.path.dirname(self.shortcuts_file)
+        for icon in (shortcut.get('icon'), shortcut.get('iconSource')):
+            icon = ThumbnailCache.resolve(icon, base_dir)
+            if icon and os.path.exists(icon):
+                return icon
+        return ThumbnailCache.resolve('Images/shortcut.png', base_dir)
+    
+    def load_visible_icons(self):
+        """Fill in icon thumbnails for the rows currently scrolled into view"""
+        first = self.table.rowAt(0)
+        if first < 0:
+            return
+        last = self.table.rowAt(self.table.viewport().height() - 1)
+        if last < 0:
+            last = self.table.rowCount() - 1
+        
+        for row in range(first, min(last, len(self.shortcuts) - 1) + 1):
+            item = self.table.item(row, 0)
+            if item is None or not item.icon().isNull():
+                continue
+            path = self.icon_file(self.shortcuts[row])
+            pixmap = self.thumbnails.get(path)
+            if pixmap:
+                item.setIcon(QIcon(pixmap))
+            else:
+                self.pending_icon_rows.setdefault(path, set()).add(row)
+    
+    def on_thumbnail_ready(self, path):
+        """Set a finished thumbnail on the rows that were waiting for it"""
+        rows = self.pending_icon_rows.pop(path, ())
+        pixmap = self.thumbnails.get(path)
+        if not pixmap:
+            return
+        for row in rows:
+            item = self.table.item(row, 0)
+            if item is not None:
+                item.setIcon(QIcon(pixmap))
     
     def add_shortcut(self):
         """Add a new shortcut"""
-        dialog = ShortcutDialog(self)
+        from dialogs import ShortcutDialog
+        dialog = ShortcutDialog(self, thumbnails=self.thumbnails, base_dir=os.path.dirname(self.shortcuts_file))
         if dialog.exec() == QDialog.DialogCode.Accepted:
             shortcut = dialog.get_shortcut()
             
@@ -684,18 +1323,26 @@ class ShortcutsEditorWindow(QMainWindow):
                 return
             
             self.shortcuts.append(shortcut)
-            if self.save_shortcuts():
+            self.undo_journal.record(f"Add '{shortcut['keyword']}'",
+                                     inserted=[(len(self.shortcuts) - 1, shortcut)])
+            if self.shortcuts_changed():
                 self.update_table()
     
     def edit_shortcut(self):
-        """Edit selected shortcut"""
+        """Edit selected shortcut (several selected rows open the bulk editor)"""
+        from dialogs import ShortcutDialog
+        if len(self.selected_rows()) > 1:
+            self.bulk_edit()
+            return
+        
         row = self.table.currentRow()
         if row < 0:
             QMessageBox.information(self, "Info", "Please select a shortcut to edit")
             return
         
         shortcut = self.shortcuts[row]
-        dialog = ShortcutDialog(self, shortcut)
+        dialog = ShortcutDialog(self, shortcut, thumbnails=self.thumbnails,
+                                base_dir=os.path.dirname(self.shortcuts_file))
         
         if dialog.exec() == QDialog.DialogCode.Accepted:
             updated = dialog.get_shortcut()
@@ -709,68 +1356,251 @@ class ShortcutsEditorWindow(QMainWindow):
                 QMessageBox.warning(self, "Warning", f"Keyword '{updated['keyword']}' already exists")
                 return
             
+            changes = UndoJournal.field_changes(self.shortcuts[row], updated)
             self.shortcuts[row] = updated
-            if self.save_shortcuts():
+            self.undo_journal.record(f"Edit '{updated['keyword']}'", changed=[(row, changes)])
+            if self.shortcuts_changed():
                 self.update_table()
     
     def delete_shortcut(self):
-        """Delete selected shortcut"""
-        row = self.table.currentRow()
-        if row < 0:
+        """Delete selected shortcuts"""
+        rows = self.selected_rows()
+        if not rows and self.table.currentRow() >= 0:
+            rows = [self.table.currentRow()]
+        if not rows:
             QMessageBox.information(self, "Info", "Please select a shortcut to delete")
             return
         
-        keyword = self.shortcuts[row].get('keyword', '')
-        reply = QMessageBox.question(self, "Confirm Delete",
-                                     f"Delete shortcut '{keyword}'?",
+        if len(rows) == 1:
+            label = f"'{self.shortcuts[rows[0]].get('keyword', '')}'"
+            question = f"Delete shortcut {label}?"
+        else:
+            label = f"{len(rows)} shortcuts"
+            question = f"Delete {len(rows)} selected shortcuts?"
+        reply = QMessageBox.question(self, "Confirm Delete", question,
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.shortcuts.pop(row)
-            if self.save_shortcuts():
+            # One pass over the catalog instead of a pop() per row
+            selected = set(rows)
+            removed = [(row, self.shortcuts[row]) for row in rows]
+            self.shortcuts[:] = [s for i, s in enumerate(self.shortcuts) if i not in selected]
+            self.undo_journal.record(f"Delete {label}", removed=removed)
+            if self.shortcuts_changed():
                 self.update_table()
     
+    def bulk_edit(self):
+        """Change category, priority, type or paths of all selected shortcuts at once"""
+        from dialogs import BulkEditDialog
+        rows = self.selected_rows()
+        if not rows:
+            QMessageBox.information(self, "Info", "Please select the shortcuts to edit")
+            return
+        
+        categories = {s.get('category', '') for s in self.shortcuts} - {''}
+        dialog = BulkEditDialog(self, len(rows), categories)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        
+        updates = dialog.get_updates()
+        replacement = dialog.get_path_replacement()
+        if not updates and not replacement:
+            return
+        
+        # Apply everything as one batch: one undo step, one table update, one save
+        changed = []
+        for row in rows:
+            shortcut = self.shortcuts[row]
+            updated = dict(shortcut, **updates)
+            if replacement:
+                pattern, replace_with = replacement
+                updated['path'] = pattern.sub(replace_with, shortcut.get('path', ''))
+            if updates.get('type', 'file') != 'file':
+                updated.pop('openWith', None)
+            
+            changes = UndoJournal.field_changes(shortcut, updated)
+            if changes:
+                UndoJournal.set_fields(shortcut, changes, use_new=True)
+                changed.append((row, changes))
+        
+        if not changed:
+            self.status_label.setText("Bulk edit: nothing to change")
+            return
+        
+        self.undo_journal.record(f"Bulk edit {len(changed)} shortcuts", changed=changed)
+        if self.shortcuts_changed():
+            self.update_table_rows(row for row, _ in changed)
+            self.status_label.setText(f"Updated {len(changed)} of {len(rows)} selected shortcuts")
+    
     def import_bookmarks(self):
         """Import bookmarks from browsers"""
+        from dialogs import BookmarkImportDialog
+        from helpers import BookmarkImporter
         dialog = BookmarkImportDialog(self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            imported_shortcuts = dialog.get_selected_shortcuts()
+            imported_shortcuts = dialog.get_selected_shortcuts(
+                (s.get('keyword', '') for s in self.shortcuts),
+                plugin_dir=os.path.dirname(self.shortcuts_file))
             
             if not imported_shortcuts:
                 QMessageBox.information(self, "No Selection", "No bookmarks were selected for import.")
                 return
             
-            # Check for duplicate keywords
-            existing_keywords = {s.get('keyword') for s in self.shortcuts}
-            duplicates = []
-            added_count = 0
+            if dialog.keep_in_sync.isChecked():
+                for name, bookmark_file in dialog.loaded_files.items():
+                    try:
+                        self.bookmark_sync.add_source(
+                            name, bookmark_file,
+                            category=dialog.default_category.text(),
+                            use_folder_as_category=dialog.use_folder_as_category.isChecked(),
+                            priority=dialog.default_priority.value())
+                    except (OSError, ValueError) as e:
+                        QMessageBox.warning(self, "Sync", f"Could not keep {name} in sync:\n{e}")
             
-            for shortcut in imported_shortcuts:
-                keyword = shortcut['keyword']
-                
-                # Handle duplicates by appending a number
-                original_keyword = keyword
-                counter = 1
-                while keyword in existing_keywords:
-                    keyword = f"{original_keyword}-{counter}"
-                    counter += 1
-                    if counter > 1 and keyword != original_keyword:
-                        duplicates.append(original_keyword)
-                
-                shortcut['keyword'] = keyword
-                self.shortcuts.append(shortcut)
-                existing_keywords.add(keyword)
-                added_count += 1
+            # Skip duplicate URLs and rename duplicate keywords
+            first_new = len(self.shortcuts)
+            added_count, renamed_count, skipped_count = BookmarkImporter.merge_shortcuts(
+                self.shortcuts, imported_shortcuts)
+            self.undo_journal.record(
+                f"Import {added_count} bookmark(s)",
+                inserted=[(index, self.shortcuts[index]) for index in range(first_new, len(self.shortcuts))])
             
-            if self.save_shortcuts():
+            if not added_count:
+                QMessageBox.information(self, "Nothing to Import",
+                                        f"All {skipped_count} selected bookmark(s) are already in your shortcuts.")
+                return
+            
+            if self.shortcuts_changed():
                 self.update_table()
                 
                 msg = f"Successfully imported {added_count} bookmark(s)!"
-                if duplicates:
-                    msg += f"\n\nNote: {len(duplicates)} keyword(s) were renamed to avoid duplicates."
+                if renamed_count:
+                    msg += f"\n\nNote: {renamed_count} keyword(s) were renamed to avoid duplicates."
+                if skipped_count:
+                    msg += f"\n\n{skipped_count} bookmark(s) were skipped because their URL already exists."
                 
                 QMessageBox.information(self, "Import Complete", msg)
     
+    def undo(self):
+        """Undo the last change to the catalog"""
+        label = self.undo_journal.undo(self.shortcuts)
+        if label and self.shortcuts_changed():
+            self.update_table()
+            self.status_label.setText(f"Undid: {label}")
+        self.update_undo_actions()
+    
+    def redo(self):
+        """Redo the last undone change"""
+        label = self.undo_journal.redo(self.shortcuts)
+        if label and self.shortcuts_changed():
+            self.update_table()
+            self.status_label.setText(f"Redid: {label}")
+        self.update_undo_actions()
+    
+    def update_undo_actions(self):
+        """Enable and label the Undo/Redo menu actions"""
+        undo_label = self.undo_journal.undo_label()
+        redo_label = self.undo_journal.redo_label()
+        self.undo_action.setEnabled(undo_label is not None)
+        self.undo_action.setText(f"&Undo {undo_label}" if undo_label else "&Undo")
+        self.redo_action.setEnabled(redo_label is not None)
+        self.redo_action.setText(f"&Redo {redo_label}" if redo_label else "&Redo")
+    
+    def check_paths(self, force=False):
+        """Probe folder/file/app paths that changed or whose cached status expired"""
+        from catalog_state import PathHealth
+        if self.health_future is not None and not self.health_future.done():
+            self.health_timer.start()  # one scan at a time; rescan after this one
+            return
+        pending = self.path_health.pending(self.shortcuts, force=force)
+        if not pending:
+            return
+        self.health_future = self.health_executor.submit(
+            lambda: self.health_finished.emit(PathHealth.scan(pending)))
+    
+    def on_health_finished(self, results):
+        """Store scan results and refresh the rows they affect"""
+        self.path_health.update(results, self.shortcuts)
+        rows = [row for row, shortcut in enumerate(self.shortcuts) if shortcut.get('path', '') in results]
+        self.update_table_rows(rows)
+        broken = sum(1 for shortcut in self.shortcuts if self.path_health.problem(shortcut))
+        if broken:
+            self.statusBar().showMessage(f"{broken} shortcut(s) point to missing or unreachable paths", 10000)
+    
+    def check_links(self):
+        """Check url shortcuts that weren't checked recently, in the background"""
+        from catalog_state import LinkHealth
+        if self.links_future is not None and not self.links_future.done():
+            self.statusBar().showMessage("Link check already running", 5000)
+            return
+        urls = self.link_health.pending(self.shortcuts)
+        if not urls:
+            self.statusBar().showMessage("All links were checked recently", 5000)
+            return
+        
+        self.links_stop.clear()
+        cached = dict(self.link_health.urls)
+        total = len(urls)
+        checked = iter(range(1, total + 1))  # next() is atomic, so workers can share it
+        
+        def run():
+            results = LinkHealth.scan(urls, cached, self.links_stop,
+                                      lambda: self.links_progress.emit(next(checked), total))
+            self.links_finished.emit(results)
+        
+        self.links_future = self.links_executor.submit(run)
+        self.statusBar().showMessage(f"Checking {total} links...")
+    
+    def on_links_progress(self, checked, total):
+        """Show link check progress"""
+        if checked % 25 == 0 or checked == total:
+            self.statusBar().showMessage(f"Checking links: {checked}/{total}")
+    
+    def on_links_finished(self, results):
+        """Store link check results and refresh the rows they affect"""
+        self.link_health.update(results, self.shortcuts)
+        rows = [row for row, shortcut in enumerate(self.shortcuts) if shortcut.get('path', '') in results]
+        self.update_table_rows(rows)
+        dead = sum(1 for entry in results.values() if entry['status'] == 'dead')
+        self.statusBar().showMessage(f"Checked {len(results)} links: {dead} dead", 10000)
+    
+    def normalize_icons(self):
+        """Convert every referenced icon into a small cached PNG"""
+        from helpers import IconCache
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            snapshot = UndoJournal.snapshot(self.shortcuts)
+            changed = IconCache(os.path.dirname(self.shortcuts_file)).normalize(self.shortcuts)
+            self.undo_journal.record_since("Normalize icons", snapshot, self.shortcuts)
+        finally:
+            QApplication.restoreOverrideCursor()
+        
+        if changed and self.shortcuts_changed():
+            self.update_table()
+        self.status_label.setText(f"Normalized {changed} icon(s)")
+    
+    def sync_bookmarks(self, show_message=True):
+        """Import bookmarks added in synced browsers and flag deleted ones"""
+        if not self.bookmark_sync.sources:
+            if show_message:
+                QMessageBox.information(self, "Bookmark Sync",
+                                        "No browsers are synced yet.\n\nUse Import Bookmarks... with "
+                                        "'Keep in sync with the browser' checked.")
+            return
+        
+        snapshot = UndoJournal.snapshot(self.shortcuts)
+        totals = self.bookmark_sync.sync(self.shortcuts)
+        if totals['added'] or totals['updated'] or totals['stale']:
+            self.undo_journal.record_since("Sync bookmarks", snapshot, self.shortcuts)
+            if self.shortcuts_changed():
+                self.update_table()
+        
+        summary = (f"Bookmark sync: {totals['added']} added, {totals['updated']} updated, "
+                   f"{totals['stale']} deleted in browser")
+        self.status_label.setText(summary)
+        if show_message:
+            QMessageBox.information(self, "Bookmark Sync", summary)
+    
     def change_save_location(self):
         """Change the shortcuts file save location"""
         file_path, _ = QFileDialog.getSaveFileName(
@@ -781,6 +1611,9 @@ class ShortcutsEditorWindow(QMainWindow):
         )
         
         if file_path:
+            # Pending changes belong to the current file
+            self.flush_autosave()
+            
             # Ensure it has .json extension
             if not file_path.endswith('.json'):
                 file_path += '.json'
@@ -846,7 +1679,7 @@ class ShortcutsEditorWindow(QMainWindow):
         <h3>Features</h3>
         <ul>
             <li><b>Multiple Shortcut Types:</b> Folders, Files, Apps, URLs</li>
-            <li><b>Browser Bookmark Import:</b> Import from Chrome, Edge, Opera, Brave</li>
+            <li><b>Browser Bookmark Import:</b> Import from every Chrome, Edge, Brave, Vivaldi and Opera profile</li>
             <li><b>Category Organization:</b> Organize shortcuts by custom categories</li>
             <li><b>Priority Control:</b> Set display priority (0-200)</li>
             <li><b>Icon Support:</b> Custom icons for each shortcut</li>
@@ -884,6 +1717,87 @@ class ShortcutsEditorWindow(QMainWindow):
         about_dialog.setLayout(layout)
         about_dialog.exec()
     
+    @staticmethod
+    def instance_server_name():
+        """Local socket name of the running editor (the plugin uses the same name)"""
+        user = os.environ.get('USERNAME') or os.environ.get('USER', '')
+        return f"FlowLauncherShortcutsEditor-{user}"
+    
+    @classmethod
+    def activate_running_instance(cls, keyword=''):
+        """Ask an already running editor to come to the front; False if none answers"""
+        connection = QLocalSocket()
+        connection.connectToServer(cls.instance_server_name())
+        if not connection.waitForConnected(500):
+            return False
+        message = json.dumps({'command': 'activate', 'keyword': keyword}) + '\n'
+        connection.write(message.encode('utf-8'))
+        connection.waitForBytesWritten(500)
+        answered = connection.waitForReadyRead(1000) and bytes(connection.readLine()).startswith(b'ok')
+        connection.disconnectFromServer()
+        return answered
+    
+    def start_instance_server(self):
+        """Listen for activation requests from the plugin and later editor launches"""
+        self.instance_server = QLocalServer(self)
+        self.instance_server.newConnection.connect(self.on_instance_connection)
+        name = self.instance_server_name()
+        if not self.instance_server.listen(name):
+            probe = QLocalSocket()
+            probe.connectToServer(name)
+            if probe.waitForConnected(500):
+                # Another editor is listening, just slow to answer: leave its socket alone
+                probe.disconnectFromServer()
+                self.statusBar().showMessage("Another Shortcuts Editor is already running", 10000)
+                return
+            # Left behind by an editor that crashed
+            QLocalServer.removeServer(name)
+            if not self.instance_server.listen(name):
+                self.statusBar().showMessage(
+                    f"Single-instance server unavailable: {self.instance_server.errorString()}", 10000)
+    
+    def on_instance_connection(self):
+        """Accept activation requests"""
+        while self.instance_server.hasPendingConnections():
+            connection = self.instance_server.nextPendingConnection()
+            connection.readyRead.connect(lambda connection=connection: self.read_instance_message(connection))
+            connection.disconnected.connect(connection.deleteLater)
+            self.read_instance_message(connection)
+    
+    def read_instance_message(self, connection):
+        """Handle one-line JSON messages such as {"command": "activate", "keyword": "docs"}"""
+        while connection.canReadLine():
+            try:
+                message = json.loads(bytes(connection.readLine()).decode('utf-8'))
+            except ValueError:
+                continue
+            if message.get('command') == 'activate':
+                self.bring_to_front(message.get('keyword', ''))
+                connection.write(b'ok\n')
+                connection.flush()
+    
+    def bring_to_front(self, keyword=''):
+        """Show the window and select the shortcut with the given keyword"""
+        if self.isMinimized():
+            self.showNormal()
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        if keyword:
+            self.focus_shortcut(keyword)
+    
+    def focus_shortcut(self, keyword):
+        """Select and scroll to the shortcut with the given keyword"""
+        if self.loading:
+            self.pending_focus = keyword  # done once the catalog is there
+            return True
+        for row, shortcut in enumerate(self.shortcuts):
+            if shortcut.get('keyword') == keyword:
+                self.table.selectRow(row)
+                self.table.scrollTo(self.table.model().index(row, 1))
+                return True
+        return False
+    
     def restore_geometry(self):
         """Restore window geometry from settings"""
         geometry = self.settings.value('geometry')
@@ -891,18 +1805,41 @@ class ShortcutsEditorWindow(QMainWindow):
             self.restoreGeometry(geometry)
     
     def closeEvent(self, event):
-        """Save geometry on close"""
+        """Save pending changes and geometry on close"""
+        self.flush_autosave()
+        self.save_executor.shutdown()
+        self.health_executor.shutdown(wait=False, cancel_futures=True)
+        self.links_stop.set()
+        self.links_executor.shutdown(wait=False, cancel_futures=True)
         self.settings.setValue('geometry', self.saveGeometry())
         event.accept()
 
 
 def main():
-    app = QApplication(sys.argv)
+    StartupTiming.mark('imports')
+    parser = argparse.ArgumentParser(description="Flow Launcher Shortcuts Editor")
+    parser.add_argument('--focus', metavar='KEYWORD', default='', help="select this shortcut on start")
+    parser.add_argument('--compile-catalog', metavar='SHORTCUTS_JSON',
+                        help="write the binary catalog (shortcuts.bin) for this file and exit")
+    args, qt_args = parser.parse_known_args()
+    
+    if args.compile_catalog:
+        sys.exit(BinaryCatalog.compile(args.compile_catalog))
+    
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setApplicationName("Shortcuts Editor")
     app.setOrganizationName("AMoorer")
     
+    # One editor per user: hand over to a running one instead of opening another
+    if ShortcutsEditorWindow.activate_running_instance(args.focus):
+        return
+    
     window = ShortcutsEditorWindow()
+    window.start_instance_server()
+    StartupTiming.mark('window')
     window.show()
+    if args.focus:
+        window.focus_shortcut(args.focus)
     
     sys.exit(app.exec())
 
@@ -0,0 +1,633 @@
+# -*- coding: utf-8 -*-
+"""
+Bookmark and icon helpers of the Shortcuts Editor
+
+Imported on first use (a bookmark import or sync, or an icon conversion)
+so they stay out of the editor's startup path.
+"""
+
+import os
+import json
+import math
+import shutil
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from PySide6.QtCore import Qt, QByteArray, QBuffer, QIODevice
+from PySide6.QtGui import QImage, QImageReader
+
+
+class BookmarkImporter:
+    """Import bookmarks from various browsers"""
+    
+    # Chromium-based browsers: (environment variable, user data directory).
+    # Browsers with a 'User Data' directory keep one sub-directory per profile
+    # ('Default', 'Profile 1', 'Profile 2', ...); Opera keeps a single profile.
+    CHROMIUM_BROWSERS = {
+        'Chrome': ('LOCALAPPDATA', ('Google', 'Chrome', 'User Data')),
+        'Edge': ('LOCALAPPDATA', ('Microsoft', 'Edge', 'User Data')),
+        'Brave': ('LOCALAPPDATA', ('BraveSoftware', 'Brave-Browser', 'User Data')),
+        'Vivaldi': ('LOCALAPPDATA', ('Vivaldi', 'User Data')),
+        'Chromium': ('LOCALAPPDATA', ('Chromium', 'User Data')),
+        'Opera': ('APPDATA', ('Opera Software', 'Opera Stable')),
+        'Opera GX': ('APPDATA', ('Opera Software', 'Opera GX Stable')),
+    }
+    
+    # Query parameters that only track where a click came from
+    TRACKING_PARAMS = {'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid',
+                       'mc_cid', 'mc_eid', '_ga', '_gl', 'ref_src'}
+    
+    @staticmethod
+    def normalize_url(url):
+        """Canonical form of a URL used to detect duplicate bookmarks
+        
+        Lowercases scheme and host, drops default ports, trailing slashes,
+        empty fragments and tracking parameters (utm_*, fbclid, ...), and
+        sorts the remaining query parameters.
+        """
+        url = (url or '').strip()
+        try:
+            parts = urlsplit(url)
+            port = parts.port
+        except ValueError:
+            return url
+        
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or '').rstrip('.')
+        if port and (scheme, port) not in (('http', 80), ('https', 443)):
+            host = f"{host}:{port}"
+        if parts.username:
+            host = f"{parts.username}@{host}"
+        
+        path = parts.path.rstrip('/')
+        
+        query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                 if not key.lower().startswith('utm_') and key.lower() not in BookmarkImporter.TRACKING_PARAMS]
+        query.sort()
+        
+        return urlunsplit((scheme, host, path, urlencode(query), parts.fragment))
+    
+    @staticmethod
+    def get_browser_bookmark_paths(root=None):
+        """Get bookmark file locations for every profile of every browser
+        
+        Returns an ordered dict of display label -> Bookmarks path, e.g.
+        'Chrome', 'Chrome - Work (Profile 1)'. If root is given it replaces
+        both %LOCALAPPDATA% and %APPDATA%, so discovery can be run against
+        any directory tree.
+        """
+        paths = {}
+        
+        for browser, (env_var, parts) in BookmarkImporter.CHROMIUM_BROWSERS.items():
+            base = root if root is not None else os.getenv(env_var, '')
+            if not base:
+                continue
+            
+            user_data = Path(base).joinpath(*parts)
+            if not user_data.is_dir():
+                continue
+            
+            # Single-profile layout (Opera)
+            if (user_data / 'Bookmarks').is_file():
+                paths[browser] = user_data / 'Bookmarks'
+                continue
+            
+            profile_names = BookmarkImporter.get_profile_names(user_data)
+            for profile_dir in BookmarkImporter.list_profile_dirs(user_data):
+                bookmark_file = profile_dir / 'Bookmarks'
+                if not bookmark_file.is_file():
+                    continue
+                
+                if profile_dir.name == 'Default':
+                    label = browser
+                else:
+                    display_name = profile_names.get(profile_dir.name)
+                    if display_name:
+                        label = f"{browser} - {display_name} ({profile_dir.name})"
+                    else:
+                        label = f"{browser} - {profile_dir.name}"
+                paths[label] = bookmark_file
+        
+        return paths
+    
+    @staticmethod
+    def list_profile_dirs(user_data):
+        """List profile directories ('Default', 'Profile N') in a Chromium user data dir"""
+        profiles = []
+        try:
+            with os.scandir(user_data) as entries:
+                for entry in entries:
+                    if not entry.is_dir():
+                        continue
+                    if entry.name == 'Default' or entry.name.startswith('Profile '):
+                        profiles.append(Path(entry.path))
+        except OSError:
+            return []
+        
+        # 'Default' first, then profiles in numeric order
+        def profile_order(path):
+            suffix = path.name[len('Profile '):]
+            if path.name == 'Default':
+                return (0, 0, '')
+            if suffix.isdigit():
+                return (1, int(suffix), '')
+            return (2, 0, path.name)
+        
+        return sorted(profiles, key=profile_order)
+    
+    @staticmethod
+    def get_profile_names(user_data):
+        """Read profile display names from the browser's 'Local State' file"""
+        try:
+            with open(Path(user_data) / 'Local State', 'r', encoding='utf-8') as f:
+                info_cache = json.load(f).get('profile', {}).get('info_cache', {})
+            return {directory: info.get('name', '') for directory, info in info_cache.items()}
+        except (OSError, ValueError, AttributeError):
+            return {}
+    
+    @staticmethod
+    def parse_bookmark_files(bookmark_files, max_workers=None):
+        """Parse several bookmark files concurrently and merge the results
+        
+        bookmark_files maps a source label to a Bookmarks path. Each bookmark
+        is tagged with its 'source'; duplicates (same normalized URL) keep the first
+        occurrence, in the order the files were given.
+        """
+        bookmark_files = list(bookmark_files.items())
+        if not bookmark_files:
+            return []
+        
+        workers = max_workers or min(8, len(bookmark_files))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            parsed = list(executor.map(
+                lambda item: BookmarkImporter.parse_chromium_bookmarks(item[1]),
+                bookmark_files
+            ))
+        
+        merged = []
+        seen_urls = set()
+        for (source, _), bookmarks in zip(bookmark_files, parsed):
+            for bookmark in bookmarks:
+                url = BookmarkImporter.normalize_url(bookmark['url'])
+                if url in seen_urls:
+                    continue
+                seen_urls.add(url)
+                bookmark['source'] = source
+                merged.append(bookmark)
+        
+        return merged
+    
+    @staticmethod
+    def shortest_unique_keywords(keywords, existing_keywords=(), min_length=3):
+        """Abbreviate each keyword to its shortest distinctive prefix
+        
+        Builds a trie over the existing and new keywords, counting how many
+        keywords pass through each node. A new keyword is cut at the first
+        node (at least min_length deep) that only it passes through, so no
+        other keyword starts with the result. Keywords without such a prefix
+        (duplicates, or a prefix of another keyword) are kept whole.
+        Runs in O(total characters).
+        """
+        root = {}
+        
+        def insert(word):
+            node = root
+            for char in word:
+                child = node.get(char)
+                if child is None:
+                    child = node[char] = [0, {}]
+                child[0] += 1
+                node = child[1]
+        
+        for keyword in existing_keywords:
+            if keyword:
+                insert(keyword.lower())
+        for keyword in keywords:
+            insert(keyword)
+        
+        abbreviated = []
+        for keyword in keywords:
+            node = root
+            length = len(keyword)
+            for depth, char in enumerate(keyword, 1):
+                count, node = node[char]
+                if count == 1 and depth >= min_length:
+                    length = depth
+                    break
+            
+            # Don't end an abbreviation on a separator
+            while length < len(keyword) and keyword[length - 1] == '-':
+                length += 1
+            abbreviated.append(keyword[:length])
+        
+        return abbreviated
+    
+    @staticmethod
+    def make_keyword(name):
+        """Derive a keyword from a bookmark name (lowercase, dashes, no special characters)"""
+        keyword = name.lower().replace(' ', '-').replace('/', '-')[:30]
+        return ''.join(c for c in keyword if c.isalnum() or c == '-')
+    
+    @staticmethod
+    def merge_shortcuts(shortcuts, imported_shortcuts):
+        """Append imported url shortcuts to the catalog, skipping known URLs
+        
+        Bookmarks whose normalized URL is already in the catalog (or earlier
+        in the batch) are skipped; keyword collisions get a numeric suffix.
+        Returns (added, renamed, skipped) counts.
+        """
+        existing_keywords = {s.get('keyword') for s in shortcuts}
+        existing_urls = {BookmarkImporter.normalize_url(s.get('path', ''))
+                         for s in shortcuts if s.get('type') == 'url'}
+        next_suffix = {}  # keyword base -> next numeric suffix to try
+        renamed_count = 0
+        skipped_count = 0
+        added_count = 0
+        
+        for shortcut in imported_shortcuts:
+            # Skip bookmarks whose URL is already in the catalog
+            url = BookmarkImporter.normalize_url(shortcut['path'])
+            if url in existing_urls:
+                skipped_count += 1
+                continue
+            existing_urls.add(url)
+            
+            # Handle duplicate keywords by appending a number
+            keyword = shortcut['keyword']
+            if keyword in existing_keywords:
+                original_keyword = keyword
+                counter = next_suffix.get(original_keyword, 1)
+                while keyword in existing_keywords:
+                    keyword = f"{original_keyword}-{counter}"
+                    counter += 1
+                next_suffix[original_keyword] = counter
+                renamed_count += 1
+            
+            shortcut['keyword'] = keyword
+            shortcuts.append(shortcut)
+            existing_keywords.add(keyword)
+            added_count += 1
+        
+        return added_count, renamed_count, skipped_count
+    
+    @staticmethod
+    def parse_chromium_bookmarks(bookmark_file):
+        """Parse Chromium-based browser bookmarks (Chrome, Edge, Opera, Brave)"""
+        try:
+            with open(bookmark_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            return BookmarkImporter.extract_chromium_bookmarks(data)
+        except Exception as e:
+            print(f"Error parsing bookmarks: {e}")
+            return []
+    
+    @staticmethod
+    def extract_chromium_bookmarks(data):
+        """Extract bookmarks from a parsed Chromium Bookmarks document"""
+        bookmarks = []
+        
+        def extract_bookmarks(node, folder_path=''):
+            """Recursively extract bookmarks from bookmark tree"""
+            if isinstance(node, dict):
+                node_type = node.get('type')
+                
+                if node_type == 'url':
+                    # This is a bookmark
+                    bookmarks.append({
+                        'name': node.get('name', ''),
+                        'url': node.get('url', ''),
+                        'folder': folder_path,
+                        'id': node.get('id', ''),
+                        'date_added': node.get('date_added', ''),
+                        'date_modified': node.get('date_modified', '')
+                    })
+                elif node_type == 'folder':
+                    # This is a folder, recurse into children
+                    folder_name = node.get('name', '')
+                    new_path = f"{folder_path}/{folder_name}" if folder_path else folder_name
+                    
+                    children = node.get('children', [])
+                    for child in children:
+                        extract_bookmarks(child, new_path)
+            
+            elif isinstance(node, list):
+                for item in node:
+                    extract_bookmarks(item, folder_path)
+        
+        # Start extraction from bookmark roots
+        roots = data.get('roots', {})
+        for root_name, root_node in roots.items():
+            if root_name in ['bookmark_bar', 'other', 'synced']:
+                extract_bookmarks(root_node)
+        
+        return bookmarks
+
+
+class HistoryImporter:
+    """Import most visited sites from Chromium 'History' databases"""
+    
+    TOP_SITES_QUERY = (
+        "SELECT url, title, visit_count, last_visit_time FROM urls "
+        "WHERE hidden = 0 AND visit_count > 0 "
+        "ORDER BY visit_count DESC, last_visit_time DESC LIMIT ?"
+    )
+    
+    @staticmethod
+    def get_browser_history_paths(root=None):
+        """Get History database locations, one per discovered browser profile"""
+        paths = {}
+        for label, bookmark_file in BookmarkImporter.get_browser_bookmark_paths(root).items():
+            history_file = bookmark_file.with_name('History')
+            if history_file.is_file():
+                paths[label] = history_file
+        return paths
+    
+    @staticmethod
+    def read_history(history_file, limit=100):
+        """Read the most visited URLs from a History database
+        
+        The browser keeps the database locked while running, so it is copied
+        to a temporary file first and read with a single query.
+        """
+        import sqlite3  # only needed here, so it stays out of the editor's startup
+        
+        fd, temp_path = tempfile.mkstemp(suffix='.sqlite')
+        os.close(fd)
+        try:
+            shutil.copyfile(history_file, temp_path)
+            connection = sqlite3.connect(temp_path)
+            try:
+                rows = connection.execute(HistoryImporter.TOP_SITES_QUERY, (limit,)).fetchall()
+            finally:
+                connection.close()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error reading history: {e}")
+            return []
+        finally:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        
+        return [{
+            'name': title or '',
+            'url': url,
+            'folder': '',
+            'id': '',
+            'visit_count': visit_count,
+            'last_visit_time': last_visit_time
+        } for url, title, visit_count, last_visit_time in rows]
+    
+    @staticmethod
+    def read_top_sites(history_files, limit=100, low=50, high=150):
+        """Read several History databases concurrently and rank the merged top sites
+        
+        Visits to the same normalized URL are summed across profiles. Each
+        site gets a 'priority' between low and high, log-scaled by its share
+        of the most visited site's count.
+        """
+        history_files = list(history_files.items())
+        if not history_files:
+            return []
+        
+        # Over-fetch: several raw URLs can collapse into one normalized URL
+        with ThreadPoolExecutor(max_workers=min(8, len(history_files))) as executor:
+            parsed = list(executor.map(
+                lambda item: HistoryImporter.read_history(item[1], limit * 2),
+                history_files
+            ))
+        
+        sites = {}
+        for (source, _), entries in zip(history_files, parsed):
+            for entry in entries:
+                url = BookmarkImporter.normalize_url(entry['url'])
+                site = sites.get(url)
+                if site is None:
+                    entry['source'] = source
+                    sites[url] = entry
+                else:
+                    site['visit_count'] += entry['visit_count']
+                    site['last_visit_time'] = max(site['last_visit_time'], entry['last_visit_time'])
+                    site['name'] = site['name'] or entry['name']
+        
+        top_sites = sorted(sites.values(), key=lambda e: (e['visit_count'], e['last_visit_time']), reverse=True)[:limit]
+        if top_sites:
+            max_visits = math.log1p(top_sites[0]['visit_count'])
+            for site in top_sites:
+                site['priority'] = low + round((high - low) * math.log1p(site['visit_count']) / max_visits)
+        
+        return top_sites
+
+
+class IconCache:
+    """Content-addressed cache of small, fixed-size PNG icons
+    
+    Icons are normalized to ICON_SIZE x ICON_SIZE PNGs and stored under
+    CACHE_DIR in the plugin folder, named by the hash of their content, so
+    shortcuts sharing an icon share one file. Shortcuts pointing at image
+    files elsewhere on disk keep the original path in 'iconSource'; an
+    index.json in the cache maps each source to the mtime/size it was
+    converted from, so unchanged sources are not decoded again.
+    """
+    
+    ICON_SIZE = 32
+    CACHE_DIR = 'Images/icons'  # relative to the plugin folder
+    INDEX_FILE = 'index.json'
+    
+    def __init__(self, plugin_dir):
+        self.plugin_dir = plugin_dir
+        self.cache_dir = os.path.join(plugin_dir, *self.CACHE_DIR.split('/'))
+        self.stored = {}  # hash of raw image data -> relative icon path
+    
+    @classmethod
+    def image_rank(cls, width):
+        """Sort key preferring the smallest image that doesn't need upscaling, then the largest"""
+        return (0, width) if width >= cls.ICON_SIZE else (1, -width)
+    
+    @classmethod
+    def load_best_image(cls, path):
+        """Load the best-sized image from a file (multi-resolution .ico files hold several)"""
+        reader = QImageReader(path)
+        best = QImage()
+        for index in range(max(1, reader.imageCount())):
+            if index and not reader.jumpToImage(index):
+                break
+            image = reader.read()
+            if image.isNull():
+                continue
+            if best.isNull() or cls.image_rank(image.width()) < cls.image_rank(best.width()):
+                best = image
+        return best
+    
+    def store_image(self, image):
+        """Normalize an image and store it in the cache, returning its relative path"""
+        if image.isNull():
+            return None
+        
+        if image.width() != self.ICON_SIZE or image.height() != self.ICON_SIZE:
+            image = image.scaled(self.ICON_SIZE, self.ICON_SIZE,
+                                 Qt.AspectRatioMode.KeepAspectRatio,
+                                 Qt.TransformationMode.SmoothTransformation)
+        
+        png_data = QByteArray()
+        buffer = QBuffer(png_data)
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        image.save(buffer, 'PNG')
+        buffer.close()
+        png_data = bytes(png_data)
+        
+        name = hashlib.sha1(png_data).hexdigest() + '.png'
+        icon_file = os.path.join(self.cache_dir, name)
+        if not os.path.exists(icon_file):
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(icon_file, 'wb') as f:
+                f.write(png_data)
+        
+        return f"{self.CACHE_DIR}/{name}"
+    
+    def store(self, image_data):
+        """Normalize encoded image data and store it, returning its relative path"""
+        raw_hash = hashlib.sha1(image_data).hexdigest()
+        if raw_hash not in self.stored:
+            self.stored[raw_hash] = self.store_image(QImage.fromData(image_data))
+        return self.stored[raw_hash]
+    
+    def load_index(self):
+        """Load the source -> [mtime, size, icon] index"""
+        try:
+            with open(os.path.join(self.cache_dir, self.INDEX_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def save_index(self, index):
+        """Save the source index"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(os.path.join(self.cache_dir, self.INDEX_FILE), 'w', encoding='utf-8') as f:
+                json.dump(index, f, indent=2, ensure_ascii=False)
+        except OSError as e:
+            print(f"Error saving icon index: {e}")
+    
+    @staticmethod
+    def is_cached(icon):
+        """Whether an icon path points into a cache folder under Images/"""
+        parts = icon.replace('\\', '/').split('/')
+        return len(parts) == 3 and parts[0] == 'Images'
+    
+    def normalize(self, shortcuts):
+        """Point every shortcut's icon at a normalized copy in the cache
+        
+        Icons that are already relative to the plugin (bundled or cached)
+        are left alone, as are sources that can't be read or decoded.
+        Returns the number of shortcuts whose icon changed.
+        """
+        index = self.load_index()
+        index_changed = False
+        changed = 0
+        
+        for shortcut in shortcuts:
+            icon = shortcut.get('icon', '')
+            source = shortcut.get('iconSource', '')
+            if icon and not self.is_cached(icon):
+                if not os.path.isabs(icon):
+                    continue
+                source = icon
+            if not source:
+                continue
+            
+            try:
+                stat = os.stat(source)
+            except OSError:
+                continue
+            
+            entry = index.get(source)
+            cached = entry[2] if entry else None
+            if (not entry or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size
+                    or not os.path.exists(os.path.join(self.plugin_dir, *cached.split('/')))):
+                cached = self.store_image(self.load_best_image(source))
+                if not cached:
+                    continue
+                index[source] = [stat.st_mtime_ns, stat.st_size, cached]
+                index_changed = True
+            
+            if shortcut.get('icon') != cached or shortcut.get('iconSource') != source:
+                shortcut['icon'] = cached
+                shortcut['iconSource'] = source
+                changed += 1
+        
+        if index_changed:
+            self.save_index(index)
+        
+        return changed
+
+
+class FaviconCache(IconCache):
+    """Extract bookmark favicons from Chromium 'Favicons' databases into the icon cache"""
+    
+    CACHE_DIR = 'Images/favicons'  # relative to the plugin folder
+    
+    # One query for the whole batch: page URLs are joined from a temp table
+    FAVICONS_QUERY = (
+        "SELECT p.page_url, b.width, b.image_data FROM pages p "
+        "JOIN icon_mapping m ON m.page_url = p.page_url "
+        "JOIN favicon_bitmaps b ON b.icon_id = m.icon_id "
+        "WHERE length(b.image_data) > 0"
+    )
+    
+    @classmethod
+    def read_favicons(cls, favicons_file, page_urls):
+        """Read the best bitmap for each page URL, returning page_url -> image bytes
+        
+        The database is copied first since the browser locks it.
+        """
+        page_urls = set(page_urls)
+        if not page_urls:
+            return {}
+        
+        import sqlite3  # only needed here, so it stays out of the editor's startup
+        
+        fd, temp_path = tempfile.mkstemp(suffix='.sqlite')
+        os.close(fd)
+        try:
+            shutil.copyfile(favicons_file, temp_path)
+            connection = sqlite3.connect(temp_path)
+            try:
+                connection.execute("CREATE TEMP TABLE pages (page_url TEXT PRIMARY KEY)")
+                connection.executemany("INSERT INTO pages VALUES (?)", ((url,) for url in page_urls))
+                rows = connection.execute(cls.FAVICONS_QUERY).fetchall()
+            finally:
+                connection.close()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error reading favicons: {e}")
+            return {}
+        finally:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        
+        best = {}
+        for page_url, width, image_data in rows:
+            current = best.get(page_url)
+            if current is None or cls.image_rank(width) < cls.image_rank(current[0]):
+                best[page_url] = (width, image_data)
+        
+        return {page_url: image_data for page_url, (_, image_data) in best.items()}
+    
+    def apply(self, shortcuts, favicons_file):
+        """Point each shortcut's icon at its cached favicon, returning how many were found"""
+        icons = self.read_favicons(favicons_file, (shortcut['path'] for shortcut in shortcuts))
+        
+        count = 0
+        for shortcut in shortcuts:
+            image_data = icons.get(shortcut['path'])
+            icon = self.store(image_data) if image_data else None
+            if icon:
+                shortcut['icon'] = icon
+                count += 1
+        
+        return count